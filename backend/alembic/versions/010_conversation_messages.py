@@ -0,0 +1,116 @@
+"""Move conversation messages into an append-only table.
+
+Revision ID: 010_conversation_messages
+Revises: 009_fix_payment_cascade
+Create Date: 2026-10-16
+
+Conversations stored their history as a JSONB array that was rewritten in
+full on every message. This creates conversation_messages (one row per
+message, keyed by conversation_id + seq), backfills it from the JSONB
+column, replaces the column with a message_count counter used to assign
+seq, and drops the JSONB column.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# Revision identifiers used by Alembic
+revision: str = "010_conversation_messages"
+down_revision: Union[str, Sequence[str], None] = "009_fix_payment_cascade"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create conversation_messages, backfill it, and drop the JSONB column."""
+
+    op.create_table(
+        "conversation_messages",
+        sa.Column(
+            "conversation_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("conversations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("seq", sa.Integer, primary_key=True, autoincrement=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("content", sa.Text, nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+
+    op.add_column(
+        "conversations",
+        sa.Column(
+            "message_count",
+            sa.Integer,
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+    # Backfill: array position becomes seq (1-based)
+    op.execute(
+        """
+        INSERT INTO conversation_messages
+            (conversation_id, seq, role, content, created_at)
+        SELECT
+            c.id,
+            m.ordinality,
+            m.value->>'role',
+            COALESCE(m.value->>'content', ''),
+            COALESCE((m.value->>'timestamp')::timestamptz, c.updated_at)
+        FROM conversations c
+        CROSS JOIN LATERAL jsonb_array_elements(c.messages)
+            WITH ORDINALITY AS m(value, ordinality)
+        """
+    )
+    op.execute(
+        "UPDATE conversations SET message_count = jsonb_array_length(messages)"
+    )
+
+    op.drop_column("conversations", "messages")
+
+
+def downgrade() -> None:
+    """Rebuild the JSONB column from conversation_messages and drop the table."""
+
+    op.add_column(
+        "conversations",
+        sa.Column(
+            "messages",
+            postgresql.JSONB,
+            nullable=False,
+            server_default="[]",
+        ),
+    )
+    op.execute(
+        """
+        UPDATE conversations c
+        SET messages = COALESCE(
+            (
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'role', m.role,
+                        'content', m.content,
+                        'timestamp', m.created_at
+                    )
+                    ORDER BY m.seq
+                )
+                FROM conversation_messages m
+                WHERE m.conversation_id = c.id
+            ),
+            '[]'::jsonb
+        )
+        """
+    )
+
+    op.drop_column("conversations", "message_count")
+    op.drop_table("conversation_messages")
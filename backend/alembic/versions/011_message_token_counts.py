@@ -0,0 +1,34 @@
+"""Add token_count to conversation_messages.
+
+Revision ID: 011_message_token_counts
+Revises: 010_conversation_messages
+Create Date: 2026-10-16
+
+Stores each message's prompt token cost so that token-budgeted history
+windows are a sum rather than a re-tokenisation of every message. Existing
+rows are left NULL and counted on read.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic
+revision: str = "011_message_token_counts"
+down_revision: Union[str, Sequence[str], None] = "010_conversation_messages"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add nullable token_count column."""
+    op.add_column(
+        "conversation_messages",
+        sa.Column("token_count", sa.Integer, nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop token_count column."""
+    op.drop_column("conversation_messages", "token_count")
@@ -0,0 +1,43 @@
+"""Add running summary columns to conversations.
+
+Revision ID: 012_conversation_summary
+Revises: 011_message_token_counts
+Create Date: 2026-10-16
+
+summary holds a running summary of the messages up to and including
+seq = summarized_through; only later messages are sent as raw history.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic
+revision: str = "012_conversation_summary"
+down_revision: Union[str, Sequence[str], None] = "011_message_token_counts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add summary and summarized_through columns."""
+    op.add_column(
+        "conversations",
+        sa.Column("summary", sa.Text, nullable=False, server_default=""),
+    )
+    op.add_column(
+        "conversations",
+        sa.Column(
+            "summarized_through",
+            sa.Integer,
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop summary columns."""
+    op.drop_column("conversations", "summarized_through")
+    op.drop_column("conversations", "summary")
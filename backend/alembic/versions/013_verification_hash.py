@@ -0,0 +1,33 @@
+"""Add verification_hash to wills.
+
+Revision ID: 013_verification_hash
+Revises: 012_conversation_summary
+Create Date: 2026-10-16
+
+Stores the SHA-256 of the canonical will data that verification_result
+was produced from, so an unchanged will can replay its stored result.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers used by Alembic
+revision: str = "013_verification_hash"
+down_revision: Union[str, Sequence[str], None] = "012_conversation_summary"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add nullable verification_hash column."""
+    op.add_column(
+        "wills",
+        sa.Column("verification_hash", sa.String(64), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Drop verification_hash column."""
+    op.drop_column("wills", "verification_hash")
@@ -10,6 +10,8 @@ from pydantic import BaseModel
 from sqlalchemy import text
 
 from app.database import async_session
+from app.services.pdf_cache import pdf_cache
+from app.services.will_artifacts import final_pdf_artifacts
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +23,7 @@ ADMIN_PASSWORD = "ydcoza1013"
 # Clauses are preserved — they're seeded reference data, not user data.
 _TRUNCATE_TABLES = [
     "payments",
+    "conversation_messages",
     "conversations",
     "additional_documents",
     "wills",
@@ -44,6 +47,8 @@ async def reset_database(body: ResetRequest):
         for table in _TRUNCATE_TABLES:
             await session.execute(text(f"TRUNCATE TABLE {table} CASCADE"))
         await session.commit()
+    pdf_cache.clear()
+    final_pdf_artifacts.clear()
 
     logger.warning("Database reset: all user data tables truncated.")
     return {
@@ -53,15 +53,7 @@ async def list_clauses(
     if category:
         clauses = await svc.get_clauses_by_category(category, effective_will_type)
     else:
-        # Gather clauses from all categories for the given will type.
-        all_clauses: list = []
-        for cat in ClauseCategory:
-            all_clauses.extend(
-                await svc.get_clauses_by_category(cat, effective_will_type)
-            )
-        # Sort by display_order for consistent ordering.
-        all_clauses.sort(key=lambda c: c.display_order)
-        clauses = all_clauses
+        clauses = await svc.get_all_current_clauses(effective_will_type)
 
     return ClauseListResponse(
         clauses=[_clause_to_response(c) for c in clauses],
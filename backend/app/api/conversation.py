@@ -3,6 +3,7 @@
 POST /api/conversation/stream  -- SSE streaming conversation with AI
 GET  /api/conversation/{will_id}/{section}  -- Retrieve conversation history
 POST /api/conversation/{will_id}/{section}/extract  -- Extract will data from conversation
+GET  /api/conversation/{will_id}/{section}/extraction  -- Poll background extraction status
 """
 
 import logging
@@ -17,10 +18,12 @@ from app.schemas.conversation import (
     ConversationRequest,
     ConversationResponse,
     ExtractionResponse,
+    ExtractionStatusResponse,
     MessageSchema,
 )
 from app.services.conversation_service import (
     ConversationService,
+    extraction_queue,
     get_conversation_service,
 )
 
@@ -57,7 +60,8 @@ async def stream_conversation(
     Dual-event pattern:
     - ``delta`` events carry text chunks as they arrive from OpenAI
     - ``filtered`` event (if UPL filter activates) carries replacement text
-    - ``done`` event signals the response is complete
+    - ``done`` event signals the response is complete; structured data
+      extraction continues in the background (poll ``.../extraction``)
 
     Verifies will ownership before allowing conversation access.
     """
@@ -114,11 +118,11 @@ async def get_conversation_history(
 
     messages = [
         MessageSchema(
-            role=msg["role"],
-            content=msg["content"],
-            timestamp=msg.get("timestamp"),
+            role=msg.role,
+            content=msg.content,
+            timestamp=msg.created_at,
         )
-        for msg in (conversation.messages or [])
+        for msg in await service.get_messages(conversation)
     ]
 
     return ConversationResponse(
@@ -159,3 +163,29 @@ async def extract_will_data(
         extracted=extracted.model_dump(),
         has_data=True,
     )
+
+
+@router.get(
+    "/{will_id}/{section}/extraction", response_model=ExtractionStatusResponse
+)
+async def get_extraction_status(
+    will_id: uuid.UUID,
+    section: str,
+    request: Request,
+    service: ConversationService = Depends(get_conversation_service),
+):
+    """Poll the background extraction queued after a streamed turn.
+
+    ``state`` returns to ``idle`` once the latest turn has been extracted
+    and saved to the will; ``last_finished_at`` advances with each run.
+    """
+    user_id = _extract_user_id(request)
+
+    # Verify will ownership
+    will_doc = await service.get_will_for_user(will_id, user_id)
+    if will_doc is None:
+        raise HTTPException(status_code=404, detail="Will not found")
+
+    return ExtractionStatusResponse(
+        **extraction_queue.status(will_id, section).to_dict()
+    )
@@ -7,13 +7,13 @@ import logging
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from fastapi.responses import Response
 
 from app.schemas.document import GeneratePreviewRequest
 from app.services.document_service import (
     DocumentGenerationService,
     get_document_service,
 )
+from app.services.pdf_stream import pdf_stream_response
 from app.services.will_service import WillService, get_will_service
 
 logger = logging.getLogger(__name__)
@@ -55,8 +55,8 @@ async def preview_will(
     - ``disclaimer_acknowledged`` must be True (user accepted legal disclaimer).
     - Will must have status ``verified`` or ``generated`` (verification gate).
 
-    Returns the PDF bytes inline so the browser's native PDF viewer can
-    display it in a new tab.
+    Streams the PDF inline so the browser's native PDF viewer can
+    display it in a new tab. Supports ``Range`` and ``If-None-Match``.
     """
     # 1. Authenticate
     user_id = _extract_user_id(request)
@@ -82,13 +82,10 @@ async def preview_will(
         )
 
     # 5. Generate watermarked preview PDF
-    pdf_bytes = await service.generate_preview(will_id, user_id)
-
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": "inline; filename=will-preview.pdf",
-            "Cache-Control": "no-store",
-        },
+    document = await service.open_preview(
+        will_id, user_id, if_none_match=request.headers.get("if-none-match")
+    )
+
+    return pdf_stream_response(
+        request, document, "inline; filename=will-preview.pdf"
     )
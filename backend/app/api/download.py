@@ -6,18 +6,16 @@ GET /api/download/{token} -- Verify token and return final unwatermarked PDF
 import logging
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
 from app.models.payment import Payment
-from app.services.document_service import (
-    DocumentGenerationService,
-    get_document_service,
-)
 from app.services.download_service import verify_download_token
+from app.services.pdf_stream import pdf_stream_response
+from app.services.will_artifacts import final_pdf_artifacts
+from app.services.will_service import WillService, get_will_service
 
 logger = logging.getLogger(__name__)
 
@@ -27,13 +25,17 @@ router = APIRouter(prefix="/api/download", tags=["download"])
 @router.get("/{token}")
 async def download_will(
     token: str,
+    request: Request,
     session: AsyncSession = Depends(get_session),
-    doc_service: DocumentGenerationService = Depends(get_document_service),
+    will_service: WillService = Depends(get_will_service),
 ):
     """Download the final unwatermarked will PDF using a secure token.
 
     The token IS the authentication -- no session/JWT required.
     Tokens are time-limited (default 24 hours) and encode will_id + payment_id.
+    Serves the pre-rendered final PDF artifact for the will's current
+    version (rendering it now if the post-payment job hasn't finished),
+    streamed with ``Range`` support so interrupted downloads can resume.
     """
     # 1. Verify and decode token.
     data = verify_download_token(token)
@@ -54,17 +56,16 @@ async def download_will(
     if payment.status != "completed" or payment.download_token != token:
         raise HTTPException(status_code=403, detail="Invalid or expired download link")
 
-    # 3. Generate final (unwatermarked) PDF.
-    user_id = payment.user_id
-    pdf_bytes = await doc_service.generate_final(will_id, user_id)
+    # 3. Open the final (unwatermarked) PDF artifact.
+    will = await will_service.get_will(will_id, payment.user_id)
+    document = await final_pdf_artifacts.open(
+        will, if_none_match=request.headers.get("if-none-match")
+    )
 
-    # 4. Return as attachment download.
+    # 4. Stream as attachment download.
     will_id_short = str(will_id)[:8].upper()
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="WillCraft-SA-Will-{will_id_short}.pdf"',
-            "Cache-Control": "no-store",
-        },
+    return pdf_stream_response(
+        request,
+        document,
+        f'attachment; filename="WillCraft-SA-Will-{will_id_short}.pdf"',
     )
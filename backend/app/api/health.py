@@ -1,8 +1,32 @@
-"""Health check endpoint."""
+"""Health check and runtime metrics endpoints.
 
-from fastapi import APIRouter
+``/api/health`` is public. ``/api/health/metrics`` exposes internal cache,
+queue and provider state, so it is bypassed by the Clerk and consent
+middleware (monitoring has neither) but only answers requests carrying
+the configured ``METRICS_TOKEN``.
+"""
+
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
 
 from app.config import settings
+from app.services.ai_clients import ai_clients
+from app.services.clause_library import clause_snapshot, clause_template_cache
+from app.services.conversation_service import extraction_queue, summary_queue
+from app.services.document_service import clause_fragment_cache
+from app.services.extraction_cache import extraction_cache
+from app.services.openai_service import prompt_cache_stats
+from app.services.pdf_cache import pdf_cache
+from app.services.pdf_renderer import render_engine
+from app.services.provider_resilience import gemini_provider, openai_provider
+from app.services.sse_events import delta_coalescer
+from app.services.verification_rules import verification_rules
+from app.services.verification_service import (
+    verification_hedge,
+    verification_prompt_stats,
+)
+from app.services.will_artifacts import final_pdf_artifacts
 
 router = APIRouter(tags=["health"])
 
@@ -11,3 +35,43 @@ router = APIRouter(tags=["health"])
 async def health_check() -> dict:
     """Basic liveness probe."""
     return {"status": "healthy", "version": settings.APP_VERSION}
+
+
+def require_metrics_token(
+    x_metrics_token: str | None = Header(default=None),
+) -> None:
+    """Reject metrics requests without the internal ``METRICS_TOKEN``.
+
+    Responds 404 rather than 401/403 so the endpoint is not advertised.
+    """
+    token = settings.METRICS_TOKEN
+    if not token or not hmac.compare_digest(
+        (x_metrics_token or "").encode("utf-8"), token.encode("utf-8")
+    ):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.get("/api/health/metrics", dependencies=[Depends(require_metrics_token)])
+async def metrics() -> dict:
+    """In-process cache and performance counters for monitoring."""
+    return {
+        "pdf_cache": pdf_cache.stats(),
+        "pdf_renderer": render_engine.stats(),
+        "clause_templates": clause_template_cache.stats(),
+        "clause_snapshot": clause_snapshot.stats(),
+        "clause_fragments": clause_fragment_cache.stats(),
+        "will_artifacts": final_pdf_artifacts.stats(),
+        "sse_coalescing": delta_coalescer.stats(),
+        "extraction_queue": extraction_queue.stats(),
+        "extraction_cache": extraction_cache.stats(),
+        "conversation_summaries": summary_queue.stats(),
+        "ai_clients": ai_clients.stats(),
+        "openai_prompt_cache": prompt_cache_stats.stats(),
+        "verification": verification_hedge.stats(),
+        "verification_rules": verification_rules.stats(),
+        "verification_prompt": verification_prompt_stats.stats(),
+        "ai_providers": {
+            "gemini": gemini_provider.stats(),
+            "openai": openai_provider.stats(),
+        },
+    }
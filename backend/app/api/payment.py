@@ -33,6 +33,7 @@ from app.services.payfast_service import (
     validate_itn_server_confirmation,
     validate_itn_signature,
 )
+from app.services.will_artifacts import final_pdf_artifacts
 from app.services.will_service import WillService, get_will_service
 
 logger = logging.getLogger(__name__)
@@ -234,6 +235,14 @@ async def payment_notify(
         session.add(payment)
         logger.info("Payment %s completed successfully", payment.id)
 
+        # Pre-render the final PDF so the download link serves a stored file.
+        # The render reads the will in its own session, so the payment must
+        # be committed first; the request session would otherwise only
+        # commit after the response.
+        await session.commit()
+        if will:
+            final_pdf_artifacts.schedule(will.id, payment.user_id, will.version)
+
     elif payment_status in ("FAILED", "CANCELLED"):
         payment.status = payment_status.lower()
         payment.itn_data = post_data
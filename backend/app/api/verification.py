@@ -1,6 +1,6 @@
 """Verification endpoints for AI-powered will verification.
 
-POST /api/wills/{will_id}/verify          -- SSE streaming verification
+POST /api/wills/{will_id}/verify          -- SSE streaming verification (?force=true skips the cache)
 GET  /api/wills/{will_id}/verification    -- Retrieve last verification result
 POST /api/wills/{will_id}/acknowledge-warnings -- Acknowledge warning codes
 """
@@ -49,12 +49,17 @@ def _extract_user_id(request: Request) -> uuid.UUID:
 async def verify_will(
     will_id: uuid.UUID,
     request: Request,
+    force: bool = False,
     service: VerificationService = Depends(get_verification_service),
 ):
     """Stream will verification progress via Server-Sent Events.
 
+    If the will data is unchanged since the last verification, the stored
+    result is replayed as the same event sequence; ``?force=true`` always
+    re-runs verification.
+
     Event types:
-    - ``check`` -- progress updates (collecting_data, verifying, fallback, analyzing_results)
+    - ``check`` -- progress updates (collecting_data, cached, verifying, fallback, analyzing_results)
     - ``section_result`` -- per-section verification status
     - ``done`` -- final event with complete VerificationResult JSON
     - ``error`` -- if verification fails
@@ -64,7 +69,7 @@ async def verify_will(
     user_id = _extract_user_id(request)
 
     async def event_generator():
-        async for event in service.run_verification(will_id, user_id):
+        async for event in service.run_verification(will_id, user_id, force=force):
             if await request.is_disconnected():
                 logger.info("Client disconnected during verification streaming")
                 break
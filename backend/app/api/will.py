@@ -15,6 +15,7 @@ import logging
 import uuid
 from typing import Any
 
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import Response
 from pydantic import ValidationError
@@ -42,7 +43,9 @@ from app.schemas.will import (
     WillResponse,
 )
 from app.services.download_service import generate_download_token
+from app.services.pdf_cache import pdf_cache
 from app.services.scenario_detector import ScenarioDetector
+from app.services.will_artifacts import final_pdf_artifacts
 from app.services.will_service import WillService, get_will_service
 
 logger = logging.getLogger(__name__)
@@ -167,9 +170,11 @@ async def delete_will(
     request: Request,
     service: WillService = Depends(get_will_service),
 ):
-    """Delete a will and all associated data (conversations, etc.)."""
+    """Delete a will and all associated data (conversations, cached PDFs, etc.)."""
     user_id = _extract_user_id(request)
     await service.delete_will(will_id, user_id)
+    await anyio.to_thread.run_sync(pdf_cache.purge, str(will_id))
+    await anyio.to_thread.run_sync(final_pdf_artifacts.purge, will_id)
     return Response(status_code=204)
 
 
@@ -65,6 +65,78 @@ class Settings(BaseSettings):
     DOWNLOAD_TOKEN_SECRET: str = ""  # Falls back to SECRET_KEY if empty
     DOWNLOAD_TOKEN_MAX_AGE: int = 86400  # 24 hours
 
+    # SSE delta coalescing for streamed AI replies (0 ms = one event per chunk)
+    SSE_COALESCE_WINDOW_MS: float = 30.0
+    SSE_COALESCE_MAX_CHARS: int = 512
+
+    # Shared AI API HTTP connection pool (see app/services/ai_clients.py)
+    AI_HTTP_MAX_CONNECTIONS: int = 100
+    AI_HTTP_MAX_KEEPALIVE: int = 20
+    AI_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+
+    # Pre-verification extraction: one batched call for all empty sections,
+    # or concurrent per-section calls (also the fallback if batching fails)
+    VERIFICATION_BATCH_EXTRACTION: bool = True
+    VERIFICATION_EXTRACTION_CONCURRENCY: int = 3
+
+    # Hedged verification: start the OpenAI backup when Gemini has not
+    # answered within the hedge delay (the VERIFICATION_HEDGE_QUANTILE of
+    # Gemini's recent latency, clamped to [MIN, MAX]; DEFAULT until enough
+    # samples exist). Disabled = OpenAI only after Gemini fails.
+    VERIFICATION_HEDGE_ENABLED: bool = True
+    VERIFICATION_HEDGE_DEFAULT_DELAY: float = 8.0
+    VERIFICATION_HEDGE_QUANTILE: float = 0.9
+    VERIFICATION_HEDGE_MIN_DELAY: float = 2.0
+    VERIFICATION_HEDGE_MAX_DELAY: float = 20.0
+
+    # AI provider calls (verification): per-attempt deadline, jittered
+    # retries on transient errors, and a circuit breaker that fails fast
+    # after consecutive failures until RESET_TIMEOUT has passed
+    PROVIDER_CALL_TIMEOUT: float = 45.0  # seconds per attempt
+    PROVIDER_MAX_ATTEMPTS: int = 2
+    PROVIDER_RETRY_BASE_DELAY: float = 0.5
+    PROVIDER_RETRY_MAX_DELAY: float = 4.0
+    PROVIDER_BREAKER_FAILURE_THRESHOLD: int = 5
+    PROVIDER_BREAKER_RESET_TIMEOUT: float = 30.0  # seconds
+
+    # Token budgets for the conversation history sent to OpenAI, filled
+    # newest message first (capped at MESSAGE_WINDOW_MAX_MESSAGES rows)
+    MESSAGE_WINDOW_TOKEN_BUDGET: int = 6000
+    EXTRACTION_TOKEN_BUDGET: int = 8000
+    MESSAGE_WINDOW_MAX_MESSAGES: int = 200
+
+    # Rolling conversation summaries: once the raw history older than the
+    # newest SUMMARY_KEEP_RECENT_MESSAGES exceeds SUMMARY_TRIGGER_TOKENS, it
+    # is folded into the conversation's running summary
+    SUMMARY_TRIGGER_TOKENS: int = 3000
+    SUMMARY_KEEP_RECENT_MESSAGES: int = 8
+
+    # Background conversation extraction: wait this long before running so
+    # back-to-back turns collapse into one extraction
+    EXTRACTION_DEBOUNCE_SECONDS: float = 1.0
+
+    # Current-clause snapshot revalidation interval (seconds)
+    CLAUSE_SNAPSHOT_TTL: float = 30.0
+
+    # Rendered PDF cache (content-addressed, LRU on local disk). Cached
+    # PDFs are personal data: the cache only runs with PDF_CACHE_DIR set to
+    # a directory for this app alone (created/kept at mode 0700)
+    PDF_CACHE_ENABLED: bool = True
+    PDF_CACHE_DIR: str = ""  # Required for the cache; empty = cache disabled
+    PDF_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # PDF rendering engine (shared process pool)
+    PDF_RENDER_WORKERS: int = 0  # 0 = one worker per available CPU core
+    PDF_RENDER_QUEUE_SIZE: int = 8  # Jobs allowed to wait beyond busy workers
+    PDF_RENDER_TIMEOUT: float = 60.0  # Seconds per render job
+    PDF_RENDER_RETRY_AFTER: int = 5  # Retry-After seconds on 503
+
+    # Final PDF artifacts for paid wills (write-once, keyed by will + version,
+    # LRU-evicted beyond WILL_ARTIFACT_MAX_BYTES). Like the PDF cache, this
+    # needs a directory for this app alone (kept at mode 0700)
+    WILL_ARTIFACT_DIR: str = ""  # Empty = no artifacts, render every download
+    WILL_ARTIFACT_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+
     # Email (SMTP)
     MAIL_USERNAME: str = ""
     MAIL_PASSWORD: str = ""
@@ -76,6 +148,10 @@ class Settings(BaseSettings):
     MAIL_SSL_TLS: bool = False
     MAIL_SUPPRESS_SEND: bool = True  # True in dev, False in production
 
+    # Runtime metrics (/api/health/metrics) are internal: requests must send
+    # this value in the X-Metrics-Token header. Empty = endpoint disabled
+    METRICS_TOKEN: str = ""
+
     # CORS — comma-separated origins for production
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
 
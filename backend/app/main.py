@@ -1,5 +1,6 @@
 """WillCraft SA -- FastAPI application entry-point."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -12,6 +13,10 @@ from app.database import engine
 from app.middleware.clerk_auth import ClerkAuthMiddleware
 from app.middleware.popia_consent import POPIAConsentMiddleware
 from app.middleware.audit import AuditMiddleware
+from app.services.ai_clients import ai_clients
+from app.services.conversation_service import extraction_queue, summary_queue
+from app.services.pdf_renderer import render_engine
+from app.services.token_budget import preload_encoding
 from app.api import additional_documents, admin, ai, consent, conversation, document, download, privacy, health, clauses, payment, verification, will
 
 logger = logging.getLogger(__name__)
@@ -20,6 +25,11 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup / shutdown lifecycle."""
+    # Startup: create the shared AI API clients (pooled connections).
+    ai_clients.open()
+    # Startup: load the tokenizer now (may download its BPE file) rather
+    # than on the first chat message.
+    await asyncio.to_thread(preload_encoding, settings.OPENAI_MODEL)
     # Startup: verify database connectivity.
     try:
         async with engine.connect() as conn:
@@ -31,7 +41,12 @@ async def lifespan(app: FastAPI):
             "database-dependent routes will fail."
         )
     yield
-    # Shutdown: dispose of connection pool.
+    # Shutdown: cancel queued extraction and summary jobs, stop PDF render
+    # workers, close AI clients and dispose of the connection pool.
+    extraction_queue.shutdown()
+    summary_queue.shutdown()
+    render_engine.shutdown()
+    await ai_clients.aclose()
     await engine.dispose()
 
 
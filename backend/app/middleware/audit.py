@@ -17,7 +17,7 @@ from app.services.audit_service import AuditService
 logger = logging.getLogger(__name__)
 
 # Paths we skip to keep audit noise low.
-_SKIP_PATHS: set[str] = {"/api/health"}
+_SKIP_PATHS: set[str] = {"/api/health", "/api/health/metrics"}
 _SKIP_PREFIXES: tuple[str, ...] = ("/static/", "/favicon")
 
 
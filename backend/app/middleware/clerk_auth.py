@@ -21,6 +21,7 @@ logger = logging.getLogger(__name__)
 # Paths that do NOT require Clerk authentication.
 EXEMPT_PATHS: set[str] = {
     "/api/health",
+    "/api/health/metrics",  # Guarded by METRICS_TOKEN (app/api/health.py)
     "/api/consent",
     "/api/consent/status",
     "/api/consent/withdraw",
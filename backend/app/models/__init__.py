@@ -6,7 +6,7 @@ All models are exported here for Alembic autogenerate to detect.
 from app.models.consent import ConsentRecord
 from app.models.clause import Clause, ClauseCategory, WillType
 from app.models.audit import AuditLog
-from app.models.conversation import Conversation
+from app.models.conversation import Conversation, ConversationMessage
 from app.models.payment import Payment
 from app.models.user import User
 from app.models.will import Will
@@ -18,6 +18,7 @@ __all__ = [
     "WillType",
     "AuditLog",
     "Conversation",
+    "ConversationMessage",
     "Payment",
     "User",
     "Will",
@@ -2,13 +2,17 @@
 
 Stores the message history for each will section separately, enabling
 context continuity when users switch between sections and return later.
+Messages live in an append-only ``conversation_messages`` table so that
+adding a turn is a single small INSERT rather than a rewrite of the whole
+history.
 """
 
 import uuid
 from datetime import datetime, timezone
+from typing import Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, String
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
 from sqlmodel import Field, SQLModel
 
 
@@ -42,10 +46,21 @@ class Conversation(SQLModel, table=True):
         sa_column=Column(String(50), nullable=False),
     )
 
-    # Message history as JSONB array of {role, content, timestamp}
-    messages: list = Field(
-        default_factory=list,
-        sa_column=Column(JSONB, nullable=False, server_default="'[]'"),
+    # Number of messages appended so far; the last assigned message seq
+    message_count: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default="0"),
+    )
+
+    # Running summary of messages with seq <= summarized_through; those
+    # messages are no longer sent to the model as raw history
+    summary: str = Field(
+        default="",
+        sa_column=Column(Text, nullable=False, server_default=""),
+    )
+    summarized_through: int = Field(
+        default=0,
+        sa_column=Column(Integer, nullable=False, server_default="0"),
     )
 
     # Timestamps
@@ -61,3 +76,46 @@ class Conversation(SQLModel, table=True):
             DateTime(timezone=True), nullable=False, server_default="now()"
         ),
     )
+
+
+class ConversationMessage(SQLModel, table=True):
+    """One message of a conversation, ordered by ``seq`` within it.
+
+    The composite primary key (conversation_id, seq) doubles as the index
+    for reading the latest messages of a conversation.
+    """
+
+    __tablename__ = "conversation_messages"
+
+    conversation_id: uuid.UUID = Field(
+        sa_column=Column(
+            UUID(as_uuid=True),
+            ForeignKey("conversations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+    seq: int = Field(
+        sa_column=Column(Integer, primary_key=True, autoincrement=False),
+    )
+
+    # user | assistant
+    role: str = Field(
+        sa_column=Column(String(20), nullable=False),
+    )
+    content: str = Field(
+        sa_column=Column(Text, nullable=False),
+    )
+
+    # Prompt tokens this message costs (content plus chat-format overhead);
+    # NULL for rows stored before counts were recorded
+    token_count: Optional[int] = Field(
+        default=None,
+        sa_column=Column(Integer, nullable=True),
+    )
+
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, server_default="now()"
+        ),
+    )
@@ -108,6 +108,11 @@ class Will(SQLModel, table=True):
         default=None,
         sa_column=Column(DateTime(timezone=True), nullable=True),
     )
+    # SHA-256 of the canonical will data the stored result was produced from
+    verification_hash: str | None = Field(
+        default=None,
+        sa_column=Column(String(64), nullable=True),
+    )
     acknowledged_warnings: list = Field(
         default_factory=list,
         sa_column=Column(JSONB, nullable=False, server_default="'[]'"),
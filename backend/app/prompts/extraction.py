@@ -260,3 +260,22 @@ EXTRACTION_SYSTEM_PROMPT: str = (
     "and business asset information (business name, type, registration "
     "number, percentage held, heir) when discussed."
 )
+
+MULTI_SECTION_EXTRACTION_PROMPT: str = (
+    EXTRACTION_SYSTEM_PROMPT
+    + " The input contains SEVERAL separate conversations, one per will "
+    "section, each starting with a line '=== SECTION: <name> ==='. Extract "
+    "the data from every conversation into the single result. Use each "
+    "conversation mainly for its own section's fields, but also keep "
+    "facts the user stated for other fields."
+)
+
+
+def format_section_transcripts(section_histories: dict[str, list[dict]]) -> str:
+    """Render per-section conversations as one labelled transcript."""
+    blocks = []
+    for section, history in section_histories.items():
+        lines = [f"=== SECTION: {section} ==="]
+        lines.extend(f"{m['role'].upper()}: {m['content']}" for m in history)
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
@@ -0,0 +1,38 @@
+"""System prompt for rolling conversation summaries.
+
+Older messages of a long section conversation are folded into a running
+summary, which then replaces them in the conversation prompt. The summary
+must keep every fact the user has stated, because the raw messages are no
+longer sent to the model.
+"""
+
+from __future__ import annotations
+
+SUMMARY_SYSTEM_PROMPT: str = (
+    "You maintain a running summary of a will-creation conversation between "
+    "a user and an assistant. You are given the previous summary (possibly "
+    "empty) and the next messages of the conversation. Return an updated "
+    "summary that merges both.\n\n"
+    "Rules:\n"
+    "- Keep EVERY fact the user stated: names, relationships, ID numbers, "
+    "percentages, assets, amounts, dates and decisions, exactly as given.\n"
+    "- Record corrections: if the user changed an earlier answer, keep only "
+    "the latest value.\n"
+    "- Note open questions the assistant asked that the user has not yet "
+    "answered.\n"
+    "- Omit greetings, pleasantries and explanations of legal concepts.\n"
+    "- Write concise bullet points in the third person ('The user ...').\n"
+    "- Never add facts that were not stated."
+)
+
+
+def format_summary_request(previous_summary: str, messages: list[dict]) -> str:
+    """Render the previous summary and new messages as one user message."""
+    lines = [
+        "PREVIOUS SUMMARY:",
+        previous_summary or "(none)",
+        "",
+        "NEW MESSAGES:",
+    ]
+    lines.extend(f"{m['role'].upper()}: {m['content']}" for m in messages)
+    return "\n".join(lines)
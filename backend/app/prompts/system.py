@@ -240,50 +240,92 @@ def format_will_summary(will_context: dict) -> str:
     return "\n".join(parts) if parts else "No data collected yet."
 
 
-def build_system_prompt(section: str, will_context: dict) -> str:
+SECTION_BOUNDARY: str = (
+    "SECTION BOUNDARY: You ONLY discuss topics related to the CURRENT SECTION. "
+    "Do NOT move on to other sections or topics. If the user says 'move on', "
+    "'next', or 'done', respond with something like: "
+    "'Great, this section looks good! Click the Next Section button below when "
+    "you are ready to continue.' "
+    "NEVER start discussing other sections (executor, guardians, assets, etc.) "
+    "unless that IS the current section."
+)
+
+# Identical for every request -- kept first so provider-side prompt caching
+# can reuse it across sections and users.
+STATIC_PREFIX: str = "\n".join(
+    [
+        BASE_PERSONALITY,
+        "",
+        UPL_BOUNDARY,
+        "",
+        SECTION_BOUNDARY,
+    ]
+)
+
+
+def _section_prefix(section: str) -> str:
+    """Static prompt text for *section*: the shared prefix plus section guidance."""
+    parts = [STATIC_PREFIX, "", f"CURRENT SECTION: {section}"]
+    section_guidance = SECTION_PROMPTS.get(section, "")
+    if section_guidance:
+        parts.append(section_guidance)
+    return "\n".join(parts)
+
+
+# Byte-stable per-section prefixes, built once at import time.
+_SECTION_PREFIXES: dict[str, str] = {
+    section: _section_prefix(section) for section in SECTION_PROMPTS
+}
+
+
+def build_system_prompt(
+    section: str,
+    will_context: dict,
+    conversation_summary: str = "",
+) -> str:
     """Build a complete system prompt for the given conversation section.
 
+    The prompt is laid out for provider-side prompt caching: the static
+    prefix (personality, UPL boundary, section boundary, section guidance)
+    comes first and is byte-identical for every request in a section; only
+    the suffix (will data, conversation summary) varies.
+
     Parameters
     ----------
     section:
         Current will section (e.g. "beneficiaries", "assets", "guardians").
     will_context:
         Current will data for state summary embedding.
+    conversation_summary:
+        Running summary of earlier messages in this section that are no
+        longer sent as raw history (empty if nothing was summarised yet).
 
     Returns
     -------
     Full system prompt string ready for OpenAI API.
     """
-    section_guidance = SECTION_PROMPTS.get(section, "")
+    prefix = _SECTION_PREFIXES.get(section) or _section_prefix(section)
     will_summary = format_will_summary(will_context)
 
     parts = [
-        BASE_PERSONALITY,
+        prefix,
         "",
-        UPL_BOUNDARY,
+        f"WILL DATA COLLECTED SO FAR:\n{will_summary}",
         "",
-        f"CURRENT SECTION: {section}",
     ]
 
-    if section_guidance:
-        parts.append(section_guidance)
+    if conversation_summary:
+        parts.extend(
+            [
+                "EARLIER IN THIS CONVERSATION (summary of previous messages):\n"
+                f"{conversation_summary}",
+                "",
+            ]
+        )
 
-    parts.extend(
-        [
-            "",
-            "SECTION BOUNDARY: You ONLY discuss topics related to the CURRENT SECTION. "
-            "Do NOT move on to other sections or topics. If the user says 'move on', "
-            "'next', or 'done', respond with something like: "
-            "'Great, this section looks good! Click the Next Section button below when "
-            "you are ready to continue.' "
-            "NEVER start discussing other sections (executor, guardians, assets, etc.) "
-            "unless that IS the current section.",
-            "",
-            f"WILL DATA COLLECTED SO FAR:\n{will_summary}",
-            "",
-            "Based on the data above, continue the conversation naturally. "
-            "Do not re-ask for information already collected.",
-        ]
+    parts.append(
+        "Based on the data above, continue the conversation naturally. "
+        "Do not re-ask for information already collected."
     )
 
     return "\n".join(parts)
@@ -2,12 +2,17 @@
 
 Defines verification rules organized by severity, attorney referral triggers,
 and builds a complete system instruction for Gemini structured output
-verification of SA will data.
+verification of SA will data. ``compile_verification_prompt`` builds the
+smaller prompt used at runtime: only non-empty will data (as compact JSON)
+and only the rules and referral triggers that apply to it.
 """
 
 from __future__ import annotations
 
+import functools
 import json
+import re
+from typing import Any, Callable, Optional
 
 # ── SA Wills Act Verification Rules ──────────────────────────────────
 # Organized by severity. Each rule has a code, description, and check guidance.
@@ -165,34 +170,48 @@ ATTORNEY_REFERRAL_TRIGGERS: list[dict[str, str]] = [
 
 # ── Prompt Builder ───────────────────────────────────────────────────
 
+_SEVERITY_LABELS = {
+    "error": "ERRORS (must block will generation -- severity: error)",
+    "warning": "WARNINGS (need user acknowledgment -- severity: warning)",
+    "info": "INFO (helpful tips -- severity: info)",
+}
 
-def _format_rules_for_prompt() -> str:
-    """Format all verification rules into a prompt-ready string."""
-    sections: list[str] = []
 
-    severity_labels = {
-        "error": "ERRORS (must block will generation -- severity: error)",
-        "warning": "WARNINGS (need user acknowledgment -- severity: warning)",
-        "info": "INFO (helpful tips -- severity: info)",
-    }
+@functools.lru_cache(maxsize=64)
+def _format_rules_for_prompt(codes: Optional[frozenset[str]] = None) -> str:
+    """Format verification rules into a prompt-ready string.
+
+    With *codes*, only those rules are included. Cached per rule set, since
+    the same few combinations recur across verifications.
+    """
+    sections: list[str] = []
 
-    for severity, label in severity_labels.items():
-        rules = VERIFICATION_RULES[severity]
+    for severity, label in _SEVERITY_LABELS.items():
+        rules = [
+            (code, description)
+            for code, description in VERIFICATION_RULES[severity].items()
+            if codes is None or code in codes
+        ]
+        if not rules:
+            continue
         lines = [f"### {label}"]
-        for code, description in rules.items():
+        for code, description in rules:
             lines.append(f"- **{code}**: {description}")
         sections.append("\n".join(lines))
 
     return "\n\n".join(sections)
 
 
-def _format_referral_triggers_for_prompt() -> str:
+@functools.lru_cache(maxsize=64)
+def _format_referral_triggers_for_prompt(triggers: Optional[frozenset[str]] = None) -> str:
     """Format attorney referral triggers into a prompt-ready string."""
     lines = ["### ATTORNEY REFERRAL TRIGGERS"]
     lines.append(
         "Flag (do NOT block) when any of these conditions are detected:"
     )
     for trigger in ATTORNEY_REFERRAL_TRIGGERS:
+        if triggers is not None and trigger["trigger"] not in triggers:
+            continue
         lines.append(f"- **{trigger['trigger']}**: {trigger['description']} -- {trigger['detail']}")
     return "\n".join(lines)
 
@@ -200,6 +219,10 @@ def _format_referral_triggers_for_prompt() -> str:
 def build_verification_prompt(will_data: dict) -> str:
     """Build a complete system instruction for Gemini will verification.
 
+    Embeds every rule and the full will data (pretty-printed). Verification
+    uses the smaller ``compile_verification_prompt``; this full form remains
+    the reference it is measured against.
+
     Parameters
     ----------
     will_data:
@@ -213,10 +236,135 @@ def build_verification_prompt(will_data: dict) -> str:
     Complete system instruction string for Gemini, including all verification
     rules, the will data to analyze, and structured output instructions.
     """
-    rules_text = _format_rules_for_prompt()
-    referral_text = _format_referral_triggers_for_prompt()
-    will_json = json.dumps(will_data, indent=2, default=str)
+    return _render_prompt(
+        _format_rules_for_prompt(),
+        _format_referral_triggers_for_prompt(),
+        json.dumps(will_data, indent=2, default=str),
+    )
+
+
+# ── Prompt Compiler ──────────────────────────────────────────────────
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _prune(value: Any) -> Any:
+    """Drop None and empty values from nested dicts and lists."""
+    if isinstance(value, dict):
+        pruned = {k: _prune(v) for k, v in value.items()}
+        return {k: v for k, v in pruned.items() if not _is_empty(v)}
+    if isinstance(value, list):
+        pruned = [_prune(v) for v in value]
+        return [v for v in pruned if not _is_empty(v)]
+    return value
+
+
+# Relationships under which a beneficiary may be a minor. Neither the
+# frontend forms nor AI extraction record a beneficiary's age.
+_CHILD_RELATIONSHIP = re.compile(
+    r"\b(child|children|son|daughter|(grand|step)(child|children|son|daughter)"
+    r"|nephew|niece|minor)\b",
+    re.IGNORECASE,
+)
+
+
+def _may_have_minors(will_data: dict) -> bool:
+    """Return True when the will data suggests a beneficiary may be a minor."""
+    if will_data.get("guardians") or will_data.get("trust_provisions"):
+        return True
+    return any(
+        isinstance(b, dict)
+        and (
+            b.get("is_minor")
+            or b.get("isMinor")
+            or _CHILD_RELATIONSHIP.search(str(b.get("relationship") or ""))
+        )
+        for b in will_data.get("beneficiaries") or []
+    )
+
+
+def _marital_status(will_data: dict) -> str:
+    marital = will_data.get("marital") or {}
+    return str(marital.get("status") or "") if isinstance(marital, dict) else ""
+
+
+def _is_joint(will_data: dict) -> bool:
+    return will_data.get("will_type") == "joint" or bool(will_data.get("joint_will"))
+
+
+def _has_scenario(will_data: dict, scenario: str, column: str) -> bool:
+    return scenario in (will_data.get("scenarios") or []) or bool(will_data.get(column))
+
+
+# Rules and referral triggers that only apply to some wills. Anything not
+# listed here applies to every will. MINOR_NO_PROVISION and
+# NO_GUARDIANS_WITH_MINORS are always sent, since will data has no reliable
+# age field for beneficiaries and a missed minor is a blocking error.
+_RULE_CONDITIONS: dict[str, Callable[[dict], bool]] = {
+    "COMMUNITY_PROPERTY_HALF": lambda d: _marital_status(d) in {"married_in_community", "married_cop"},
+    "JOINT_WILL_IRREVOCABLE": _is_joint,
+    "NO_SIMULTANEOUS_DEATH": lambda d: _is_joint(d) or _marital_status(d).startswith("married"),
+    "BUSINESS_NO_BUY_SELL": lambda d: _has_scenario(d, "business_assets", "business_assets"),
+    "TRUST_VESTING_AGE": lambda d: _may_have_minors(d) or _has_scenario(d, "testamentary_trust", "trust_provisions"),
+}
+
+_TRIGGER_CONDITIONS: dict[str, Callable[[dict], bool]] = {
+    "testamentary_trust": lambda d: _has_scenario(d, "testamentary_trust", "trust_provisions"),
+    "usufruct": lambda d: _has_scenario(d, "usufruct", "usufruct"),
+    "business_succession": lambda d: _has_scenario(d, "business_assets", "business_assets"),
+}
+
+
+def applicable_rule_codes(
+    will_data: dict, exclude: frozenset[str] = frozenset()
+) -> frozenset[str]:
+    """Return the rule codes that can apply to *will_data*, minus *exclude*."""
+    return frozenset(
+        code
+        for rules in VERIFICATION_RULES.values()
+        for code in rules
+        if code not in exclude
+        and (code not in _RULE_CONDITIONS or _RULE_CONDITIONS[code](will_data))
+    )
+
+
+def applicable_referral_triggers(will_data: dict) -> frozenset[str]:
+    """Return the referral triggers that can apply to *will_data*."""
+    return frozenset(
+        trigger["trigger"]
+        for trigger in ATTORNEY_REFERRAL_TRIGGERS
+        if trigger["trigger"] not in _TRIGGER_CONDITIONS
+        or _TRIGGER_CONDITIONS[trigger["trigger"]](will_data)
+    )
+
+
+def compile_verification_prompt(
+    will_data: dict, exclude_codes: frozenset[str] = frozenset()
+) -> str:
+    """Build a verification prompt containing only what applies to *will_data*.
+
+    Compared with ``build_verification_prompt``:
+
+    - empty sections and empty fields are dropped from the will data;
+    - only rules and referral triggers relevant to the will's scenarios and
+      data are listed (the rule text per combination is cached);
+    - rules in *exclude_codes* (decided elsewhere, e.g. locally) are omitted;
+    - the will data is serialised as compact JSON.
+    """
+    rules_text = _format_rules_for_prompt(applicable_rule_codes(will_data, exclude_codes))
+    referral_text = _format_referral_triggers_for_prompt(
+        applicable_referral_triggers(will_data)
+    )
+    will_json = json.dumps(
+        _prune(will_data), separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return _render_prompt(rules_text, referral_text, will_json)
+
 
+def _render_prompt(rules_text: str, referral_text: str, will_json: str) -> str:
+    """Assemble the verification prompt around the rule text and will data."""
     return f"""You are a South African will data verification system.
 
 Your task is to verify the provided will data for COMPLETENESS, CONSISTENCY, and COMPLIANCE with South African law. You check whether all required data has been collected and is internally consistent.
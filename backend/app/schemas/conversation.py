@@ -43,6 +43,16 @@ class ExtractionResponse(BaseModel):
     has_data: bool
 
 
+class ExtractionStatusResponse(BaseModel):
+    """Status of the background extraction job for a will section."""
+
+    state: Literal["idle", "pending", "running"]
+    runs: int
+    has_data: bool
+    last_finished_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
 class SSEEvent(BaseModel):
     """Server-Sent Event payload."""
 
@@ -1,14 +1,12 @@
 """Additional document service for living will and funeral wishes.
 
 Handles CRUD operations and PDF generation via Jinja2+WeasyPrint
-pipeline, reusing the same thread pool executor pattern as the
-main document generation service.
+pipeline, sharing the process-pool render engine with the main
+document generation service.
 """
 
-import asyncio
 import logging
 import uuid
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -16,10 +14,10 @@ from fastapi import Depends, HTTPException
 from jinja2 import Environment, FileSystemLoader
 from sqlalchemy import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from weasyprint import HTML
 
 from app.database import get_session
 from app.models.additional_document import AdditionalDocument
+from app.services.pdf_renderer import render_engine
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +27,6 @@ logger = logging.getLogger(__name__)
 
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
 
-_pdf_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="addoc-pdf")
-
 _jinja_env = Environment(
     loader=FileSystemLoader(str(TEMPLATE_DIR)),
     autoescape=True,
@@ -40,19 +36,6 @@ _jinja_env = Environment(
 _VALID_TYPES = {"living_will", "funeral_wishes"}
 
 
-# ---------------------------------------------------------------------------
-# Synchronous PDF rendering (runs in thread pool)
-# ---------------------------------------------------------------------------
-
-
-def _render_pdf_sync(html_string: str) -> bytes:
-    """Render HTML to PDF bytes via WeasyPrint (CPU-bound)."""
-    return HTML(
-        string=html_string,
-        base_url=str(TEMPLATE_DIR),
-    ).write_pdf()
-
-
 # ---------------------------------------------------------------------------
 # Service class
 # ---------------------------------------------------------------------------
@@ -164,7 +147,7 @@ class AdditionalDocumentService:
         """Generate PDF from document content via Jinja2+WeasyPrint.
 
         Selects the template directory based on document_type,
-        renders HTML, and converts to PDF in a thread executor.
+        renders HTML, and converts to PDF on the shared render engine.
         If not preview, updates status to 'generated'.
         """
         doc = await self.get(doc_id, user_id)
@@ -179,11 +162,8 @@ class AdditionalDocumentService:
         template = _jinja_env.get_template(template_name)
         html_string = template.render(**context)
 
-        # Generate PDF in thread pool
-        loop = asyncio.get_event_loop()
-        pdf_bytes: bytes = await loop.run_in_executor(
-            _pdf_executor, _render_pdf_sync, html_string
-        )
+        # Generate PDF on the shared render engine
+        pdf_bytes = await render_engine.render(html_string, base_url=str(TEMPLATE_DIR))
 
         # Update status if final generation
         if not is_preview:
@@ -0,0 +1,111 @@
+"""App-lifetime AI API clients shared across requests.
+
+Building an ``AsyncOpenAI`` client per request also builds a new httpx
+connection pool, so every chat turn paid a fresh TCP and TLS handshake to
+the API. ``AIClientRegistry`` keeps one OpenAI client (per API key) and one
+Gemini client for the lifetime of the process. The OpenAI client uses a
+pooled httpx client with tuned limits and keep-alive. The registry is
+opened in ``main.lifespan`` and closed on shutdown. Clients are also
+created lazily on first use, so background jobs and scripts work without
+the lifespan.
+
+OpenAI connection reuse is measured with httpcore's ``trace`` extension.
+Every request is counted, and so is every new TCP connection. A request that
+did not open a connection was served over a kept-alive one.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import httpx
+from google import genai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from app.config import settings
+
+# httpcore trace event emitted once per newly opened connection
+_CONNECT_EVENT = "connection.connect_tcp.complete"
+
+
+class AIClientRegistry:
+    """Holds the shared OpenAI and Gemini clients and their pool metrics."""
+
+    def __init__(self) -> None:
+        self._openai: dict[str, AsyncOpenAI] = {}
+        self._gemini: dict[str, genai.Client] = {}
+        self.requests = 0
+        self.new_connections = 0
+
+    def open(self) -> None:
+        """Create the configured clients up front (called from the lifespan)."""
+        if settings.OPENAI_API_KEY:
+            self.openai()
+        if settings.GEMINI_API_KEY:
+            self.gemini()
+
+    def openai(self, api_key: Optional[str] = None) -> AsyncOpenAI:
+        """Return the shared AsyncOpenAI client for *api_key* (default: settings)."""
+        key = settings.OPENAI_API_KEY if api_key is None else api_key
+        client = self._openai.get(key)
+        if client is None:
+            client = self._openai[key] = AsyncOpenAI(
+                api_key=key,
+                http_client=self._http_client(),
+            )
+        return client
+
+    def gemini(self, api_key: Optional[str] = None) -> Optional[genai.Client]:
+        """Return the shared Gemini client, or None when no API key is set."""
+        key = settings.GEMINI_API_KEY if api_key is None else api_key
+        if not key:
+            return None
+        client = self._gemini.get(key)
+        if client is None:
+            client = self._gemini[key] = genai.Client(api_key=key)
+        return client
+
+    async def aclose(self) -> None:
+        """Close all clients and their connection pools."""
+        for client in self._openai.values():
+            await client.close()
+        for client in self._gemini.values():
+            aclose = getattr(client.aio, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        self._openai.clear()
+        self._gemini.clear()
+
+    def _http_client(self) -> httpx.AsyncClient:
+        return DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.AI_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            event_hooks={"request": [self._on_request]},
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == _CONNECT_EVENT:
+            self.new_connections += 1
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        reused = max(self.requests - self.new_connections, 0)
+        return {
+            "openai_clients": len(self._openai),
+            "gemini_clients": len(self._gemini),
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": reused,
+            "reuse_ratio": round(reused / self.requests, 4) if self.requests else 0.0,
+        }
+
+
+# Process-wide client registry.
+ai_clients = AIClientRegistry()
@@ -5,17 +5,22 @@ No freeform AI generation is allowed -- only approved clause templates
 with variable substitution.
 """
 
+import asyncio
+import hashlib
 import logging
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import Depends
-from jinja2 import BaseLoader, Environment, TemplateSyntaxError, UndefinedError
-from sqlalchemy import and_
+from jinja2 import BaseLoader, Environment, Template, TemplateSyntaxError, UndefinedError
+from sqlalchemy import and_, event, func
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.config import settings
 from app.database import get_session
 from app.models.clause import Clause, ClauseCategory, WillType
 
@@ -29,6 +34,201 @@ _jinja_env = Environment(
     undefined=__import__("jinja2").StrictUndefined,
 )
 
+# Upper bound on compiled templates kept in memory (all versions of all codes).
+_TEMPLATE_CACHE_SIZE = 512
+
+
+class ClauseTemplateCache:
+    """Process-wide LRU cache of compiled clause templates.
+
+    Keyed by ``(code, version, sha256(template_text))`` so an edited
+    template can never be served from a stale compilation, even if the
+    version number was not bumped.
+    """
+
+    def __init__(self, max_size: int = _TEMPLATE_CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._templates: OrderedDict[tuple[str, int, str], Template] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_or_compile(self, clause: Clause) -> Template:
+        """Return the compiled template for *clause*, compiling on first use.
+
+        Raises:
+            TemplateSyntaxError: If the template text is invalid.
+        """
+        digest = hashlib.sha256(clause.template_text.encode("utf-8")).hexdigest()
+        key = (clause.code, clause.version, digest)
+        template = self._templates.get(key)
+        if template is not None:
+            self._templates.move_to_end(key)
+            self.hits += 1
+            return template
+
+        self.misses += 1
+        template = _jinja_env.from_string(clause.template_text)
+        self._templates[key] = template
+        if len(self._templates) > self._max_size:
+            self._templates.popitem(last=False)
+        return template
+
+    def invalidate(self, code: str) -> None:
+        """Drop every compiled version of clause *code*."""
+        stale = [key for key in self._templates if key[0] == code]
+        for key in stale:
+            del self._templates[key]
+        self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        self._templates.clear()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "size": len(self._templates),
+            "hits": self.hits,
+            "compilations": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+clause_template_cache = ClauseTemplateCache()
+
+
+def _category_value(category: ClauseCategory | str) -> str:
+    """Normalise a category loaded from the String column to its enum value."""
+    return category.value if isinstance(category, ClauseCategory) else str(category)
+
+
+class ClauseSnapshot:
+    """Process-wide in-memory snapshot of all current clauses.
+
+    The clause library is small and changes only when an attorney approves
+    a new version, so hot paths (PDF assembly, UPL replacement, clause
+    listing) read from this snapshot instead of querying per clause.
+
+    Freshness is tracked with a version counter: ``invalidate()`` bumps it
+    in-process once a ``create_new_version`` is committed, and every
+    ``ttl`` seconds a single aggregate query compares a fingerprint of the
+    ``is_current`` rows so changes made by other processes are picked up
+    too.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self._ttl = ttl
+        self._by_code: dict[str, Clause] = {}
+        self._by_category: dict[tuple[str, str], list[Clause]] = {}
+        self._required: dict[str, list[Clause]] = {}
+        self._all: dict[str, list[Clause]] = {}
+        self._fingerprint: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._version = 0
+        self._loaded_version = -1
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        self.fingerprint_checks = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        """Force a reload on the next access."""
+        self._version += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_version == self._version
+            and time.monotonic() - self._checked_at < self._ttl
+        )
+
+    async def ensure_fresh(self, session: AsyncSession) -> None:
+        """Load or revalidate the snapshot if invalidated or past its TTL."""
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            version = self._version
+            fingerprint = await self._fetch_fingerprint(session)
+            if self._loaded_version != version or fingerprint != self._fingerprint:
+                await self._load(session)
+            self._fingerprint = fingerprint
+            self._loaded_version = version
+            self._checked_at = time.monotonic()
+
+    async def _fetch_fingerprint(self, session: AsyncSession) -> tuple:
+        """Cheap aggregate that changes whenever a current clause changes."""
+        self.fingerprint_checks += 1
+        stmt = select(
+            func.count(Clause.id),
+            func.coalesce(func.sum(Clause.version), 0),
+            func.max(Clause.updated_at),
+        ).where(Clause.is_current == True)  # noqa: E712
+        result = await session.exec(stmt)
+        return tuple(result.one())
+
+    async def _load(self, session: AsyncSession) -> None:
+        stmt = (
+            select(Clause)
+            .where(Clause.is_current == True)  # noqa: E712
+            .order_by(Clause.display_order)
+        )
+        result = await session.exec(stmt)
+        # Detached copies so later mutations through a session (e.g. in
+        # create_new_version) never leak into the shared snapshot.
+        self.replace([Clause(**c.model_dump()) for c in result.all()])
+        self.loads += 1
+        logger.info("Loaded clause snapshot (%d current clauses)", len(self._by_code))
+
+    def replace(self, clauses: list[Clause]) -> None:
+        """Rebuild all indexes from *clauses* (assumed ordered by display_order)."""
+        by_code: dict[str, Clause] = {}
+        by_category: dict[tuple[str, str], list[Clause]] = {}
+        required: dict[str, list[Clause]] = {}
+        all_by_type: dict[str, list[Clause]] = {}
+        for clause in clauses:
+            by_code[clause.code] = clause
+            category = _category_value(clause.category)
+            for will_type in clause.will_types:
+                by_category.setdefault((category, will_type), []).append(clause)
+                all_by_type.setdefault(will_type, []).append(clause)
+                if clause.is_required:
+                    required.setdefault(will_type, []).append(clause)
+        self._by_code = by_code
+        self._by_category = by_category
+        self._required = required
+        self._all = all_by_type
+
+    def get(self, code: str) -> Optional[Clause]:
+        return self._by_code.get(code)
+
+    def by_category(self, category: ClauseCategory, will_type: WillType) -> list[Clause]:
+        return list(self._by_category.get((category.value, will_type.value), []))
+
+    def required(self, will_type: WillType) -> list[Clause]:
+        return list(self._required.get(will_type.value, []))
+
+    def all_current(self, will_type: WillType) -> list[Clause]:
+        return list(self._all.get(will_type.value, []))
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "clauses": len(self._by_code),
+            "version": self._version,
+            "loads": self.loads,
+            "fingerprint_checks": self.fingerprint_checks,
+        }
+
+
+clause_snapshot = ClauseSnapshot(ttl=settings.CLAUSE_SNAPSHOT_TTL)
+
 
 class ClauseLibraryService:
     """Retrieves and renders attorney-approved clause templates."""
@@ -43,14 +243,17 @@ class ClauseLibraryService:
     ) -> Optional[Clause]:
         """Retrieve a clause by its unique code.
 
-        By default returns the current version. If *version* is specified,
-        returns that exact version regardless of ``is_current`` flag.
+        By default returns the current version from the in-memory snapshot.
+        If *version* is specified, returns that exact version from the
+        database regardless of ``is_current`` flag.
         """
-        stmt = select(Clause).where(Clause.code == code)
-        if version is not None:
-            stmt = stmt.where(Clause.version == version)
-        else:
-            stmt = stmt.where(Clause.is_current == True)  # noqa: E712
+        if version is None:
+            await clause_snapshot.ensure_fresh(self._session)
+            return clause_snapshot.get(code)
+
+        stmt = select(Clause).where(
+            and_(Clause.code == code, Clause.version == version)
+        )
         result = await self._session.exec(stmt)
         return result.first()
 
@@ -63,54 +266,39 @@ class ClauseLibraryService:
 
         Results are ordered by ``display_order`` for consistent rendering.
         """
-        stmt = (
-            select(Clause)
-            .where(
-                and_(
-                    Clause.category == category,
-                    Clause.is_current == True,  # noqa: E712
-                )
-            )
-            .order_by(Clause.display_order)
-        )
-        result = await self._session.exec(stmt)
-        clauses = list(result.all())
+        await clause_snapshot.ensure_fresh(self._session)
+        return clause_snapshot.by_category(category, will_type)
 
-        # Filter to clauses whose will_types list includes the requested type.
-        return [c for c in clauses if will_type.value in c.will_types]
+    async def get_all_current_clauses(
+        self,
+        will_type: WillType = WillType.BASIC,
+    ) -> list[Clause]:
+        """Return every current clause applicable to *will_type*, by ``display_order``."""
+        await clause_snapshot.ensure_fresh(self._session)
+        return clause_snapshot.all_current(will_type)
 
     async def get_required_clauses(
         self,
         will_type: WillType = WillType.BASIC,
     ) -> list[Clause]:
         """Return all required current clauses for the given will type."""
-        stmt = (
-            select(Clause)
-            .where(
-                and_(
-                    Clause.is_required == True,  # noqa: E712
-                    Clause.is_current == True,  # noqa: E712
-                )
-            )
-            .order_by(Clause.display_order)
-        )
-        result = await self._session.exec(stmt)
-        clauses = list(result.all())
-        return [c for c in clauses if will_type.value in c.will_types]
+        await clause_snapshot.ensure_fresh(self._session)
+        return clause_snapshot.required(will_type)
 
     def render_clause(self, clause: Clause, variables: dict) -> str:
         """Render a clause template with the given variables.
 
         Uses Jinja2 for safe template rendering with strict undefined
         checking -- missing variables raise an error rather than producing
-        blank output.
+        blank output. Compiled templates are reused across calls via
+        ``clause_template_cache``.
 
         Raises:
             ValueError: If the template contains syntax errors or
                 required variables are missing.
         """
         try:
-            template = _jinja_env.from_string(clause.template_text)
+            template = clause_template_cache.get_or_compile(clause)
             return template.render(**variables)
         except TemplateSyntaxError as exc:
             logger.error(
@@ -143,7 +331,10 @@ class ClauseLibraryService:
         """Create a new version of an existing clause.
 
         Marks the previous version as non-current and creates a new row
-        linked via ``previous_version_id``.
+        linked via ``previous_version_id``. Compiled templates for the
+        clause code are evicted from the template cache, and the
+        current-clause snapshot is invalidated when the caller's session
+        commits.
         """
         # Fetch current clause
         stmt = select(Clause).where(Clause.id == clause_id)
@@ -177,6 +368,16 @@ class ClauseLibraryService:
         self._session.add(new_clause)
         await self._session.flush()
         await self._session.refresh(new_clause)
+
+        clause_template_cache.invalidate(current.code)
+        # Invalidating before the commit would let a concurrent request
+        # reload (and keep) the old rows; a rollback needs no invalidation.
+        event.listen(
+            self._session.sync_session,
+            "after_commit",
+            lambda _session: clause_snapshot.invalidate(),
+            once=True,
+        )
         return new_clause
 
 
@@ -1,13 +1,15 @@
 """Conversation service orchestrating AI responses with UPL filtering.
 
-Manages conversation history persistence, message windowing, streaming
-AI responses via OpenAI, and post-response UPL compliance filtering.
+Manages conversation history persistence (append-only message rows),
+message windowing, streaming AI responses via OpenAI, and incremental
+plus final UPL compliance filtering.
 This is the core integration point connecting OpenAI, UPL filter, and
 conversation history into a single streaming flow.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import uuid
@@ -15,25 +17,64 @@ from datetime import datetime, timezone
 from typing import AsyncGenerator
 
 from fastapi import Depends
-from sqlalchemy import and_
+from sqlalchemy import and_, update
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
-from app.database import get_session
-from app.models.conversation import Conversation
+from app.database import async_session, get_session
+from app.models.conversation import Conversation, ConversationMessage
 from app.models.will import Will
 from app.prompts.extraction import ExtractedWillData
+from app.services.ai_clients import ai_clients
 from app.services.audit_service import AuditService
 from app.services.clause_library import ClauseLibraryService
+from app.services.extraction_cache import (
+    conversation_fingerprint,
+    extraction_cache,
+    may_contain_data,
+)
+from app.services.extraction_queue import ExtractionQueue
 from app.services.openai_service import OpenAIService
-from app.services.upl_filter import FilterAction, UPLFilterService
+from app.services.sse_events import (
+    DONE_EVENT,
+    STREAM_ERROR_EVENT,
+    delta_coalescer,
+    delta_event,
+)
+from app.services.token_budget import (
+    fit_to_budget,
+    message_tokens,
+    message_tokens_async,
+)
+from app.services.upl_filter import (
+    FilterAction,
+    StreamingUPLScanner,
+    UPLFilterService,
+)
 
 logger = logging.getLogger(__name__)
 
-# Rolling window size for messages sent to OpenAI API
-_MESSAGE_WINDOW_SIZE = 20
+# Extraction cache key for batched multi-section results
+_BATCH_SECTION = "*"
+
+
+def message_window_query(
+    conversation_id: uuid.UUID,
+    window_size: int,
+    after_seq: int = 0,
+):
+    """SELECT the latest ``window_size`` messages of a conversation, newest first.
+
+    Only messages with ``seq > after_seq`` are considered.
+    """
+    stmt = select(ConversationMessage).where(
+        ConversationMessage.conversation_id == conversation_id
+    )
+    if after_seq:
+        stmt = stmt.where(ConversationMessage.seq > after_seq)
+    return stmt.order_by(ConversationMessage.seq.desc()).limit(window_size)
 
 
 class ConversationService:
@@ -41,10 +82,13 @@ class ConversationService:
 
     Responsibilities:
     - Persist conversation history per will+section in the database
-    - Apply rolling message window to prevent token limit issues
-    - Stream AI responses via OpenAI and accumulate for UPL filtering
+    - Apply a token-budgeted message window to prevent token limit issues
+    - Fold older messages into a running summary so prompt size stays flat
+      on long conversations (in the background, after a turn)
+    - Stream AI responses via OpenAI, releasing only UPL-safe text
     - Filter complete responses through the UPL filter before final event
-    - Extract structured will data from conversation messages
+    - Extract structured will data from conversation messages (queued
+      in the background after each streamed turn)
     """
 
     def __init__(
@@ -86,7 +130,6 @@ class ConversationService:
                 conversation = Conversation(
                     will_id=will_id,
                     section=section,
-                    messages=[],
                 )
                 self._session.add(conversation)
                 await self._session.flush()
@@ -107,39 +150,76 @@ class ConversationService:
         conversation: Conversation,
         role: str,
         content: str,
-    ) -> None:
+    ) -> ConversationMessage:
         """Append a message to the conversation history and persist.
 
-        Each message is stored as a dict with role, content, and ISO timestamp.
+        Bumps the conversation's ``message_count`` (the row lock serialises
+        concurrent appends) and inserts one ``conversation_messages`` row
+        with the new count as its ``seq``. The existing history is never
+        rewritten.
         """
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
-        # JSONB array mutation requires reassignment for SQLAlchemy change detection
-        updated_messages = list(conversation.messages) + [message]
-        conversation.messages = updated_messages
-        conversation.updated_at = datetime.now(timezone.utc)
-        self._session.add(conversation)
+        now = datetime.now(timezone.utc)
+        result = await self._session.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation.id)
+            .values(
+                message_count=Conversation.message_count + 1,
+                updated_at=now,
+            )
+            .returning(Conversation.message_count)
+            .execution_options(synchronize_session=False)
+        )
+        seq = result.scalar_one()
+
+        token_count = await message_tokens_async(content, settings.OPENAI_MODEL)
+        message = ConversationMessage(
+            conversation_id=conversation.id,
+            seq=seq,
+            role=role,
+            content=content,
+            token_count=token_count,
+            created_at=now,
+        )
+        self._session.add(message)
         await self._session.flush()
+        return message
+
+    async def get_messages(
+        self,
+        conversation: Conversation,
+    ) -> list[ConversationMessage]:
+        """Return the full conversation history in chronological order."""
+        result = await self._session.exec(
+            select(ConversationMessage)
+            .where(ConversationMessage.conversation_id == conversation.id)
+            .order_by(ConversationMessage.seq)
+        )
+        return list(result.all())
 
-    def get_message_window(
+    async def get_message_window(
         self,
         conversation: Conversation,
-        window_size: int = _MESSAGE_WINDOW_SIZE,
+        token_budget: int | None = None,
+        after_seq: int = 0,
     ) -> list[dict]:
-        """Return the last ``window_size`` messages as OpenAI-compatible dicts.
+        """Return the latest messages that fit ``token_budget`` as OpenAI dicts.
 
         This implements the rolling window to prevent token limit issues.
-        Only role and content are included (timestamps excluded).
+        Only the newest ``MESSAGE_WINDOW_MAX_MESSAGES`` rows are read
+        (``ORDER BY seq DESC LIMIT n`` on the primary key index) and then
+        taken newest first until the budget (default
+        ``MESSAGE_WINDOW_TOKEN_BUDGET``) is filled. Messages with
+        ``seq <= after_seq`` (already summarised) are skipped. Only role and
+        content are included (timestamps excluded).
         """
-        messages = conversation.messages or []
-        windowed = messages[-window_size:]
-        return [
-            {"role": msg["role"], "content": msg["content"]}
-            for msg in windowed
-        ]
+        if token_budget is None:
+            token_budget = settings.MESSAGE_WINDOW_TOKEN_BUDGET
+        result = await self._session.exec(
+            message_window_query(
+                conversation.id, settings.MESSAGE_WINDOW_MAX_MESSAGES, after_seq
+            )
+        )
+        return fit_to_budget(result.all(), token_budget, settings.OPENAI_MODEL)
 
     async def stream_ai_response(
         self,
@@ -153,12 +233,15 @@ class ConversationService:
         Flow:
         1. Get or create conversation for this will+section
         2. Add the user message to conversation history
-        3. Get rolling message window (last 20 messages)
-        4. Stream response from OpenAI, yielding delta events
-        5. After stream completes, run UPL filter on full response
+        3. Get the token-budgeted window of messages not yet summarised
+        4. Stream response from OpenAI through the incremental UPL scanner,
+           yielding coalesced delta events for text cleared as safe
+        5. After stream completes (or is aborted), run UPL filter on full response
         6. If filtered, yield a filtered event with replacement text
-        7. Persist the assistant message (filtered text if applicable)
-        8. Yield done event
+        7. Persist the assistant message (filtered text if applicable) and
+           commit the turn
+        8. Queue background extraction (and summarisation once enough
+           history has accumulated) and yield done event
 
         Yields dicts with 'event' and 'data' keys for SSE serialisation.
         """
@@ -168,30 +251,33 @@ class ConversationService:
         await self.add_message(conversation, "user", user_message)
 
         # Build message window for OpenAI
-        message_window = self.get_message_window(conversation)
+        message_window = await self.get_message_window(
+            conversation, after_seq=conversation.summarized_through
+        )
 
-        # Stream from OpenAI, accumulating the full response
-        full_response = ""
+        # Stream from OpenAI through the incremental UPL scanner (which
+        # holds back unsafe text and aborts on attorney-required topics),
+        # coalescing the released text into fewer delta events
+        scanner = StreamingUPLScanner()
         try:
-            async for chunk in self._openai.stream_response(
-                messages=message_window,
-                section=section,
-                will_context=will_context,
+            async for text in delta_coalescer.coalesce(
+                scanner.filter_stream(
+                    self._openai.stream_response(
+                        messages=message_window,
+                        section=section,
+                        will_context=will_context,
+                        conversation_summary=conversation.summary,
+                    )
+                )
             ):
-                full_response += chunk
-                yield {
-                    "event": "delta",
-                    "data": json.dumps({"content": chunk}),
-                }
+                yield delta_event(text)
         except Exception as exc:
             logger.error("OpenAI streaming error: %s", exc)
-            yield {
-                "event": "error",
-                "data": json.dumps({"message": "An error occurred while generating a response."}),
-            }
+            yield STREAM_ERROR_EVENT
             return
 
-        # Run UPL filter on the complete response
+        # Run the authoritative UPL filter on the complete response
+        full_response = scanner.text
         filter_result = await self._upl_filter.filter_output(
             text=full_response,
             context={"category": section, "will_type": "basic"},
@@ -210,20 +296,23 @@ class ConversationService:
             }
 
         # Persist assistant message (filtered version if applicable)
-        await self.add_message(conversation, "assistant", final_text)
+        assistant_message = await self.add_message(
+            conversation, "assistant", final_text
+        )
 
-        # Auto-extract structured data and persist to will JSONB
-        try:
-            extracted = await self.extract_data_from_conversation(will_id, section)
-            if extracted is not None:
-                await self.save_extracted_to_will(will_id, section, extracted)
-        except Exception as exc:
-            logger.warning("Auto-extraction failed for will %s section %s: %s", will_id, section, exc)
+        # The background jobs read the conversation in their own sessions,
+        # so the turn must be committed before they are queued; the
+        # request session would otherwise only commit once the stream ends.
+        await self._session.commit()
 
-        yield {
-            "event": "done",
-            "data": json.dumps({"complete": True}),
-        }
+        # Queue structured extraction in the background; the client gets
+        # ``done`` immediately and can poll the extraction status.
+        extraction_queue.schedule(will_id, section)
+        unsummarized = assistant_message.seq - conversation.summarized_through
+        if unsummarized > settings.SUMMARY_KEEP_RECENT_MESSAGES:
+            summary_queue.schedule(will_id, section)
+
+        yield DONE_EVENT
 
     async def extract_data_from_conversation(
         self,
@@ -233,31 +322,241 @@ class ConversationService:
         """Extract structured will data from the latest conversation messages.
 
         Uses the OpenAI extraction endpoint with the last user message and
-        recent conversation history for context.
+        recent conversation history for context. Results for an unchanged
+        conversation are served from the fingerprint cache.
 
         Returns None if no conversation exists or no user messages found.
         """
+        prepared = await self._extraction_input(will_id, section)
+        if prepared is None:
+            return None
+        history, latest_user_message, fingerprint = prepared
+
+        cached = extraction_cache.get(will_id, section, fingerprint)
+        if cached is not None:
+            return cached
+        return await self._extract(
+            will_id, section, history, latest_user_message, fingerprint
+        )
+
+    async def extract_if_changed(
+        self,
+        will_id: uuid.UUID,
+        section: str,
+    ) -> ExtractedWillData | None:
+        """Background variant of :meth:`extract_data_from_conversation`.
+
+        Returns None without calling OpenAI when the latest user message
+        carries no data signal. An unchanged conversation returns its
+        cached result (again without calling OpenAI), so the caller still
+        saves it even if an earlier save of that result failed.
+        """
+        prepared = await self._extraction_input(will_id, section)
+        if prepared is None:
+            return None
+        history, latest_user_message, fingerprint = prepared
+
+        if not may_contain_data(latest_user_message):
+            extraction_cache.skip_no_signal(will_id, section, fingerprint)
+            return None
+        cached = extraction_cache.get(will_id, section, fingerprint)
+        if cached is not None:
+            return cached
+        return await self._extract(
+            will_id, section, history, latest_user_message, fingerprint
+        )
+
+    async def _extraction_input(
+        self,
+        will_id: uuid.UUID,
+        section: str,
+    ) -> tuple[list[dict], str, str] | None:
+        """Return ``(history, latest_user_message, fingerprint)`` or None.
+
+        The history is the window sent to the extraction prompt, filled up
+        to ``EXTRACTION_TOKEN_BUDGET``.
+        """
         conversation = await self.get_or_create_conversation(will_id, section)
-        messages = conversation.messages or []
+        history = await self.get_message_window(
+            conversation, settings.EXTRACTION_TOKEN_BUDGET
+        )
 
-        if not messages:
+        if not history:
             return None
 
         # Find the latest user message
-        user_messages = [m for m in messages if m["role"] == "user"]
+        user_messages = [m for m in history if m["role"] == "user"]
         if not user_messages:
             return None
 
         latest_user_message = user_messages[-1]["content"]
-        history = [
-            {"role": m["role"], "content": m["content"]}
-            for m in messages
-        ]
+        return history, latest_user_message, conversation_fingerprint(history)
 
-        return await self._openai.extract_will_data(
+    async def _extract(
+        self,
+        will_id: uuid.UUID,
+        section: str,
+        history: list[dict],
+        latest_user_message: str,
+        fingerprint: str,
+    ) -> ExtractedWillData:
+        """Call OpenAI for extraction and cache the result."""
+        extraction_cache.executed += 1
+        extracted = await self._openai.extract_will_data(
             conversation_history=history,
             latest_message=latest_user_message,
         )
+        extraction_cache.put(will_id, section, fingerprint, extracted)
+        return extracted
+
+    async def summarize_if_needed(
+        self,
+        will_id: uuid.UUID,
+        section: str,
+    ) -> bool:
+        """Fold older messages into the conversation's running summary.
+
+        All messages except the newest ``SUMMARY_KEEP_RECENT_MESSAGES`` that
+        are not yet summarised are folded in once they cost more than
+        ``SUMMARY_TRIGGER_TOKENS``. The summary is only written if no other
+        worker advanced it in the meantime.
+
+        Returns True if the summary was updated.
+        """
+        conversation = await self.get_or_create_conversation(will_id, section)
+        start = conversation.summarized_through
+        cutoff = conversation.message_count - settings.SUMMARY_KEEP_RECENT_MESSAGES
+        if cutoff <= start:
+            return False
+
+        result = await self._session.exec(
+            select(ConversationMessage)
+            .where(
+                ConversationMessage.conversation_id == conversation.id,
+                ConversationMessage.seq > start,
+                ConversationMessage.seq <= cutoff,
+            )
+            .order_by(ConversationMessage.seq)
+        )
+        older = result.all()
+        tokens = sum(
+            m.token_count
+            if m.token_count is not None
+            else message_tokens(m.content, settings.OPENAI_MODEL)
+            for m in older
+        )
+        if tokens < settings.SUMMARY_TRIGGER_TOKENS:
+            return False
+
+        summary = await self._openai.summarize_conversation(
+            previous_summary=conversation.summary,
+            messages=[{"role": m.role, "content": m.content} for m in older],
+        )
+        if not summary:
+            return False
+
+        updated = await self._session.execute(
+            update(Conversation)
+            .where(
+                Conversation.id == conversation.id,
+                Conversation.summarized_through == start,
+            )
+            .values(summary=summary, summarized_through=cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        if updated.rowcount != 1:
+            return False
+        logger.info(
+            "Summarised messages %d-%d of %s conversation for will %s",
+            start + 1, cutoff, section, will_id,
+        )
+        return True
+
+    async def extract_sections(
+        self,
+        will_id: uuid.UUID,
+        sections: list[str],
+        concurrency: int,
+    ) -> AsyncGenerator[tuple[str, ExtractedWillData | None, Exception | None], None]:
+        """Extract several sections concurrently, yielding each as it finishes.
+
+        Conversation windows are read first, one after another, on this
+        service's session (a session cannot be shared between tasks). Then
+        up to *concurrency* OpenAI extraction calls run at once. Yields
+        ``(section, extracted, error)``, where *extracted* is None when the
+        section has no user messages. Results for an unchanged conversation
+        come from the fingerprint cache, as in
+        :meth:`extract_data_from_conversation`.
+        """
+        prepared = {
+            section: await self._extraction_input(will_id, section)
+            for section in sections
+        }
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def run(section: str):
+            inputs = prepared[section]
+            if inputs is None:
+                return section, None, None
+            history, latest_user_message, fingerprint = inputs
+            try:
+                cached = extraction_cache.get(will_id, section, fingerprint)
+                if cached is not None:
+                    return section, cached, None
+                async with semaphore:
+                    extracted = await self._extract(
+                        will_id, section, history, latest_user_message, fingerprint
+                    )
+                return section, extracted, None
+            except Exception as exc:
+                return section, None, exc
+
+        tasks = [asyncio.create_task(run(section)) for section in sections]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def extract_sections_batched(
+        self,
+        will_id: uuid.UUID,
+        sections: list[str],
+    ) -> dict[str, ExtractedWillData]:
+        """Extract several sections with a single OpenAI call.
+
+        All section windows go into one structured-output request, and the
+        combined result is returned for every section that has user
+        messages. Raises ``RuntimeError`` when the model returns no parsed
+        result (a refusal or truncated output). Feed it to
+        :meth:`save_extracted_sections`, which picks each section's fields.
+        A repeat request over unchanged conversations is served from the
+        fingerprint cache.
+        """
+        histories: dict[str, list[dict]] = {}
+        for section in sections:
+            inputs = await self._extraction_input(will_id, section)
+            if inputs is not None:
+                histories[section] = inputs[0]
+        if not histories:
+            return {}
+
+        fingerprint = conversation_fingerprint([
+            message
+            for section, history in histories.items()
+            for message in [{"role": "section", "content": section}, *history]
+        ])
+        extracted = extraction_cache.get(will_id, _BATCH_SECTION, fingerprint)
+        if extracted is None:
+            extraction_cache.executed += 1
+            extracted = await self._openai.extract_will_data_multi(histories)
+            if extracted is None:
+                # Refusal or truncated structured output: let the caller
+                # fall back to per-section extraction
+                raise RuntimeError("Batched extraction returned no parsed result")
+            extraction_cache.put(will_id, _BATCH_SECTION, fingerprint, extracted)
+        return {section: extracted for section in histories}
 
     async def save_extracted_to_will(
         self,
@@ -277,42 +576,30 @@ class ConversationService:
         if will is None:
             return
 
-        changed = False
-
-        # Map section -> extraction field -> will column
-        if section == "beneficiaries" and extracted.beneficiaries:
-            will.beneficiaries = [b.model_dump() for b in extracted.beneficiaries]
-            changed = True
-        elif section == "assets" and extracted.assets:
-            will.assets = [a.model_dump() for a in extracted.assets]
-            changed = True
-        elif section == "guardians" and extracted.guardians:
-            will.guardians = [g.model_dump() for g in extracted.guardians]
-            changed = True
-        elif section == "executor" and extracted.executor:
-            will.executor = extracted.executor.model_dump()
-            changed = True
-        elif section == "bequests" and extracted.bequests:
-            will.bequests = [b.model_dump() for b in extracted.bequests]
-            changed = True
-        elif section == "residue" and extracted.residue:
-            will.residue = extracted.residue.model_dump()
-            changed = True
-        elif section == "trust" and extracted.trust:
-            will.trust_provisions = extracted.trust.model_dump()
-            changed = True
-        elif section == "usufruct" and extracted.usufruct_data:
-            will.usufruct = extracted.usufruct_data.model_dump()
-            changed = True
-        elif section == "business" and extracted.business_data:
-            will.business_assets = [b.model_dump() for b in extracted.business_data]
-            changed = True
+        await self.save_extracted_sections(will, {section: extracted})
 
+    async def save_extracted_sections(
+        self,
+        will: Will,
+        extracted_by_section: dict[str, ExtractedWillData],
+    ) -> list[str]:
+        """Apply extracted data for several sections in a single will update.
+
+        Returns the sections whose column was changed.
+        """
+        changed = [
+            section
+            for section, extracted in extracted_by_section.items()
+            if _apply_extracted(will, section, extracted)
+        ]
         if changed:
             will.updated_at = datetime.now(timezone.utc)
             self._session.add(will)
             await self._session.flush()
-            logger.info("Saved extracted %s data to will %s", section, will_id)
+            logger.info(
+                "Saved extracted %s data to will %s", ", ".join(changed), will.id
+            )
+        return changed
 
     async def get_will_for_user(
         self,
@@ -333,17 +620,38 @@ class ConversationService:
         return result.first()
 
 
-def get_conversation_service(
-    session: AsyncSession = Depends(get_session),
-) -> ConversationService:
-    """FastAPI dependency that assembles a ConversationService.
-
-    Wires together the database session, OpenAI service, and UPL filter
-    service via dependency injection.
-    """
+def _apply_extracted(will: Will, section: str, extracted: ExtractedWillData) -> bool:
+    """Copy one section's extracted data onto *will*; True if a column changed."""
+    # Map section -> extraction field -> will column
+    if section == "beneficiaries" and extracted.beneficiaries:
+        will.beneficiaries = [b.model_dump() for b in extracted.beneficiaries]
+    elif section == "assets" and extracted.assets:
+        will.assets = [a.model_dump() for a in extracted.assets]
+    elif section == "guardians" and extracted.guardians:
+        will.guardians = [g.model_dump() for g in extracted.guardians]
+    elif section == "executor" and extracted.executor:
+        will.executor = extracted.executor.model_dump()
+    elif section == "bequests" and extracted.bequests:
+        will.bequests = [b.model_dump() for b in extracted.bequests]
+    elif section == "residue" and extracted.residue:
+        will.residue = extracted.residue.model_dump()
+    elif section == "trust" and extracted.trust:
+        will.trust_provisions = extracted.trust.model_dump()
+    elif section == "usufruct" and extracted.usufruct_data:
+        will.usufruct = extracted.usufruct_data.model_dump()
+    elif section == "business" and extracted.business_data:
+        will.business_assets = [b.model_dump() for b in extracted.business_data]
+    else:
+        return False
+    return True
+
+
+def _build_conversation_service(session: AsyncSession) -> ConversationService:
+    """Wire a ConversationService with its OpenAI and UPL filter dependencies."""
     openai_service = OpenAIService(
         api_key=settings.OPENAI_API_KEY,
         model=settings.OPENAI_MODEL,
+        client=ai_clients.openai(),
     )
     clause_service = ClauseLibraryService(session=session)
     audit_service = AuditService(session=session)
@@ -356,3 +664,54 @@ def get_conversation_service(
         openai_service=openai_service,
         upl_filter=upl_filter,
     )
+
+
+async def run_background_extraction(will_id: uuid.UUID, section: str) -> bool:
+    """Extract and persist will data for one section in its own session.
+
+    Returns True if extracted data was saved (False when there is no
+    conversation or the latest message carries no data).
+    """
+    async with async_session() as session:
+        service = _build_conversation_service(session)
+        extracted = await service.extract_if_changed(will_id, section)
+        if extracted is None:
+            return False
+        await service.save_extracted_to_will(will_id, section, extracted)
+        await session.commit()
+        return True
+
+
+async def run_background_summarization(will_id: uuid.UUID, section: str) -> bool:
+    """Update the running summary of one section conversation in its own session.
+
+    Returns True if the summary was updated.
+    """
+    async with async_session() as session:
+        service = _build_conversation_service(session)
+        updated = await service.summarize_if_needed(will_id, section)
+        if updated:
+            await session.commit()
+        return updated
+
+
+# Process-wide queue for post-turn extraction jobs.
+extraction_queue = ExtractionQueue(
+    runner=run_background_extraction,
+    debounce=settings.EXTRACTION_DEBOUNCE_SECONDS,
+)
+
+# Process-wide queue for rolling summary updates (same one-job-per-section
+# semantics as extraction).
+summary_queue = ExtractionQueue(runner=run_background_summarization)
+
+
+def get_conversation_service(
+    session: AsyncSession = Depends(get_session),
+) -> ConversationService:
+    """FastAPI dependency that assembles a ConversationService.
+
+    Wires together the database session, OpenAI service, and UPL filter
+    service via dependency injection.
+    """
+    return _build_conversation_service(session)
@@ -1,27 +1,41 @@
 """Document generation service for assembling and rendering will PDFs.
 
 Orchestrates clause assembly from will JSONB data, renders HTML via Jinja2,
-and generates PDF via WeasyPrint in a thread pool to avoid blocking the
-async event loop.
+and generates PDF via the shared WeasyPrint process-pool engine to avoid
+blocking the async event loop. Rendered PDFs are memoised in a
+content-addressed cache so repeat downloads of an unchanged will skip
+WeasyPrint entirely (and are streamed from disk rather than buffered),
+and individual clause renders are memoised on the variables each clause
+consumes so a small edit only re-renders the clauses whose inputs
+changed.
 """
 
-import asyncio
+import hashlib
+import json
 import logging
+import os
+import tempfile
 import uuid
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+import anyio
 from fastapi import Depends
 from jinja2 import Environment, FileSystemLoader
+from sqlalchemy import ColumnElement, Text, cast, false, func, or_, true
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel.ext.asyncio.session import AsyncSession
-from weasyprint import HTML
 
+from app.config import settings
 from app.database import get_session
 from app.models.clause import ClauseCategory, WillType
 from app.models.will import Will
 from app.services.clause_library import ClauseLibraryService
+from app.services.pdf_cache import compute_cache_key, pdf_cache, template_fingerprint
+from app.services.pdf_renderer import render_engine
+from app.services.pdf_stream import PDFDocument, etag_matches, make_etag
 from app.services.will_service import WillService
 
 logger = logging.getLogger(__name__)
@@ -32,8 +46,6 @@ logger = logging.getLogger(__name__)
 
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
 
-_pdf_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-gen")
-
 _doc_jinja_env = Environment(
     loader=FileSystemLoader(str(TEMPLATE_DIR)),
     autoescape=True,
@@ -42,6 +54,27 @@ _doc_jinja_env = Environment(
 # Placeholder for missing data -- renders visibly so users know to complete.
 _MISSING = "[To be completed]"
 
+# Will template fingerprint for PDF cache keys. Templates ship with the
+# deployment, so it is computed once per process (per render in DEBUG,
+# where templates are edited live).
+_template_fingerprint: str | None = None
+
+
+async def _will_template_fingerprint() -> str:
+    global _template_fingerprint
+    if _template_fingerprint is None or settings.DEBUG:
+        _template_fingerprint = await anyio.to_thread.run_sync(
+            template_fingerprint, TEMPLATE_DIR / "will"
+        )
+    return _template_fingerprint
+
+
+def _new_temp_pdf() -> Path:
+    """Create an empty temp file for a render to write into."""
+    fd, tmp_name = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    return Path(tmp_name)
+
 # ---------------------------------------------------------------------------
 # Clause assembly order
 # ---------------------------------------------------------------------------
@@ -284,20 +317,124 @@ def _should_include_clause(will: Will, entry: dict) -> bool | list:
     return False
 
 
+# JSONB text of the values ``bool()`` treats as false
+_FALSY_JSON_TEXT = ['""', "false", "0", "0.0", "{}", "[]", "null"]
+
+
+def clause_condition_filter(condition: str) -> ColumnElement[bool]:
+    """Translate a CLAUSE_ORDER condition into a SQL predicate on ``wills``.
+
+    The database-side twin of :func:`_should_include_clause`: it matches
+    exactly the wills for which that function would include the clause,
+    so bulk jobs can find affected wills in one query.
+    """
+    columns = Will.__table__.c
+
+    if condition == "always":
+        return true()
+
+    if condition.startswith("scenario:"):
+        return columns.scenarios.contains([condition[len("scenario:"):]])
+
+    if condition.startswith("has:"):
+        # Mirrors ``bool(value)``: empty strings, objects and arrays, false,
+        # zero and JSON null all count as absent.
+        parts = condition[len("has:"):].split(".")
+        column = columns[parts[0]]
+        if not isinstance(column.type, JSONB):
+            return func.coalesce(column, "") != ""
+        value = column[tuple(parts[1:])] if len(parts) > 1 else column
+        return func.coalesce(cast(value, Text), "null").notin_(_FALSY_JSON_TEXT)
+
+    if condition.startswith("has_items:"):
+        column = columns[condition[len("has_items:"):]]
+        return func.jsonb_array_length(column) > 0
+
+    if condition.startswith("each:"):
+        parts = condition[len("each:"):].split(":")
+        column = columns[parts[0]]
+        if len(parts) > 1:
+            return column.contains([{"business_type": parts[1]}])
+        return func.jsonb_array_length(column) > 0
+
+    logger.warning("Unknown condition type: %s", condition)
+    return false()
+
+
+def wills_using_clauses(codes: set[str]) -> ColumnElement[bool]:
+    """Return a predicate matching wills whose document includes any of *codes*."""
+    predicates = [
+        clause_condition_filter(entry["condition"])
+        for entry in CLAUSE_ORDER
+        if entry["code"] in codes
+    ]
+    return or_(*predicates) if predicates else false()
+
+
 # ---------------------------------------------------------------------------
-# Synchronous PDF rendering (runs in thread pool)
+# Clause fragment memoisation
 # ---------------------------------------------------------------------------
 
+# Upper bound on memoised clause fragments across all wills.
+_FRAGMENT_CACHE_SIZE = 4096
 
-def _render_pdf_sync(html_string: str) -> bytes:
-    """Render HTML to PDF bytes via WeasyPrint.
 
-    This is CPU-bound and must be called in a thread executor.
+class ClauseFragmentCache:
+    """LRU of rendered clause text keyed on the clause and its inputs.
+
+    The key covers the clause code, version and template hash plus the
+    exact variables produced by ``_extract_variables`` for that clause, so
+    editing one bequest only invalidates that bequest's BENEF-01 fragment;
+    every other clause is stitched back in from the cache.
     """
-    return HTML(
-        string=html_string,
-        base_url=str(TEMPLATE_DIR),
-    ).write_pdf()
+
+    def __init__(self, max_size: int = _FRAGMENT_CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._fragments: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(clause: Any, variables: dict) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{clause.code}@{clause.version}\x00".encode("utf-8"))
+        digest.update(clause.template_text.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(
+            json.dumps(variables, sort_keys=True, default=str).encode("utf-8")
+        )
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        fragment = self._fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+            return None
+        self._fragments.move_to_end(key)
+        self.hits += 1
+        return fragment
+
+    def put(self, key: str, fragment: str) -> None:
+        self._fragments[key] = fragment
+        self._fragments.move_to_end(key)
+        if len(self._fragments) > self._max_size:
+            self._fragments.popitem(last=False)
+
+    def clear(self) -> None:
+        self._fragments.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "size": len(self._fragments),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+clause_fragment_cache = ClauseFragmentCache()
 
 
 # ---------------------------------------------------------------------------
@@ -325,7 +462,7 @@ class DocumentGenerationService:
 
     Uses ClauseLibraryService for clause retrieval and rendering,
     WillService for will retrieval with ownership checks, and runs
-    WeasyPrint PDF generation in a thread executor.
+    WeasyPrint PDF generation on the shared process-pool render engine.
     """
 
     def __init__(self, session: AsyncSession) -> None:
@@ -347,13 +484,46 @@ class DocumentGenerationService:
         will = await self._will_svc.get_will(will_id, user_id)
         return await self._generate(will, is_preview=False)
 
+    async def open_preview(
+        self,
+        will_id: uuid.UUID,
+        user_id: uuid.UUID,
+        if_none_match: str | None = None,
+    ) -> PDFDocument:
+        """Open a watermarked preview PDF for streaming."""
+        will = await self._will_svc.get_will(will_id, user_id)
+        return await self._open(will, is_preview=True, if_none_match=if_none_match)
+
+    async def open_final(
+        self,
+        will_id: uuid.UUID,
+        user_id: uuid.UUID,
+        if_none_match: str | None = None,
+    ) -> PDFDocument:
+        """Open a final (no watermark) PDF for streaming."""
+        will = await self._will_svc.get_will(will_id, user_id)
+        return await self._open(will, is_preview=False, if_none_match=if_none_match)
+
     async def _generate(self, will: Will, is_preview: bool) -> bytes:
+        """Produce the PDF for *will* as bytes (for callers that need a buffer)."""
+        document = await self._open(will, is_preview)
+        with document.file as fh:
+            return fh.read()
+
+    async def _open(
+        self, will: Will, is_preview: bool, if_none_match: str | None = None
+    ) -> PDFDocument:
         """Core generation pipeline: assemble clauses, render HTML, produce PDF.
 
         1. Assemble ordered clause list from will JSONB data
         2. Build template context with testator info, clauses, metadata
         3. Render HTML via Jinja2
-        4. Generate PDF in thread executor (non-blocking)
+        4. Short-circuit if the client already holds this exact document
+        5. Open it from the PDF cache, or render it to disk on the process
+           pool (non-blocking) and move the file into the cache
+
+        Cache and temp-file I/O runs in worker threads. The returned file
+        is owned by the caller.
         """
         # 1. Assemble clauses
         clauses = await self._assemble_clauses(will)
@@ -377,27 +547,51 @@ class DocumentGenerationService:
         template = _doc_jinja_env.get_template("will/base.html")
         html_string = template.render(**context)
 
-        # 4. Generate PDF in thread pool
-        loop = asyncio.get_event_loop()
-        pdf_bytes: bytes = await loop.run_in_executor(
-            _pdf_executor, _render_pdf_sync, html_string
+        # 4. The cache key doubles as the ETag
+        cache_key = compute_cache_key(
+            html_string,
+            [(c["code"], c["version"]) for c in clauses],
+            await _will_template_fingerprint(),
         )
-
-        logger.info(
-            "Generated %s PDF for will %s (%d bytes)",
-            "preview" if is_preview else "final",
-            will.id,
-            len(pdf_bytes),
+        etag = make_etag(cache_key)
+        if etag_matches(if_none_match, etag):
+            return PDFDocument(etag=etag, file=None)
+
+        kind = "preview" if is_preview else "final"
+
+        # 5. Serve from cache when the exact same document was rendered before
+        cached = await anyio.to_thread.run_sync(pdf_cache.open, cache_key)
+        if cached is not None:
+            logger.info("Served %s PDF for will %s from cache", kind, will.id)
+            return PDFDocument(etag=etag, file=cached)
+
+        # 6. Render straight to a temp file on the shared render engine,
+        #    open it, then hand the file to the cache (which moves or deletes
+        #    it -- the open handle stays valid either way).
+        tmp_path = await anyio.to_thread.run_sync(_new_temp_pdf)
+        try:
+            size = await render_engine.render_to_file(
+                html_string, base_url=str(TEMPLATE_DIR), target=str(tmp_path)
+            )
+            fh = await anyio.to_thread.run_sync(tmp_path.open, "rb")
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        await anyio.to_thread.run_sync(
+            pdf_cache.put_file, cache_key, tmp_path, str(will.id)
         )
 
-        return pdf_bytes
+        logger.info("Generated %s PDF for will %s (%d bytes)", kind, will.id, size)
+
+        return PDFDocument(etag=etag, file=fh)
 
     async def _assemble_clauses(self, will: Will) -> list[dict]:
         """Assemble ordered clause list from will data.
 
         Iterates through CLAUSE_ORDER, evaluates conditions, fetches
-        clause templates from the database, extracts variables, and
-        renders each clause. Returns a list of dicts suitable for
+        clause templates from the clause snapshot, extracts variables, and
+        renders each clause (or reuses its memoised fragment when the
+        variables are unchanged). Returns a list of dicts suitable for
         the Jinja2 template.
         """
         assembled: list[dict] = []
@@ -423,6 +617,8 @@ class DocumentGenerationService:
                     rendered = self._safe_render(clause, variables, code)
                     assembled.append({
                         "number": clause_number,
+                        "code": clause.code,
+                        "version": clause.version,
                         "name": clause.name,
                         "rendered_text": rendered,
                         "sub_clauses": [],
@@ -434,6 +630,8 @@ class DocumentGenerationService:
                 rendered = self._safe_render(clause, variables, code)
                 assembled.append({
                     "number": clause_number,
+                    "code": clause.code,
+                    "version": clause.version,
                     "name": clause.name,
                     "rendered_text": rendered,
                     "sub_clauses": [],
@@ -443,14 +641,21 @@ class DocumentGenerationService:
         return assembled
 
     def _safe_render(self, clause: Any, variables: dict, code: str) -> str:
-        """Render clause with error fallback.
+        """Render clause with error fallback, reusing memoised fragments.
 
         If rendering fails (missing variable despite safe defaults),
         returns a fallback message rather than crashing the entire
-        PDF generation.
+        PDF generation. Fallbacks are not memoised.
         """
+        key = ClauseFragmentCache.key(clause, variables)
+        cached = clause_fragment_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            return self._clause_svc.render_clause(clause, variables)
+            rendered = self._clause_svc.render_clause(clause, variables)
+            clause_fragment_cache.put(key, rendered)
+            return rendered
         except ValueError as exc:
             logger.error(
                 "Failed to render clause %s: %s. Using fallback.", code, exc
@@ -0,0 +1,141 @@
+"""Change-gated conversation extraction.
+
+Structured extraction re-sends the conversation to OpenAI every time it
+runs. Two cheap checks avoid most of those calls:
+
+- **Fingerprint cache** -- results are keyed by the will, the section
+  and a SHA-256 of the exact messages sent for extraction. Unchanged
+  input means an identical result, so it is served from memory. A hit
+  only skips the OpenAI call: callers still save the result, so a save
+  that failed earlier is retried.
+- **Data-signal heuristic** -- a background run is skipped when the
+  latest user message is a pure pleasantry ("thanks", "great!", an
+  emoji) that cannot add will data. Confirmations such as "yes" or "ok"
+  are deliberately *not* treated as empty, because they often accept
+  details the assistant just proposed.
+
+Counters for executed and skipped extractions are exposed through the
+metrics endpoint so the saved API spend is visible.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from app.prompts.extraction import ExtractedWillData
+
+# Upper bound on cached extraction results (fingerprints and per-section).
+_CACHE_SIZE = 2048
+
+# Words that on their own never carry will data.
+_PLEASANTRIES = frozenset({
+    "thanks", "thank", "you", "thx", "ty", "much", "very", "so",
+    "great", "cool", "nice", "awesome", "perfect", "lovely", "cheers",
+    "brilliant", "excellent", "wonderful", "appreciated", "appreciate", "it",
+    "hi", "hello", "hey", "bye", "goodbye", "morning", "good",
+})
+
+_WORD_RE = re.compile(r"[a-z']+")
+
+
+def conversation_fingerprint(messages: list[dict]) -> str:
+    """Return a stable hash of the role/content pairs in *messages*."""
+    digest = hashlib.sha256()
+    for message in messages:
+        digest.update(message["role"].encode("utf-8"))
+        digest.update(b"\x1f")
+        digest.update(message["content"].encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def may_contain_data(message: str) -> bool:
+    """Return False only when *message* clearly cannot add will data."""
+    lowered = message.lower()
+    if any(ch.isdigit() for ch in lowered):
+        return True
+    words = _WORD_RE.findall(lowered)
+    return any(word not in _PLEASANTRIES for word in words)
+
+
+class ExtractionCache:
+    """LRU of extraction results keyed by ``(will_id, section, fingerprint)``.
+
+    Also remembers the latest result per ``(will_id, section)``, so that a
+    turn skipped by the heuristic can alias its fingerprint to the result
+    it would have produced.
+    """
+
+    def __init__(self, max_size: int = _CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._by_fingerprint: OrderedDict[
+            tuple[uuid.UUID, str, str], ExtractedWillData
+        ] = OrderedDict()
+        self._latest: OrderedDict[tuple[uuid.UUID, str], ExtractedWillData] = OrderedDict()
+        self.executed = 0
+        self.skipped_unchanged = 0
+        self.skipped_no_signal = 0
+
+    def get(
+        self, will_id: uuid.UUID, section: str, fingerprint: str
+    ) -> Optional[ExtractedWillData]:
+        """Return the cached result for *fingerprint*, counting a skip on hit."""
+        key = (will_id, section, fingerprint)
+        result = self._by_fingerprint.get(key)
+        if result is not None:
+            self._by_fingerprint.move_to_end(key)
+            self.skipped_unchanged += 1
+        return result
+
+    def put(
+        self,
+        will_id: uuid.UUID,
+        section: str,
+        fingerprint: str,
+        result: ExtractedWillData,
+    ) -> None:
+        """Record a fresh extraction result."""
+        self._store(self._by_fingerprint, (will_id, section, fingerprint), result)
+        self._store(self._latest, (will_id, section), result)
+
+    def skip_no_signal(
+        self, will_id: uuid.UUID, section: str, fingerprint: str
+    ) -> None:
+        """Record a heuristic skip, aliasing *fingerprint* to the latest result."""
+        self.skipped_no_signal += 1
+        latest = self._latest.get((will_id, section))
+        if latest is not None:
+            self._store(self._by_fingerprint, (will_id, section, fingerprint), latest)
+
+    def _store(self, store: OrderedDict, key, value) -> None:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self._max_size:
+            store.popitem(last=False)
+
+    def clear(self) -> None:
+        self._by_fingerprint.clear()
+        self._latest.clear()
+        self.executed = 0
+        self.skipped_unchanged = 0
+        self.skipped_no_signal = 0
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        skipped = self.skipped_unchanged + self.skipped_no_signal
+        total = skipped + self.executed
+        return {
+            "executed": self.executed,
+            "skipped_unchanged": self.skipped_unchanged,
+            "skipped_no_signal": self.skipped_no_signal,
+            "skip_ratio": round(skipped / total, 4) if total else 0.0,
+            "cached_results": len(self._by_fingerprint),
+        }
+
+
+# Process-wide cache shared by request-time and background extraction.
+extraction_cache = ExtractionCache()
@@ -0,0 +1,148 @@
+"""Deduplicated background queue for conversation data extraction.
+
+Structured extraction is a second full OpenAI call per assistant turn. It
+runs here, off the SSE response path, as at most one job per
+``(will_id, section)``. Turns that arrive while a job is waiting or running
+only mark it dirty, and the job then runs once more over the latest
+conversation state. However many turns arrive back to back, they collapse
+into at most one extra run.
+
+The queue is per process. With several API workers, the status of a job
+is only visible on the worker that ran it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on per-key status records kept for polling.
+_MAX_TRACKED_KEYS = 10_000
+
+ExtractionRunner = Callable[[uuid.UUID, str], Awaitable[bool]]
+
+
+@dataclass
+class ExtractionStatus:
+    """Polling view of the extraction job for one will section."""
+
+    state: str = "idle"  # idle | pending | running
+    runs: int = 0
+    has_data: bool = False
+    last_finished_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ExtractionQueue:
+    """Runs at most one extraction per ``(will_id, section)`` at a time.
+
+    *runner* performs one extraction and returns whether any data was
+    extracted. *debounce* is how long (in seconds) a job waits before
+    running, so that rapid turns collapse into one run.
+    """
+
+    def __init__(self, runner: ExtractionRunner, debounce: float = 0.0) -> None:
+        self._runner = runner
+        self._debounce = debounce
+        self._tasks: dict[tuple[uuid.UUID, str], asyncio.Task] = {}
+        self._dirty: set[tuple[uuid.UUID, str]] = set()
+        self._status: OrderedDict[tuple[uuid.UUID, str], ExtractionStatus] = OrderedDict()
+        self.requested = 0
+        self.executed = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def schedule(self, will_id: uuid.UUID, section: str) -> None:
+        """Request an extraction over the latest state of a conversation."""
+        key = (will_id, section)
+        self.requested += 1
+        status = self._track(key)
+        if key in self._tasks:
+            self._dirty.add(key)
+            self.coalesced += 1
+            return
+        status.state = "pending"
+        task = asyncio.create_task(self._run(key, status))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _t: self._tasks.pop(key, None))
+
+    def status(self, will_id: uuid.UUID, section: str) -> ExtractionStatus:
+        """Return the job status for a will section (idle if never run)."""
+        return self._status.get((will_id, section)) or ExtractionStatus()
+
+    async def drain(self) -> None:
+        """Wait for all queued and running jobs to finish."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    def shutdown(self) -> None:
+        """Cancel outstanding jobs (called from the app lifespan)."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    async def _run(
+        self, key: tuple[uuid.UUID, str], status: ExtractionStatus
+    ) -> None:
+        try:
+            while True:
+                if self._debounce > 0:
+                    await asyncio.sleep(self._debounce)
+                self._dirty.discard(key)
+                status.state = "running"
+                try:
+                    status.has_data = await self._runner(*key)
+                    status.last_error = None
+                except Exception as exc:
+                    self.failures += 1
+                    status.last_error = str(exc) or type(exc).__name__
+                    logger.warning(
+                        "Background extraction failed for will %s section %s: %s",
+                        key[0], key[1], exc,
+                    )
+                self.executed += 1
+                status.runs += 1
+                status.last_finished_at = datetime.now(timezone.utc)
+                if key not in self._dirty:
+                    break
+                status.state = "pending"
+        finally:
+            status.state = "idle"
+
+    def _track(self, key: tuple[uuid.UUID, str]) -> ExtractionStatus:
+        status = self._status.get(key)
+        if status is None:
+            status = self._status[key] = ExtractionStatus()
+            self._prune()
+        else:
+            self._status.move_to_end(key)
+        return status
+
+    def _prune(self) -> None:
+        # Drop the oldest idle records; active ones are always kept.
+        excess = len(self._status) - _MAX_TRACKED_KEYS
+        for key in list(self._status):
+            if excess <= 0:
+                break
+            if key not in self._tasks:
+                del self._status[key]
+                excess -= 1
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "requested": self.requested,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "failures": self.failures,
+            "active": len(self._tasks),
+        }
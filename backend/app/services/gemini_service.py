@@ -28,14 +28,21 @@ class GeminiService:
     - Availability checking (graceful fallback when API key missing)
     """
 
-    def __init__(self, api_key: str, model: str = "gemini-2.5-flash") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-2.5-flash",
+        client: genai.Client | None = None,
+    ) -> None:
         self._api_key = api_key
         self._model = model
-        self._client = genai.Client(api_key=api_key) if api_key else None
+        if client is None and api_key:
+            client = genai.Client(api_key=api_key)
+        self._client = client
 
     async def verify(
         self,
-        will_data: dict,
+        will_data: dict | None,
         prompt: str,
         response_schema: type[T],
     ) -> T:
@@ -44,7 +51,8 @@ class GeminiService:
         Parameters
         ----------
         will_data:
-            Will section data to verify as dict.
+            Will section data to verify as dict, appended after the prompt.
+            None when the prompt already embeds the will data.
         prompt:
             Verification prompt instructing the model what to check.
         response_schema:
@@ -64,9 +72,10 @@ class GeminiService:
         if not self._client:
             raise RuntimeError("GeminiService unavailable: no API key configured")
 
+        contents = prompt if will_data is None else f"{prompt}\n\nWill data:\n{will_data}"
         response = await self._client.aio.models.generate_content(
             model=self._model,
-            contents=f"{prompt}\n\nWill data:\n{will_data}",
+            contents=contents,
             config=types.GenerateContentConfig(
                 response_mime_type="application/json",
                 response_schema=response_schema,
@@ -13,8 +13,11 @@ from openai import AsyncOpenAI
 
 from app.prompts.extraction import (
     EXTRACTION_SYSTEM_PROMPT,
+    MULTI_SECTION_EXTRACTION_PROMPT,
     ExtractedWillData,
+    format_section_transcripts,
 )
+from app.prompts.summary import SUMMARY_SYSTEM_PROMPT, format_summary_request
 from app.prompts.system import build_system_prompt
 
 logger = logging.getLogger(__name__)
@@ -22,10 +25,55 @@ logger = logging.getLogger(__name__)
 # Temperature settings
 _CONVERSATION_TEMPERATURE = 0.7
 _EXTRACTION_TEMPERATURE = 0.2
+_SUMMARY_TEMPERATURE = 0.2
 
 # Token limits
 _STREAM_MAX_TOKENS = 1024
 _EXTRACT_MAX_TOKENS = 512
+_MULTI_EXTRACT_MAX_TOKENS = 2048  # one result covering every section
+_SUMMARY_MAX_TOKENS = 600
+
+
+class PromptCacheStats:
+    """Prompt and provider-cached token counts from OpenAI usage reports.
+
+    OpenAI reuses a cached prompt prefix automatically (prompts of 1024+
+    tokens); ``usage.prompt_tokens_details.cached_tokens`` reports how much
+    of each prompt was served from that cache.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+
+    def record(self, usage) -> None:
+        """Add one response's usage; ignores responses without usage data."""
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(prompt_tokens, int):
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        self.requests += 1
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached if isinstance(cached, int) else 0
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "requests": self.requests,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cached_ratio": (
+                round(self.cached_tokens / self.prompt_tokens, 4)
+                if self.prompt_tokens
+                else 0.0
+            ),
+        }
+
+
+# Process-wide prompt cache usage across all OpenAI calls.
+prompt_cache_stats = PromptCacheStats()
 
 
 class OpenAIService:
@@ -34,10 +82,18 @@ class OpenAIService:
     Responsibilities:
     - Stream conversational AI responses with section-specific prompts
     - Extract structured will data from natural language via Structured Outputs
+    - Fold older conversation messages into a running summary
     """
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini") -> None:
-        self._client = AsyncOpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        client: AsyncOpenAI | None = None,
+    ) -> None:
+        # Pass the shared client from app.services.ai_clients to reuse its
+        # connection pool; a private client is only built as a fallback.
+        self._client = client or AsyncOpenAI(api_key=api_key)
         self._model = model
 
     async def stream_response(
@@ -45,6 +101,7 @@ class OpenAIService:
         messages: list[dict],
         section: str,
         will_context: dict,
+        conversation_summary: str = "",
     ) -> AsyncGenerator[str, None]:
         """Stream an AI response for the given conversation section.
 
@@ -56,12 +113,16 @@ class OpenAIService:
             Current will section (beneficiaries, assets, guardians, etc.).
         will_context:
             Current will data for system prompt context.
+        conversation_summary:
+            Running summary of earlier messages not included in *messages*.
 
         Yields
         ------
         Text chunks as they arrive from the streaming API.
         """
-        system_prompt = build_system_prompt(section, will_context)
+        system_prompt = build_system_prompt(
+            section, will_context, conversation_summary
+        )
 
         stream = await self._client.chat.completions.create(
             model=self._model,
@@ -70,13 +131,24 @@ class OpenAIService:
                 *messages,
             ],
             stream=True,
+            stream_options={"include_usage": True},
             temperature=_CONVERSATION_TEMPERATURE,
             max_tokens=_STREAM_MAX_TOKENS,
         )
 
-        async for chunk in stream:
-            if chunk.choices and chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                elif getattr(chunk, "usage", None) is not None:
+                    # Final chunk (no choices) carries the usage report
+                    prompt_cache_stats.record(chunk.usage)
+        finally:
+            # Closing the HTTP response tells OpenAI to stop generating when
+            # the consumer abandons the stream early (e.g. UPL abort).
+            close = getattr(stream, "close", None)
+            if close is not None:
+                await close()
 
     async def extract_will_data(
         self,
@@ -86,13 +158,14 @@ class OpenAIService:
         """Extract structured will data from the full conversation.
 
         Uses OpenAI Structured Outputs (response_format with Pydantic model)
-        for guaranteed schema-valid extraction. Sends the full conversation
-        history so the model can compile data stated across multiple messages.
+        for guaranteed schema-valid extraction. Sends the conversation window
+        (token-budgeted by the caller) so the model can compile data stated
+        across multiple messages.
 
         Parameters
         ----------
         conversation_history:
-            Full conversation messages for extraction context.
+            Conversation window for extraction context.
         latest_message:
             The most recent user message (unused, kept for API compat).
 
@@ -104,11 +177,74 @@ class OpenAIService:
             model=self._model,
             messages=[
                 {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
-                *conversation_history[-20:],  # Full conversation window
+                *conversation_history,
             ],
             response_format=ExtractedWillData,
             temperature=_EXTRACTION_TEMPERATURE,
             max_tokens=_EXTRACT_MAX_TOKENS,
         )
+        prompt_cache_stats.record(completion.usage)
 
         return completion.choices[0].message.parsed
+
+    async def extract_will_data_multi(
+        self,
+        section_histories: dict[str, list[dict]],
+    ) -> ExtractedWillData:
+        """Extract will data for several sections in one structured-output call.
+
+        Parameters
+        ----------
+        section_histories:
+            Conversation window per section name, as {role, content} dicts.
+
+        Returns
+        -------
+        ExtractedWillData covering every section's conversation.
+        """
+        completion = await self._client.chat.completions.parse(
+            model=self._model,
+            messages=[
+                {"role": "system", "content": MULTI_SECTION_EXTRACTION_PROMPT},
+                {
+                    "role": "user",
+                    "content": format_section_transcripts(section_histories),
+                },
+            ],
+            response_format=ExtractedWillData,
+            temperature=_EXTRACTION_TEMPERATURE,
+            max_tokens=_MULTI_EXTRACT_MAX_TOKENS,
+        )
+        prompt_cache_stats.record(completion.usage)
+
+        return completion.choices[0].message.parsed
+
+    async def summarize_conversation(
+        self,
+        previous_summary: str,
+        messages: list[dict],
+    ) -> str:
+        """Merge *messages* into *previous_summary* and return the new summary.
+
+        Parameters
+        ----------
+        previous_summary:
+            Current running summary (empty for the first fold).
+        messages:
+            The next messages to fold in, as {role, content} dicts.
+        """
+        completion = await self._client.chat.completions.create(
+            model=self._model,
+            messages=[
+                {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": format_summary_request(previous_summary, messages),
+                },
+            ],
+            temperature=_SUMMARY_TEMPERATURE,
+            max_tokens=_SUMMARY_MAX_TOKENS,
+        )
+        prompt_cache_stats.record(completion.usage)
+
+        return (completion.choices[0].message.content or "").strip()
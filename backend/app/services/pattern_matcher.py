@@ -0,0 +1,136 @@
+"""Multi-pattern matcher with a literal prefilter.
+
+Running every compiled regex over a response separately costs one full
+case-insensitive scan per pattern, and ``re.IGNORECASE`` disables the
+regex engine's fast literal search. Most UPL patterns, however, cannot
+match without a specific word being present ("estate", "litigation",
+"you should" ...). ``MultiPatternMatcher`` extracts such a required
+literal (an *anchor*) from each pattern when it is built, lower-cases the
+text once per call, checks which anchors occur using C-speed substring
+search, and only runs the full regex for patterns whose anchor is
+present. Patterns without a usable anchor are always confirmed with
+their regex, so results are identical to searching each pattern in turn.
+
+Lower-casing only agrees with ``re.IGNORECASE`` folding for ASCII: the
+regex engine also folds characters such as U+017F (long s) to "s". A
+case-insensitive pattern therefore only gets anchors when they are pure
+ASCII, and on non-ASCII text such patterns skip the prefilter and always
+run their regex.
+
+Anchors are read from the regex parse tree via ``re._parser`` (named
+``sre_parse`` before Python 3.11). It is private, so if it cannot be
+imported or fails on a pattern, that pattern simply gets no anchors;
+match results never depend on it.
+
+Python's ``re`` has no multi-literal (Aho-Corasick) search, and a single
+combined alternation of all patterns benchmarks slower than separate
+scans, so the prefilter is a set of substring checks instead.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+try:  # Python 3.11+ (private module, see the module docstring)
+    from re import _parser as _sre_parse  # type: ignore[attr-defined]
+    from re._constants import BRANCH, LITERAL  # type: ignore[attr-defined]
+except ImportError:  # pragma: no cover - Python < 3.11 or a changed layout
+    try:
+        import sre_parse as _sre_parse  # type: ignore[no-redef]
+        from sre_constants import BRANCH, LITERAL  # type: ignore[no-redef]
+    except ImportError:
+        _sre_parse = None  # No anchors: every pattern runs its full regex
+
+# Anchors shorter than this filter too little to be worth checking.
+_MIN_ANCHOR_LEN = 3
+
+
+def _anchors_for(items: list) -> Optional[frozenset[str]]:
+    """Return literals of which at least one must occur in any match.
+
+    A top-level alternation yields one anchor per branch; otherwise the
+    longest run of consecutive literal characters is used.
+    """
+    if len(items) == 1 and items[0][0] is BRANCH:
+        anchors: set[str] = set()
+        for branch in items[0][1][1]:
+            branch_anchors = _anchors_for(list(branch))
+            if branch_anchors is None:
+                return None
+            anchors |= branch_anchors
+        return frozenset(anchors)
+
+    best = ""
+    run: list[str] = []
+    for op, av in [*items, (None, None)]:
+        if op is LITERAL:
+            run.append(chr(av))
+            continue
+        if len(run) > len(best):
+            best = "".join(run)
+        run = []
+    if len(best) < _MIN_ANCHOR_LEN:
+        return None
+    return frozenset({best})
+
+
+def literal_anchors(regex: re.Pattern) -> Optional[frozenset[str]]:
+    """Extract required literals from *regex*, or ``None`` if it has none.
+
+    Anchors of case-insensitive patterns are lower-cased, and such a
+    pattern only gets anchors if they are all ASCII.
+    """
+    if _sre_parse is None:
+        return None
+    try:
+        anchors = _anchors_for(list(_sre_parse.parse(regex.pattern, regex.flags)))
+    except Exception:
+        return None
+    if anchors is not None and regex.flags & re.IGNORECASE:
+        if not all(anchor.isascii() for anchor in anchors):
+            return None
+        anchors = frozenset(a.lower() for a in anchors)
+    return anchors
+
+
+class MultiPatternMatcher:
+    """Match a fixed set of named regexes against text in one call.
+
+    ``match`` returns the names of all patterns that match, in the order
+    the patterns were given.
+    """
+
+    def __init__(self, patterns: list[tuple[str, re.Pattern]]) -> None:
+        self._entries: list[tuple[str, re.Pattern, Optional[frozenset[str]], bool]] = [
+            (name, regex, literal_anchors(regex), bool(regex.flags & re.IGNORECASE))
+            for name, regex in patterns
+        ]
+
+    @property
+    def names(self) -> list[str]:
+        return [name for name, *_ in self._entries]
+
+    def anchors(self) -> dict[str, Optional[frozenset[str]]]:
+        """Return each pattern's prefilter anchors (for diagnostics and tests)."""
+        return {name: anchors for name, _regex, anchors, _icase in self._entries}
+
+    def match(self, text: str) -> list[str]:
+        """Return the names of all patterns that match *text*."""
+        lowered: Optional[str] = None
+        # str.lower() only matches IGNORECASE folding on ASCII text
+        ascii_text = text.isascii()
+        matched: list[str] = []
+        for name, regex, anchors, icase in self._entries:
+            if anchors is not None and (ascii_text or not icase):
+                if icase:
+                    if lowered is None:
+                        lowered = text.lower()
+                    haystack = lowered
+                else:
+                    haystack = text
+                if not any(anchor in haystack for anchor in anchors):
+                    continue
+            if regex.search(text):
+                matched.append(name)
+        return matched
@@ -0,0 +1,465 @@
+"""Content-addressed cache for rendered will PDFs.
+
+WeasyPrint rendering is the most expensive step in document generation,
+so identical inputs should only ever be rendered once. Cache keys are a
+SHA-256 over the rendered HTML, the clause versions that produced it, and
+the modification times of the Jinja2 templates on disk -- any change to
+will data, an approved clause, or a template yields a new key.
+
+Storage is pluggable via ``PDFCacheStore``; the default is a size-bounded
+LRU store in the private directory ``PDF_CACHE_DIR`` (the cache is off
+when it is not set). Entries are grouped per will and purged when the
+will is deleted.
+"""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Iterable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_FILE_SUFFIX = ".pdf"
+
+
+# ---------------------------------------------------------------------------
+# Key derivation
+# ---------------------------------------------------------------------------
+
+
+def template_fingerprint(template_dir: Path) -> str:
+    """Return a stable fingerprint of all HTML templates under *template_dir*.
+
+    Built from relative paths and ``st_mtime_ns`` so that editing any
+    template (including included partials) invalidates cached PDFs.
+    """
+    parts: list[str] = []
+    for path in sorted(template_dir.rglob("*.html")):
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            continue
+        parts.append(f"{path.relative_to(template_dir)}:{mtime}")
+    return ";".join(parts)
+
+
+def compute_cache_key(
+    html_string: str,
+    clause_versions: Iterable[tuple[str, int]],
+    template_mtimes: str,
+) -> str:
+    """Derive the content address for a rendered document.
+
+    Parameters
+    ----------
+    html_string:
+        Fully rendered HTML passed to WeasyPrint.
+    clause_versions:
+        ``(code, version)`` pairs for every clause in the document.
+    template_mtimes:
+        Output of :func:`template_fingerprint`.
+    """
+    digest = hashlib.sha256()
+    digest.update(html_string.encode("utf-8"))
+    digest.update(b"\x00")
+    for code, version in sorted(set(clause_versions)):
+        digest.update(f"{code}@{version};".encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(template_mtimes.encode("utf-8"))
+    return digest.hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Storage backends
+# ---------------------------------------------------------------------------
+
+
+def ensure_private_dir(directory: Path) -> None:
+    """Create *directory* if needed and restrict it to the current user.
+
+    Cached PDFs are wills (personal information), so neither the directory
+    nor anything under it may be readable by other local users.
+    """
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    os.chmod(directory, 0o700)
+
+
+class PDFCacheStore(abc.ABC):
+    """Storage interface for cached PDFs. Subclass to plug in other backends.
+
+    Every entry belongs to an *owner* (the will it was rendered for) so
+    that all of a will's entries can be purged when the will is deleted.
+    ``open`` and ``put_file`` have in-memory defaults built on ``get`` and
+    ``put``; file-backed stores override them to avoid buffering PDFs.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the PDF stored under *key*, or ``None`` on a miss."""
+
+    @abc.abstractmethod
+    def put(self, key: str, data: bytes, owner: str) -> None:
+        """Store *data* under *key* on behalf of *owner*."""
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Return a readable binary file for *key*, or ``None`` on a miss."""
+        data = self.get(key)
+        return io.BytesIO(data) if data is not None else None
+
+    def put_file(self, key: str, path: Path, owner: str) -> None:
+        """Store the file at *path* under *key*, consuming the source file."""
+        try:
+            self.put(key, path.read_bytes(), owner)
+        finally:
+            path.unlink(missing_ok=True)
+
+    @abc.abstractmethod
+    def purge(self, owner: str) -> int:
+        """Remove every entry stored for *owner*, returning how many."""
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abc.abstractmethod
+    def size_bytes(self) -> int:
+        """Return the total size of stored entries."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+
+
+class DiskLRUStore(PDFCacheStore):
+    """Size-bounded LRU store keeping one file per cached PDF.
+
+    Files live under ``<directory>/<owner>/<key>.pdf`` in private (0700)
+    directories. Recency is tracked in memory and seeded from file mtimes
+    on first use, so a restarted process keeps its warm cache. Other
+    processes (further uvicorn workers, the regeneration CLI) may write to
+    the same directory, so a key missing from the index is looked up on
+    disk and adopted before it counts as a miss. Writes go through a temp
+    file and ``os.replace`` so readers never see a partial PDF.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self._dir = directory
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._owners: dict[str, str] = {}
+        self._total = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        return self._dir
+
+    def _owner_dir(self, owner: str) -> Path:
+        return self._dir / owner
+
+    def _path(self, key: str) -> Path:
+        return self._owner_dir(self._owners[key]) / f"{key}{_FILE_SUFFIX}"
+
+    def _ensure_loaded(self) -> None:
+        """Index existing cache files, oldest first."""
+        if self._loaded:
+            return
+        ensure_private_dir(self._dir)
+        files = []
+        for path in self._dir.glob(f"*/*{_FILE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, path.stem, path.parent.name, stat.st_size))
+        for _mtime, key, owner, size in sorted(files):
+            self._entries[key] = size
+            self._owners[key] = owner
+            self._total += size
+        self._loaded = True
+        self._evict()
+
+    def _lookup(self, key: str) -> bool:
+        """Return True if *key* is stored (caller holds the lock).
+
+        Files written by another process since the index was built are
+        adopted into it, so they count towards the size bound.
+        """
+        self._ensure_loaded()
+        if key in self._entries:
+            return True
+        for path in self._dir.glob(f"*/{key}{_FILE_SUFFIX}"):
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            self._add(key, path.parent.name, size)
+            return key in self._entries
+        return False
+
+    def _drop(self, key: str) -> None:
+        """Forget *key* and delete its file (caller holds the lock)."""
+        path = self._path(key)
+        self._total -= self._entries.pop(key)
+        del self._owners[key]
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        while self._total > self._max_bytes and self._entries:
+            key = next(iter(self._entries))
+            size = self._entries[key]
+            self._drop(key)
+            logger.debug("Evicted cached PDF %s (%d bytes)", key, size)
+
+    def _touch(self, key: str) -> Path:
+        self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def _add(self, key: str, owner: str, size: int) -> None:
+        self._entries[key] = size
+        self._owners[key] = owner
+        self._total += size
+        self._evict()
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._lookup(key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if not self._lookup(key):
+                return None
+            try:
+                data = self._path(key).read_bytes()
+            except FileNotFoundError:
+                self._drop(key)
+                return None
+            self._touch(key)
+            return data
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        # The open descriptor stays valid even if the entry is evicted
+        # (unlinked) while the caller is still streaming it.
+        with self._lock:
+            if not self._lookup(key):
+                return None
+            try:
+                fh = self._path(key).open("rb")
+            except FileNotFoundError:
+                self._drop(key)
+                return None
+            self._touch(key)
+            return fh
+
+    def put_file(self, key: str, path: Path, owner: str) -> None:
+        size = path.stat().st_size
+        if size > self._max_bytes:
+            path.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._entries:
+                self._drop(key)
+            try:
+                ensure_private_dir(self._owner_dir(owner))
+                target = self._owner_dir(owner) / f"{key}{_FILE_SUFFIX}"
+                shutil.move(str(path), str(target))
+                os.chmod(target, 0o600)
+            except OSError:
+                logger.warning("Failed to store cached PDF %s", key, exc_info=True)
+                path.unlink(missing_ok=True)
+                return
+            self._add(key, owner, size)
+
+    def put(self, key: str, data: bytes, owner: str) -> None:
+        if len(data) > self._max_bytes:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            if key in self._entries:
+                self._drop(key)
+            owner_dir = self._owner_dir(owner)
+            try:
+                ensure_private_dir(owner_dir)
+                fd, tmp_name = tempfile.mkstemp(dir=owner_dir, suffix=".tmp")
+            except OSError:
+                logger.warning("Failed to write cached PDF %s", key, exc_info=True)
+                return
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(data)
+                os.replace(tmp_name, owner_dir / f"{key}{_FILE_SUFFIX}")
+            except OSError:
+                logger.warning("Failed to write cached PDF %s", key, exc_info=True)
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                return
+            self._add(key, owner, len(data))
+
+    def purge(self, owner: str) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            keys = [key for key, o in self._owners.items() if o == owner]
+            for key in keys:
+                self._drop(key)
+            shutil.rmtree(self._owner_dir(owner), ignore_errors=True)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ensure_loaded()
+            for key in list(self._entries):
+                self._drop(key)
+
+    def size_bytes(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ---------------------------------------------------------------------------
+# Cache facade
+# ---------------------------------------------------------------------------
+
+
+class PDFCache:
+    """Content-addressed PDF cache with hit/miss accounting.
+
+    Without a *store* (no ``PDF_CACHE_DIR`` configured) the cache is
+    disabled.
+    """
+
+    def __init__(self, store: Optional[PDFCacheStore], enabled: bool = True) -> None:
+        self._store = store
+        self._enabled = enabled and store is not None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PDF bytes for *key*, counting the hit or miss."""
+        if not self._enabled:
+            return None
+        try:
+            data = self._store.get(key)
+        except OSError:
+            logger.warning("PDF cache read failed for %s", key, exc_info=True)
+            data = None
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Return an open cached PDF for *key*, counting the hit or miss."""
+        if not self._enabled:
+            return None
+        try:
+            fh = self._store.open(key)
+        except OSError:
+            logger.warning("PDF cache read failed for %s", key, exc_info=True)
+            fh = None
+        if fh is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return fh
+
+    def put(self, key: str, data: bytes, owner: str) -> None:
+        """Store rendered PDF bytes under *key* (failures are logged, not raised)."""
+        if not self._enabled:
+            return
+        try:
+            self._store.put(key, data, owner)
+        except OSError:
+            logger.warning("PDF cache write failed for %s", key, exc_info=True)
+
+    def put_file(self, key: str, path: Path, owner: str) -> None:
+        """Move the rendered PDF at *path* into the cache.
+
+        The source file is always consumed: moved into the store, or
+        deleted when the cache is disabled or the write fails. Callers that
+        still need the content should open it first.
+        """
+        if not self._enabled:
+            path.unlink(missing_ok=True)
+            return
+        try:
+            self._store.put_file(key, path, owner)
+        except OSError:
+            logger.warning("PDF cache write failed for %s", key, exc_info=True)
+            path.unlink(missing_ok=True)
+
+    def purge(self, owner: str) -> None:
+        """Delete every cached PDF rendered for *owner* (e.g. a deleted will)."""
+        if self._store is None:
+            return
+        try:
+            removed = self._store.purge(owner)
+        except OSError:
+            logger.warning("PDF cache purge failed for %s", owner, exc_info=True)
+            return
+        if removed:
+            logger.info("Purged %d cached PDF(s) for %s", removed, owner)
+
+    def clear(self) -> None:
+        if self._store is not None:
+            self._store.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self._enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._store) if self._store is not None else 0,
+            "size_bytes": self._store.size_bytes() if self._store is not None else 0,
+        }
+
+
+def _build_pdf_cache() -> PDFCache:
+    # Cached PDFs are personal data, so they are only kept in a directory
+    # configured for them, never in the shared system temp dir.
+    if not settings.PDF_CACHE_DIR:
+        if settings.PDF_CACHE_ENABLED:
+            logger.warning("PDF_CACHE_DIR is not set; the rendered PDF cache is disabled")
+        return PDFCache(store=None)
+    return PDFCache(
+        store=DiskLRUStore(Path(settings.PDF_CACHE_DIR), settings.PDF_CACHE_MAX_BYTES),
+        enabled=settings.PDF_CACHE_ENABLED,
+    )
+
+
+# Process-wide cache shared by all DocumentGenerationService instances.
+pdf_cache = _build_pdf_cache()
@@ -0,0 +1,234 @@
+"""Shared WeasyPrint rendering engine backed by a process pool.
+
+WeasyPrint is CPU-bound and holds the GIL for long stretches, so rendering
+in threads serialises on a single core. All PDF generation (wills and
+additional documents) goes through one process pool sized to the
+container's cores, with a bounded number of in-flight jobs and a per-job
+timeout. When the queue is full callers receive a 503 with ``Retry-After``
+instead of piling more work onto an already saturated renderer. A job that
+times out gets its pool recycled (workers terminated), since WeasyPrint
+cannot be interrupted and a stuck worker would otherwise hold its core.
+
+Workers are started with ``forkserver`` (``spawn`` where unavailable),
+never ``fork``: forking the threaded uvicorn process can leave children
+deadlocked on locks held by other threads at fork time. Worker entry
+points are therefore module-level functions importable in a fresh
+interpreter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _render_pdf_sync(html_string: str, base_url: str) -> bytes:
+    """Render HTML to PDF bytes via WeasyPrint.
+
+    Runs inside a worker process. WeasyPrint is imported here so the
+    parent process never pays its import cost unless it renders itself.
+    """
+    from weasyprint import HTML
+
+    return HTML(string=html_string, base_url=base_url).write_pdf()
+
+
+def _render_pdf_to_file_sync(html_string: str, base_url: str, target: str) -> int:
+    """Render HTML straight into the file at *target*, returning its size.
+
+    Only the path crosses the process boundary, so the parent never holds
+    the PDF bytes in memory.
+    """
+    from weasyprint import HTML
+
+    HTML(string=html_string, base_url=base_url).write_pdf(target=target)
+    return os.path.getsize(target)
+
+
+def _terminate_workers(executor) -> None:
+    """Terminate the worker processes of a ``ProcessPoolExecutor``.
+
+    Uses ``terminate_workers`` (Python 3.14+) when available. Older versions
+    have no public API for this, so the pool's ``_processes`` map is used.
+    """
+    terminate = getattr(executor, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        try:
+            process.terminate()
+        except (OSError, ValueError):
+            pass
+
+
+def _mp_context():
+    """Return a multiprocessing context that does not fork the app process."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _available_cores() -> int:
+    """Return the number of CPUs this process may run on (cgroup-aware)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class PDFRenderEngine:
+    """Bounded, process-pool backed HTML-to-PDF renderer.
+
+    Responsibilities:
+    - Own a single ``ProcessPoolExecutor`` for the whole application
+    - Reject new jobs with 503 + Retry-After once ``workers + queue_size``
+      jobs are in flight
+    - Enforce a per-job timeout (504 on expiry), terminating the pool's
+      workers so stuck renders cannot occupy them
+    - Recreate the pool if a worker process dies
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        timeout: float,
+        retry_after: int,
+    ) -> None:
+        self._workers = workers if workers > 0 else _available_cores()
+        self._max_in_flight = self._workers + max(queue_size, 0)
+        self._timeout = timeout
+        self._retry_after = retry_after
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    @property
+    def workers(self) -> int:
+        return self._workers
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers, mp_context=_mp_context()
+            )
+            logger.info("Started PDF render pool with %d worker(s)", self._workers)
+        return self._executor
+
+    async def render(self, html_string: str, base_url: str) -> bytes:
+        """Render *html_string* to PDF bytes in a worker process.
+
+        Raises:
+            HTTPException(503): If the render queue is full.
+            HTTPException(504): If the job exceeds the configured timeout.
+        """
+        return await self._submit(_render_pdf_sync, html_string, base_url)
+
+    async def render_to_file(self, html_string: str, base_url: str, target: str) -> int:
+        """Render *html_string* into the file at *target*, returning its size.
+
+        Raises the same HTTP errors as :meth:`render`.
+        """
+        return await self._submit(_render_pdf_to_file_sync, html_string, base_url, target)
+
+    async def _submit(self, fn, *args):
+        """Run *fn* on the pool with queue bounds and the per-job timeout."""
+        if self._in_flight >= self._max_in_flight:
+            self.rejected += 1
+            logger.warning(
+                "PDF render queue full (%d in flight), rejecting job",
+                self._in_flight,
+            )
+            raise HTTPException(
+                status_code=503,
+                detail="Document generation is busy. Please try again shortly.",
+                headers={"Retry-After": str(self._retry_after)},
+            )
+
+        self._in_flight += 1
+        executor = self._get_executor()
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(executor, fn, *args)
+            result = await asyncio.wait_for(future, timeout=self._timeout)
+        except asyncio.TimeoutError:
+            # WeasyPrint cannot be interrupted, so the stuck worker is killed
+            # with its pool; jobs still running on that pool fail with 503.
+            self.timeouts += 1
+            logger.error(
+                "PDF render exceeded %.0fs timeout, recycling render pool",
+                self._timeout,
+            )
+            self._reset_executor(executor, terminate=True)
+            raise HTTPException(
+                status_code=504,
+                detail="Document generation timed out. Please try again.",
+            )
+        except BrokenProcessPool:
+            self.failures += 1
+            logger.error("PDF render pool broken, restarting workers")
+            self._reset_executor(executor)
+            raise HTTPException(
+                status_code=503,
+                detail="Document generation is temporarily unavailable.",
+                headers={"Retry-After": str(self._retry_after)},
+            )
+        finally:
+            self._in_flight -= 1
+
+        self.completed += 1
+        return result
+
+    def _reset_executor(self, executor, terminate: bool = False) -> None:
+        """Retire *executor*; the next job starts a fresh pool.
+
+        Only the pool the failed job ran on is retired, so jobs failing on an
+        already replaced pool do not tear down its successor.
+        """
+        if self._executor is executor:
+            self._executor = None
+        if terminate:
+            _terminate_workers(executor)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop worker processes (called from the app lifespan)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "workers": self._workers,
+            "max_in_flight": self._max_in_flight,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+        }
+
+
+# Process-wide engine shared by every PDF-producing service.
+render_engine = PDFRenderEngine(
+    workers=settings.PDF_RENDER_WORKERS,
+    queue_size=settings.PDF_RENDER_QUEUE_SIZE,
+    timeout=settings.PDF_RENDER_TIMEOUT,
+    retry_after=settings.PDF_RENDER_RETRY_AFTER,
+)
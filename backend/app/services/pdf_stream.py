@@ -0,0 +1,175 @@
+"""Streaming HTTP responses for rendered PDFs.
+
+PDFs are served straight from their file on disk in fixed-size chunks
+rather than being read fully into memory first. Responses carry
+``Content-Length`` and a content-addressed ``ETag`` and honour single
+``Range`` requests (resumable downloads, PDF viewers fetching pages) and
+``If-None-Match`` revalidation (304 without touching the file).
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Optional
+
+import anyio
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+
+_CHUNK_SIZE = 64 * 1024
+
+# Wills contain ID numbers, so no browser or proxy cache may store them.
+# ETag revalidation and Range requests work without a stored copy.
+_CACHE_CONTROL = "private, no-store"
+
+
+@dataclass
+class PDFDocument:
+    """A rendered PDF ready to stream.
+
+    ``file`` is ``None`` when the client's ``If-None-Match`` already matched
+    ``etag`` -- nothing was opened and a 304 should be returned.
+    """
+
+    etag: str
+    file: Optional[BinaryIO]
+
+    @property
+    def not_modified(self) -> bool:
+        return self.file is None
+
+
+def make_etag(cache_key: str) -> str:
+    """Quote a content address for use as a strong ETag."""
+    return f'"{cache_key}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True if an ``If-None-Match`` header matches *etag*.
+
+    Uses weak comparison as RFC 9110 requires for ``If-None-Match``.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """Parse a ``Range`` header into an inclusive ``(start, end)`` pair.
+
+    Returns ``None`` when the whole file should be sent: no header, a
+    non-``bytes`` unit, or a multi-range request (served in full rather
+    than as multipart/byteranges).
+
+    Raises:
+        ValueError: If the range is malformed or cannot be satisfied.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        raise ValueError(f"Malformed range: {header!r}")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the final N bytes.
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError(f"Unsatisfiable range: {header!r}")
+            start, end = max(size - suffix, 0), size - 1
+    except ValueError as exc:
+        raise ValueError(f"Malformed range: {header!r}") from exc
+
+    if start < 0 or start >= size or end < start:
+        raise ValueError(f"Unsatisfiable range: {header!r}")
+    return start, min(end, size - 1)
+
+
+async def _iter_file(fh: BinaryIO, start: int, length: int) -> AsyncIterator[bytes]:
+    """Yield *length* bytes from *fh* starting at *start*, off the event loop."""
+    try:
+        await anyio.to_thread.run_sync(fh.seek, start)
+        remaining = length
+        while remaining > 0:
+            chunk = await anyio.to_thread.run_sync(fh.read, min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def _file_size(fh: BinaryIO) -> int:
+    try:
+        return os.fstat(fh.fileno()).st_size
+    except (AttributeError, OSError, ValueError):
+        # In-memory files (e.g. io.BytesIO from a non-disk cache store).
+        current = fh.tell()
+        size = fh.seek(0, os.SEEK_END)
+        fh.seek(current)
+        return size
+
+
+def pdf_stream_response(
+    request: Request, document: PDFDocument, content_disposition: str
+) -> Response:
+    """Build a 200/206/304/416 response streaming *document* to the client.
+
+    The file handle is owned by the response and closed once streaming
+    finishes (or immediately for responses without a body).
+    """
+    headers = {
+        "ETag": document.etag,
+        "Cache-Control": _CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": content_disposition,
+    }
+    if document.not_modified:
+        return Response(status_code=304, headers=headers)
+
+    fh = document.file
+    size = _file_size(fh)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != document.etag:
+        # The client's partial copy is stale -- send the whole document.
+        range_header = None
+
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        fh.close()
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    if byte_range is None:
+        start, end, status = 0, size - 1, 200
+    else:
+        start, end = byte_range
+        status = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    length = end - start + 1 if size else 0
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        _iter_file(fh, start, length),
+        status_code=status,
+        media_type="application/pdf",
+        headers=headers,
+        # Guarantees the handle is released even if the client disconnects
+        # before the body iterator starts.
+        background=BackgroundTask(fh.close),
+    )
@@ -0,0 +1,223 @@
+"""Deadlines, jittered retries and circuit breakers for AI provider calls.
+
+Without a deadline, a Gemini or OpenAI call that hangs holds the
+verification until the SDK's own (long) timeout fires. During an outage,
+every verification paid that latency before falling back. ``ResilientProvider``
+wraps each call in three protections:
+
+- **Deadline** -- each attempt is cancelled after ``timeout`` seconds.
+- **Retries** -- retryable failures (timeouts, connection errors, 408/429/5xx)
+  are retried up to ``max_attempts`` times with full-jitter exponential
+  backoff. Other errors (bad request, auth) are raised at once.
+- **Circuit breaker** -- after ``failure_threshold`` consecutive retryable
+  failures the breaker opens, and calls fail immediately with
+  ``CircuitOpenError``. The hedged verifier then starts the backup provider
+  straight away. After ``reset_timeout`` seconds one probe call is allowed
+  through (half-open); its outcome closes or re-opens the breaker.
+
+A cancelled call (e.g. the losing side of a hedge) counts neither as a
+success nor as a failure. Breaker states and counters are exposed through
+the metrics endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+import openai
+from google.genai import errors as genai_errors
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying (timeout, conflict, rate limit)
+_RETRYABLE_STATUS = frozenset({408, 409, 429})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose breaker is open."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return True for transient provider failures."""
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        status = exc.status_code
+    elif isinstance(exc, genai_errors.APIError):
+        status = exc.code
+    else:
+        return False
+    return status in _RETRYABLE_STATUS or (status is not None and status >= 500)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """Return True if a call may go to the provider now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self._clock() - self.opened_at >= self._reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self._failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = self._clock()
+        self._probe_in_flight = False
+
+    def release(self) -> None:
+        """Forget an in-flight probe whose call ended without a verdict."""
+        self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+        }
+
+
+class ResilientProvider:
+    """Runs calls to one provider with a deadline, retries and a breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 45.0,
+        max_attempts: int = 2,
+        base_delay: float = 0.5,
+        max_delay: float = 4.0,
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.name = name
+        self._timeout = timeout
+        self._max_attempts = max(1, max_attempts)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.calls = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.rejected = 0
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Return ``await fn()``, retrying transient failures.
+
+        Raises ``CircuitOpenError`` without calling *fn* while the breaker
+        is open; otherwise raises the last error once attempts run out.
+        """
+        last_error: Optional[Exception] = None
+        for attempt in range(1, self._max_attempts + 1):
+            if not self.breaker.allow():
+                if last_error is not None:
+                    # Our own failures opened the breaker mid-retry
+                    raise last_error
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.name} circuit open")
+            self.calls += 1
+            try:
+                result = await asyncio.wait_for(fn(), timeout=self._timeout)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as exc:
+                if not is_retryable(exc):
+                    # The request itself was bad: says nothing about the
+                    # provider's health, so only free a half-open probe
+                    self.breaker.release()
+                    raise
+                if isinstance(exc, asyncio.TimeoutError):
+                    self.timeouts += 1
+                self.failures += 1
+                self.breaker.record_failure()
+                last_error = exc
+                if attempt == self._max_attempts:
+                    raise
+                self.retries += 1
+                delay = self._backoff(attempt)
+                logger.warning(
+                    "%s call failed (%s), retrying in %.2fs (attempt %d/%d)",
+                    self.name, type(exc).__name__, delay, attempt + 1, self._max_attempts,
+                )
+                await asyncio.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return result
+        raise AssertionError("unreachable")
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the retry after *attempt*."""
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1)))
+
+    def stats(self) -> dict:
+        """Return breaker state and counters for the metrics endpoint."""
+        return {
+            **self.breaker.stats(),
+            "calls": self.calls,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+def _provider(name: str) -> ResilientProvider:
+    return ResilientProvider(
+        name,
+        timeout=settings.PROVIDER_CALL_TIMEOUT,
+        max_attempts=settings.PROVIDER_MAX_ATTEMPTS,
+        base_delay=settings.PROVIDER_RETRY_BASE_DELAY,
+        max_delay=settings.PROVIDER_RETRY_MAX_DELAY,
+        breaker=CircuitBreaker(
+            failure_threshold=settings.PROVIDER_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.PROVIDER_BREAKER_RESET_TIMEOUT,
+        ),
+    )
+
+
+# Process-wide per-provider resilience state.
+gemini_provider = _provider("gemini")
+openai_provider = _provider("openai")
@@ -0,0 +1,145 @@
+"""SSE event helpers for streamed AI responses.
+
+OpenAI streams roughly one chunk per token, and emitting one SSE event per
+chunk means one JSON serialisation, one frame and (usually) one network
+write per token. ``DeltaCoalescer`` batches consecutive chunks until a
+short time window elapses or a size budget is reached, so a typical reply
+goes out as a few dozen events instead of hundreds with no visible change
+in typing speed. Event payloads that never change are serialised once at
+import time, and delta payloads are assembled from a fixed template
+instead of a full ``json.dumps`` of a dict.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import AsyncIterator
+
+from app.config import settings
+
+# ---------------------------------------------------------------------------
+# Pre-serialised event payloads
+# ---------------------------------------------------------------------------
+
+# Byte-for-byte identical to json.dumps({"content": text}).
+_DELTA_PREFIX = '{"content": '
+_DELTA_SUFFIX = "}"
+
+DONE_EVENT = {"event": "done", "data": json.dumps({"complete": True})}
+STREAM_ERROR_EVENT = {
+    "event": "error",
+    "data": json.dumps({"message": "An error occurred while generating a response."}),
+}
+
+
+def delta_event(text: str) -> dict:
+    """Return a ``delta`` SSE event carrying *text*."""
+    return {"event": "delta", "data": _DELTA_PREFIX + json.dumps(text) + _DELTA_SUFFIX}
+
+
+# ---------------------------------------------------------------------------
+# Delta coalescing
+# ---------------------------------------------------------------------------
+
+_END = object()
+
+
+class DeltaCoalescer:
+    """Batch streamed text chunks by time window and size budget.
+
+    A batch is flushed when ``window`` seconds have passed since its first
+    chunk, when it reaches ``max_chars`` characters, or when the source
+    ends. A window of 0 disables coalescing (chunks pass straight through).
+
+    The source is drained by a single producer task, so stalls upstream
+    never hold back text that is already buffered beyond the window.
+    """
+
+    def __init__(self, window: float, max_chars: int) -> None:
+        self._window = window
+        self._max_chars = max(max_chars, 1)
+        self.chunks_in = 0
+        self.events_out = 0
+
+    async def coalesce(self, source: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Yield coalesced text from *source*; errors in *source* propagate."""
+        if self._window <= 0:
+            async for chunk in source:
+                self.chunks_in += 1
+                self.events_out += 1
+                yield chunk
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def _produce() -> None:
+            try:
+                async for chunk in source:
+                    queue.put_nowait(chunk)
+            except Exception as exc:  # forwarded to the consumer
+                queue.put_nowait(exc)
+            finally:
+                queue.put_nowait(_END)
+
+        producer = asyncio.create_task(_produce())
+        loop = asyncio.get_running_loop()
+        buffer: list[str] = []
+        size = 0
+        deadline = 0.0
+        try:
+            while True:
+                if buffer:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        item = None
+                    else:
+                        try:
+                            item = await asyncio.wait_for(queue.get(), timeout)
+                        except asyncio.TimeoutError:
+                            item = None
+                else:
+                    item = await queue.get()
+
+                if item is None:
+                    # Window elapsed with text still buffered.
+                    self.events_out += 1
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+                    continue
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+
+                self.chunks_in += 1
+                if not buffer:
+                    deadline = loop.time() + self._window
+                buffer.append(item)
+                size += len(item)
+                if size >= self._max_chars:
+                    self.events_out += 1
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+
+            if buffer:
+                self.events_out += 1
+                yield "".join(buffer)
+        finally:
+            producer.cancel()
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "window_ms": round(self._window * 1000, 1),
+            "max_chars": self._max_chars,
+            "chunks_in": self.chunks_in,
+            "events_out": self.events_out,
+        }
+
+
+# Process-wide coalescer shared by all streaming conversations.
+delta_coalescer = DeltaCoalescer(
+    window=settings.SSE_COALESCE_WINDOW_MS / 1000,
+    max_chars=settings.SSE_COALESCE_MAX_CHARS,
+)
@@ -0,0 +1,109 @@
+"""Token counting and token-budgeted message windows.
+
+A fixed "last 20 messages" window is too much when the user pastes long
+text and too little in a short, chatty section. Windows here are built
+newest-first until a token budget is filled instead. Each message's token
+count is computed once when it is stored (``conversation_messages.
+token_count``), so building a window is just a sum.
+
+Counts use ``tiktoken``. The encoding is loaded once per model and cached.
+The first load may download the BPE file, so the app preloads the
+configured model's encoding at startup (``preload_encoding``), and async
+callers count long texts in a worker thread (``message_tokens_async``).
+If the encoding cannot be loaded, counts fall back to the usual estimate
+of four characters per token. The budget is a soft limit either way: the
+newest message is always included, even when it is larger than the whole
+budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+from typing import Callable, Iterable, Optional, Protocol
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Fixed chat-format overhead per message (role marker and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Fallback estimate when the tiktoken encoding cannot be loaded
+_CHARS_PER_TOKEN = 4
+
+# Longer texts are counted off the event loop by message_tokens_async
+_INLINE_COUNT_MAX_CHARS = 4096
+
+_FALLBACK_ENCODING = "o200k_base"
+
+
+class _StoredMessage(Protocol):
+    role: str
+    content: str
+    token_count: Optional[int]
+
+
+@functools.lru_cache(maxsize=8)
+def _encoder(model: str) -> Optional[Callable[[str], list]]:
+    """Return a cached ``encode`` function for *model*, or None."""
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding(_FALLBACK_ENCODING)
+    except Exception as exc:  # e.g. encoding files cannot be downloaded
+        logger.warning("tiktoken unavailable for %s, estimating tokens: %s", model, exc)
+        return None
+    return encoding.encode_ordinary
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Return the number of tokens in *text* for *model*."""
+    encode = _encoder(model)
+    if encode is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(encode(text))
+
+
+def preload_encoding(model: str) -> None:
+    """Load and cache the encoding for *model* (blocking, may download)."""
+    _encoder(model)
+
+
+def message_tokens(content: str, model: str) -> int:
+    """Return the prompt tokens one chat message with *content* costs."""
+    return count_tokens(content, model) + MESSAGE_OVERHEAD_TOKENS
+
+
+async def message_tokens_async(content: str, model: str) -> int:
+    """``message_tokens`` for async code: long texts run in a worker thread."""
+    if len(content) <= _INLINE_COUNT_MAX_CHARS:
+        return message_tokens(content, model)
+    return await asyncio.to_thread(message_tokens, content, model)
+
+
+def fit_to_budget(
+    newest_first: Iterable[_StoredMessage],
+    budget: int,
+    model: str,
+) -> list[dict]:
+    """Build an OpenAI message list from messages given newest first.
+
+    Messages are taken until the next one would exceed *budget* tokens,
+    then returned in chronological order as ``{role, content}`` dicts. The
+    newest message is always kept. Messages stored without a token count
+    (rows from before counts were recorded) are counted on the fly.
+    """
+    window: list[dict] = []
+    used = 0
+    for message in newest_first:
+        tokens = message.token_count
+        if tokens is None:
+            tokens = message_tokens(message.content, model)
+        if window and used + tokens > budget:
+            break
+        used += tokens
+        window.append({"role": message.role, "content": message.content})
+    window.reverse()
+    return window
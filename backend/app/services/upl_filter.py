@@ -12,11 +12,12 @@ import logging
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from app.models.clause import Clause, ClauseCategory, WillType
 from app.services.audit_service import AuditService
 from app.services.clause_library import ClauseLibraryService
+from app.services.pattern_matcher import MultiPatternMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -142,11 +143,20 @@ _ATTORNEY_REQUIRED_PATTERNS: list[tuple[str, re.Pattern]] = [
     ),
 ]
 
+# All patterns are matched by one prefiltered engine; names are split back
+# into attorney-required and advice groups afterwards.
+_UPL_MATCHER = MultiPatternMatcher(_ATTORNEY_REQUIRED_PATTERNS + _ADVICE_PATTERNS)
+_ATTORNEY_PATTERN_NAMES = frozenset(name for name, _ in _ATTORNEY_REQUIRED_PATTERNS)
+
 FALLBACK_MESSAGE: str = (
     "For this specific situation, we recommend consulting with a qualified "
     "South African attorney who can provide personalized legal advice."
 )
 
+# Streamed text held back from the client until it can no longer be the
+# start of a pattern match. Must exceed the longest realistic match.
+_STREAM_HOLDBACK_CHARS = 48
+
 # Map context categories to ClauseCategory for replacement lookup.
 _CATEGORY_MAP: dict[str, ClauseCategory] = {
     cat.value: cat for cat in ClauseCategory
@@ -194,8 +204,9 @@ class UPLFilterService:
                 filtered_text=text,
             )
 
-        # 1. Check attorney-required patterns first (highest priority).
-        attorney_matches = self._match_patterns(text, _ATTORNEY_REQUIRED_PATTERNS)
+        attorney_matches, advice_matches = self._match_patterns(text)
+
+        # 1. Attorney-required patterns take priority.
         if attorney_matches:
             result = FilterResult(
                 action=FilterAction.REFER,
@@ -207,8 +218,7 @@ class UPLFilterService:
             await self._log_filter_event(result, context)
             return result
 
-        # 2. Check advice patterns.
-        advice_matches = self._match_patterns(text, _ADVICE_PATTERNS)
+        # 2. Advice patterns.
         if advice_matches:
             replacement = await self._find_replacement_clause(context)
             if replacement is not None:
@@ -243,12 +253,12 @@ class UPLFilterService:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _match_patterns(
-        text: str,
-        patterns: list[tuple[str, re.Pattern]],
-    ) -> list[str]:
-        """Return names of all patterns that match *text*."""
-        return [name for name, regex in patterns if regex.search(text)]
+    def _match_patterns(text: str) -> tuple[list[str], list[str]]:
+        """Return ``(attorney_required, advice)`` pattern names matching *text*."""
+        matched = _UPL_MATCHER.match(text)
+        attorney = [name for name in matched if name in _ATTORNEY_PATTERN_NAMES]
+        advice = [name for name in matched if name not in _ATTORNEY_PATTERN_NAMES]
+        return attorney, advice
 
     async def _find_replacement_clause(
         self,
@@ -291,3 +301,85 @@ class UPLFilterService:
                 "reason": result.reason,
             },
         )
+
+
+class StreamingUPLScanner:
+    """Incremental UPL pattern scanner for streamed AI output.
+
+    Text is released to the client only once it is at least
+    ``holdback`` characters behind the newest chunk, so any pattern match
+    is detected before its first character leaves the server. After an
+    advice pattern hits, nothing further is released (the response will be
+    replaced) but scanning continues in case an attorney-required pattern
+    follows, since those take precedence. An attorney-required hit aborts
+    the upstream stream immediately.
+
+    The scanner is a pre-filter: ``UPLFilterService.filter_output`` on the
+    final text remains the authoritative decision.
+    """
+
+    def __init__(self, holdback: int = _STREAM_HOLDBACK_CHARS) -> None:
+        self._holdback = holdback
+        self._chunks: list[str] = []
+        self._pending = ""
+        self.advice_matches: list[str] = []
+        self.attorney_matches: list[str] = []
+        self.aborted = False
+
+    @property
+    def text(self) -> str:
+        """Everything received from the source so far."""
+        return "".join(self._chunks)
+
+    @property
+    def flagged(self) -> bool:
+        return bool(self.advice_matches or self.attorney_matches)
+
+    def feed(self, chunk: str) -> str:
+        """Add *chunk* and return the text that is now safe to release."""
+        self._chunks.append(chunk)
+        if self.attorney_matches:
+            return ""
+        pending = self._pending + chunk
+
+        attorney, advice = UPLFilterService._match_patterns(pending)
+        if attorney:
+            self.attorney_matches = attorney
+            self._pending = ""
+            return ""
+
+        if not self.advice_matches:
+            self.advice_matches = advice
+
+        cut = max(len(pending) - self._holdback, 0)
+        self._pending = pending[cut:]
+        return "" if self.advice_matches else pending[:cut]
+
+    def finish(self) -> str:
+        """Return any held-back text once the source has ended cleanly."""
+        if self.flagged:
+            return ""
+        tail, self._pending = self._pending, ""
+        return tail
+
+    async def filter_stream(self, source: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Yield only the safe portions of *source*, aborting it on a referral."""
+        try:
+            async for chunk in source:
+                safe = self.feed(chunk)
+                if safe:
+                    yield safe
+                if self.attorney_matches:
+                    self.aborted = True
+                    logger.info(
+                        "Aborting AI stream after attorney-required pattern(s): %s",
+                        self.attorney_matches,
+                    )
+                    break
+            tail = self.finish()
+            if tail:
+                yield tail
+        finally:
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,212 @@
+"""Hedged dual-provider verification with first-wins semantics.
+
+Verification calls Gemini first and used OpenAI only after Gemini raised.
+A slow Gemini response, rather than a failing one, therefore cost the
+user the full Gemini latency plus the OpenAI latency. ``HedgedVerifier``
+starts the backup provider once the primary has been running for a *hedge
+delay*, or at once if the primary fails. It takes whichever valid result
+arrives first and cancels the other call.
+
+The hedge delay comes from the primary's own latency histogram: it is a
+high quantile of its observed calls (e.g. p90), clamped to a configured
+range. Normal responses therefore never trigger a second
+paid call, and only the slow tail does. Until enough samples exist, a
+configured default delay is used.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Histogram bucket upper bounds (seconds)
+_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 45.0, 60.0,
+)
+
+# Primary latency samples needed before the histogram drives the delay
+_MIN_SAMPLES = 20
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with quantile estimation."""
+
+    def __init__(self, buckets: tuple[float, ...] = _LATENCY_BUCKETS) -> None:
+        self._bounds = buckets
+        self._counts = [0] * (len(buckets) + 1)  # last bucket: > max bound
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the upper bound of the bucket holding quantile *q*.
+
+        Returns None with no samples; values beyond the last bound report
+        the last bound.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self._bounds, self._counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+        return self._bounds[-1]
+
+    def stats(self) -> dict:
+        buckets = {f"le_{bound:g}": n for bound, n in zip(self._bounds, self._counts)}
+        buckets["gt_max"] = self._counts[-1]
+        return {
+            "count": self.count,
+            "avg_seconds": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_seconds": self.quantile(0.5),
+            "p90_seconds": self.quantile(0.9),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class HedgeOutcome:
+    """Which provider answered, and whether the backup was started."""
+
+    provider: str
+    backup_started: bool
+    primary_error: Optional[str] = None
+
+
+class HedgedVerifier:
+    """Runs a primary provider call and hedges it with a backup.
+
+    *quantile* of the primary's latency histogram, clamped to
+    ``[min_delay, max_delay]``, is the hedge delay. *default_delay* is used
+    until ``_MIN_SAMPLES`` latencies have been recorded. With *enabled* False
+    the backup only runs after the primary fails (plain fallback).
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        default_delay: float = 8.0,
+        quantile: float = 0.9,
+        min_delay: float = 2.0,
+        max_delay: float = 20.0,
+    ) -> None:
+        self.enabled = enabled
+        self._default_delay = default_delay
+        self._quantile = quantile
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._wins: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self.hedges_started = 0
+        self.fallbacks = 0
+
+    def hedge_delay(self, primary: str) -> Optional[float]:
+        """Seconds to wait for *primary* before starting the backup."""
+        if not self.enabled:
+            return None
+        histogram = self._latency.get(primary)
+        if histogram is None or histogram.count < _MIN_SAMPLES:
+            return self._default_delay
+        estimate = histogram.quantile(self._quantile)
+        return min(max(estimate, self._min_delay), self._max_delay)
+
+    async def run(
+        self,
+        primary: tuple[str, Callable[[], Awaitable[T]]],
+        backup: Optional[tuple[str, Callable[[], Awaitable[T]]]],
+    ) -> tuple[T, HedgeOutcome]:
+        """Return the first successful result of *primary* or *backup*.
+
+        Each provider is a ``(name, call)`` pair; a call fails by raising.
+        Raises the last provider error if every started call fails.
+        """
+        primary_name = primary[0]
+        tasks: dict[asyncio.Task, str] = {self._start(*primary): primary_name}
+        outcome = HedgeOutcome(provider=primary_name, backup_started=False)
+        last_error: Optional[BaseException] = None
+
+        try:
+            timeout = self.hedge_delay(primary_name) if backup else None
+            while tasks:
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                timeout = None
+
+                if not done:
+                    # Primary is slow: hedge with the backup
+                    self.hedges_started += 1
+                    outcome.backup_started = True
+                    tasks[self._start(*backup)] = backup[0]
+                    continue
+
+                for task in done:
+                    name = tasks.pop(task)
+                    exc = task.exception()
+                    if exc is None:
+                        self._wins[name] = self._wins.get(name, 0) + 1
+                        outcome.provider = name
+                        return task.result(), outcome
+
+                    last_error = exc
+                    self._errors[name] = self._errors.get(name, 0) + 1
+                    logger.warning("Verification via %s failed: %s", name, exc)
+                    if name == primary_name:
+                        outcome.primary_error = str(exc) or type(exc).__name__
+                        if backup and not outcome.backup_started:
+                            self.fallbacks += 1
+                            outcome.backup_started = True
+                            tasks[self._start(*backup)] = backup[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        assert last_error is not None
+        raise last_error
+
+    def _start(self, name: str, call: Callable[[], Awaitable[T]]) -> asyncio.Task:
+        return asyncio.create_task(self._timed(name, call))
+
+    async def _timed(self, name: str, call: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # A cancelled loser took at least this long; recording the lower
+            # bound keeps slow calls from vanishing from the histogram.
+            self._histogram(name).record(time.perf_counter() - start)
+            raise
+        self._histogram(name).record(time.perf_counter() - start)
+        return result
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        histogram = self._latency.get(name)
+        if histogram is None:
+            histogram = self._latency[name] = LatencyHistogram()
+        return histogram
+
+    def stats(self) -> dict:
+        """Return counters and latency histograms for the metrics endpoint."""
+        return {
+            "hedging_enabled": self.enabled,
+            "hedges_started": self.hedges_started,
+            "fallbacks": self.fallbacks,
+            "wins": dict(self._wins),
+            "errors": dict(self._errors),
+            "latency": {name: h.stats() for name, h in self._latency.items()},
+        }
@@ -0,0 +1,363 @@
+"""Deterministic verification rules evaluated locally before the LLM.
+
+Several ``VERIFICATION_RULES`` are arithmetic or format checks that Gemini
+was asked to reason about: SA ID number format, testator age, missing
+executor or beneficiaries, and share percentages. ``VerificationRuleEngine``
+evaluates them in Python in microseconds and with certainty, including the
+SA ID Luhn check digit, which the prompt never asked the model to compute.
+
+The engine is authoritative for the ``(code, section)`` pairs in
+``LOCAL_RULE_SCOPES``. When it finds a blocking error, the verification
+service builds the result locally and skips the LLM call, since the will
+cannot pass until the error is fixed. Otherwise, the LLM result is merged
+with the local findings: any issues the model raised for those pairs are
+replaced by the local ones. ID numbers and share percentages elsewhere in
+the will (spouse, guardians, trustees, business interests) are still left
+to the model, so only ``LOCAL_RULE_CODES`` are dropped from the prompt.
+
+Will data reaches verification with both camelCase keys (frontend forms)
+and snake_case keys (AI extraction), so every field lookup accepts either.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Iterable, Optional
+
+from app.schemas.verification import (
+    AttorneyReferral,
+    SectionResult,
+    VerificationIssue,
+    VerificationResult,
+)
+
+# Rule code -> will sections this module decides it for
+LOCAL_RULE_SCOPES: dict[str, frozenset[str]] = {
+    "INVALID_ID_NUMBER": frozenset({"testator"}),
+    "TESTATOR_UNDER_16": frozenset({"testator"}),
+    "NO_BENEFICIARIES": frozenset({"beneficiaries"}),
+    "NO_EXECUTOR": frozenset({"executor"}),
+    "PERCENTAGES_EXCEED_100": frozenset({"beneficiaries", "usufruct"}),
+    "RESIDUE_PERCENTAGES_INVALID": frozenset({"residue"}),
+}
+
+# Rule codes decided here for every section they apply to, so the LLM need
+# not be asked about them at all
+LOCAL_RULE_CODES: frozenset[str] = frozenset({
+    "TESTATOR_UNDER_16",
+    "NO_BENEFICIARIES",
+    "NO_EXECUTOR",
+    "RESIDUE_PERCENTAGES_INVALID",
+})
+
+# Minimum testator age (Wills Act s4)
+MIN_TESTATOR_AGE = 16
+
+# Tolerance for float share percentages (e.g. three shares of 33.33)
+_PERCENT_TOLERANCE = 0.05
+
+_SEVERITY_RANK = {"info": 0, "warning": 1, "error": 2}
+
+
+def _field(data: Any, *keys: str) -> Any:
+    """Return the first present, non-empty value of *keys* in *data*."""
+    if not isinstance(data, dict):
+        return None
+    for key in keys:
+        value = data.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _as_percent(value: Any) -> Optional[float]:
+    """Parse a share percentage (``50``, ``"50"``, ``"50%"``), else None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().rstrip("%").strip())
+        except ValueError:
+            return None
+    return None
+
+
+def _age_on(born: date, today: date) -> int:
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def luhn_valid(digits: str) -> bool:
+    """Return True when *digits* passes the Luhn checksum."""
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        n = int(ch)
+        if i % 2:
+            n *= 2
+            if n > 9:
+                n -= 9
+        total += n
+    return total % 10 == 0
+
+
+def sa_id_birth_date(id_number: str, today: Optional[date] = None) -> Optional[date]:
+    """Return the date of birth encoded in an SA ID number, or None.
+
+    The YYMMDD prefix has no century; the most recent century that does not
+    put the birth date in the future is used.
+    """
+    if len(id_number) < 6 or not id_number[:6].isdigit():
+        return None
+    today = today or date.today()
+    yy, mm, dd = int(id_number[:2]), int(id_number[2:4]), int(id_number[4:6])
+    for century in (2000, 1900):
+        try:
+            born = date(century + yy, mm, dd)
+        except ValueError:
+            return None
+        if born <= today:
+            return born
+    return None
+
+
+def sa_id_valid(id_number: str, today: Optional[date] = None) -> bool:
+    """Return True for a well-formed SA ID number.
+
+    Checks 13 digits, a valid YYMMDD birth date, citizenship digit 0 (SA
+    citizen) or 1 (permanent resident), and the Luhn check digit.
+    """
+    return (
+        len(id_number) == 13
+        and id_number.isdigit()
+        and sa_id_birth_date(id_number, today) is not None
+        and id_number[10] in "01"
+        and luhn_valid(id_number)
+    )
+
+
+def _issue(code: str, section: str, title: str, explanation: str, suggestion: str) -> VerificationIssue:
+    return VerificationIssue(
+        code=code,
+        severity="error",
+        section=section,
+        title=title,
+        explanation=explanation,
+        suggestion=suggestion,
+    )
+
+
+def _check_testator(testator: Any, today: date) -> list[VerificationIssue]:
+    issues: list[VerificationIssue] = []
+    id_number = _field(testator, "idNumber", "id_number")
+    id_ok = False
+    if id_number is not None:
+        id_number = str(id_number).replace(" ", "")
+        id_ok = sa_id_valid(id_number, today)
+        if not id_ok:
+            issues.append(_issue(
+                "INVALID_ID_NUMBER", "testator",
+                "SA ID Number Invalid",
+                "The testator's SA ID number is not valid: it must be 13 digits, "
+                "start with a valid date of birth (YYMMDD), and end with a correct "
+                "check digit.",
+                "Check the ID number against the testator's ID document and correct it.",
+            ))
+
+    born: Optional[date] = None
+    dob = _field(testator, "dateOfBirth", "date_of_birth")
+    if isinstance(dob, str):
+        try:
+            born = date.fromisoformat(dob[:10])
+        except ValueError:
+            born = None
+    if born is None and id_ok:
+        born = sa_id_birth_date(id_number, today)
+    if born is not None and _age_on(born, today) < MIN_TESTATOR_AGE:
+        issues.append(_issue(
+            "TESTATOR_UNDER_16", "testator",
+            "Testator Under 16",
+            "Under the Wills Act (s4) a person must be 16 or older to make a valid will.",
+            "Check the date of birth. A will can only be made once the testator turns 16.",
+        ))
+    return issues
+
+
+def _beneficiary_names(beneficiaries: Any) -> list[str]:
+    if not isinstance(beneficiaries, list):
+        return []
+    return [
+        name for b in beneficiaries
+        if (name := _field(b, "fullName", "full_name", "name"))
+    ]
+
+
+def _shares(entries: Iterable[Any]) -> list[Optional[float]]:
+    return [
+        _as_percent(_field(e, "sharePercent", "share_percent", "percentage"))
+        for e in entries
+        if isinstance(e, dict)
+    ]
+
+
+def evaluate_rules(will_data: dict, today: Optional[date] = None) -> list[VerificationIssue]:
+    """Return the issues for ``LOCAL_RULE_SCOPES`` found in *will_data*.
+
+    A rule only reports when the data makes the outcome certain: absent or
+    unparsable values are left alone (other rules, or the LLM, cover
+    incomplete data).
+    """
+    today = today or date.today()
+    issues = _check_testator(will_data.get("testator"), today)
+
+    beneficiaries = will_data.get("beneficiaries") or []
+    residue = will_data.get("residue") or {}
+    residue_beneficiaries = residue.get("beneficiaries") if isinstance(residue, dict) else None
+    residue_beneficiaries = residue_beneficiaries if isinstance(residue_beneficiaries, list) else []
+
+    if not _beneficiary_names(beneficiaries) and not _beneficiary_names(residue_beneficiaries):
+        issues.append(_issue(
+            "NO_BENEFICIARIES", "beneficiaries",
+            "No Beneficiaries",
+            "The will does not name anyone to inherit from the estate.",
+            "Add at least one beneficiary.",
+        ))
+
+    if not _field(will_data.get("executor"), "name", "fullName", "full_name"):
+        issues.append(_issue(
+            "NO_EXECUTOR", "executor",
+            "No Executor Nominated",
+            "The will must nominate an executor to administer the estate.",
+            "Nominate an executor, such as a trusted person or a professional executor.",
+        ))
+
+    shares = [s for s in _shares(beneficiaries if isinstance(beneficiaries, list) else []) if s is not None]
+    if sum(shares) > 100 + _PERCENT_TOLERANCE:
+        issues.append(_issue(
+            "PERCENTAGES_EXCEED_100", "beneficiaries",
+            "Shares Exceed 100%",
+            f"Beneficiary shares add up to {sum(shares):g}%, which is more than the whole estate.",
+            "Adjust the beneficiary percentages so they total 100% or less.",
+        ))
+
+    usufruct = will_data.get("usufruct")
+    holders = _field(usufruct, "bareDominiumHolders", "bare_dominium_holders")
+    if isinstance(holders, list):
+        holder_shares = [s for s in _shares(holders) if s is not None]
+        if sum(holder_shares) > 100 + _PERCENT_TOLERANCE:
+            issues.append(_issue(
+                "PERCENTAGES_EXCEED_100", "usufruct",
+                "Bare Dominium Shares Exceed 100%",
+                f"Bare dominium shares add up to {sum(holder_shares):g}%.",
+                "Adjust the bare dominium percentages so they total 100% or less.",
+            ))
+
+    # Residue shares are only checked when every residue beneficiary has one;
+    # a single heir or "equal shares" without percentages is valid.
+    residue_shares = _shares(residue_beneficiaries)
+    if residue_shares and all(s is not None for s in residue_shares):
+        total = sum(residue_shares)
+        if abs(total - 100) > _PERCENT_TOLERANCE * len(residue_shares):
+            issues.append(_issue(
+                "RESIDUE_PERCENTAGES_INVALID", "residue",
+                "Residue Shares Do Not Total 100%",
+                f"The residue shares add up to {total:g}%, but must total exactly 100%.",
+                "Adjust the residue percentages so they add up to 100%.",
+            ))
+
+    return issues
+
+
+def _worst(severities: Iterable[str]) -> str:
+    worst = max(severities, key=_SEVERITY_RANK.__getitem__, default=None)
+    if worst is None:
+        return "pass"
+    return "error" if worst == "error" else "warning"
+
+
+def merge_findings(
+    result: VerificationResult, issues: list[VerificationIssue]
+) -> VerificationResult:
+    """Return *result* with local *issues* replacing LLM issues the engine decides.
+
+    An LLM issue is dropped only when its code and section are in
+    ``LOCAL_RULE_SCOPES``; e.g. an invalid guardian ID number is kept.
+
+    Section and overall statuses are recomputed from the merged issues.
+    """
+    by_section: dict[str, list[VerificationIssue]] = {}
+    order: list[str] = []
+    for section in result.sections:
+        if section.section not in by_section:
+            order.append(section.section)
+            by_section[section.section] = []
+        by_section[section.section].extend(
+            issue for issue in section.issues
+            if issue.section not in LOCAL_RULE_SCOPES.get(issue.code, ())
+        )
+    for issue in issues:
+        if issue.section not in by_section:
+            order.append(issue.section)
+            by_section[issue.section] = []
+        by_section[issue.section].append(issue)
+
+    sections = [
+        SectionResult(
+            section=name,
+            status=_worst(i.severity for i in by_section[name]),
+            issues=by_section[name],
+        )
+        for name in order
+    ]
+    return result.model_copy(update={
+        "sections": sections,
+        "overall_status": _worst(i.severity for s in sections for i in s.issues),
+    })
+
+
+def local_result(issues: list[VerificationIssue]) -> VerificationResult:
+    """Build a complete result from local findings alone (LLM skipped)."""
+    count = len(issues)
+    summary = (
+        f"We found {count} {'issue' if count == 1 else 'issues'} that must be fixed "
+        "before your will can be generated. Please correct the details below and "
+        "verify again."
+    )
+    empty = VerificationResult(
+        overall_status="pass",
+        sections=[],
+        attorney_referral=AttorneyReferral(recommended=False, reasons=[]),
+        summary=summary,
+    )
+    return merge_findings(empty, issues)
+
+
+class VerificationRuleEngine:
+    """Evaluates the local rules and counts LLM calls they made unnecessary."""
+
+    def __init__(self) -> None:
+        self.evaluations = 0
+        self.llm_skipped = 0
+        self.issues_found = 0
+
+    def evaluate(self, will_data: dict, today: Optional[date] = None) -> list[VerificationIssue]:
+        """Return local issues for *will_data*, updating the counters."""
+        issues = evaluate_rules(will_data, today)
+        self.evaluations += 1
+        self.issues_found += len(issues)
+        return issues
+
+    def record_skip(self) -> None:
+        self.llm_skipped += 1
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "evaluations": self.evaluations,
+            "issues_found": self.issues_found,
+            "llm_skipped": self.llm_skipped,
+        }
+
+
+# Process-wide rule engine (counters only; rules are stateless).
+verification_rules = VerificationRuleEngine()
@@ -1,12 +1,14 @@
-"""Verification service orchestrating Gemini verification with OpenAI fallback.
+"""Verification service orchestrating Gemini verification with OpenAI backup.
 
 Manages the full verification flow: collecting will data, calling Gemini
-(or falling back to OpenAI), streaming SSE progress events, persisting
-results, and gating will status transitions.
+(hedged with OpenAI when slow or failing), streaming SSE progress events,
+persisting results, and gating will status transitions.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import uuid
@@ -14,7 +16,6 @@ from datetime import datetime, timezone
 from typing import AsyncGenerator
 
 from fastapi import Depends
-from openai import AsyncOpenAI
 from sqlalchemy import and_
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -22,27 +23,69 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.config import settings
 from app.database import get_session
 from app.models.will import Will
-from app.prompts.verification import build_verification_prompt
+from app.prompts.verification import (
+    build_verification_prompt,
+    compile_verification_prompt,
+)
 from app.schemas.verification import VerificationResult
+from app.services.ai_clients import ai_clients
 from app.services.gemini_service import GeminiService
 from app.services.conversation_service import ConversationService
-from app.services.openai_service import OpenAIService
+from app.services.openai_service import OpenAIService, prompt_cache_stats
+from app.services.provider_resilience import gemini_provider, openai_provider
 from app.services.upl_filter import UPLFilterService
+from app.services.verification_hedge import HedgedVerifier
+from app.services.token_budget import count_tokens
+from app.services.verification_rules import (
+    LOCAL_RULE_CODES,
+    local_result,
+    merge_findings,
+    verification_rules,
+)
 from app.services.clause_library import ClauseLibraryService
 from app.services.audit_service import AuditService
 
 logger = logging.getLogger(__name__)
 
+# Bump when the verification prompt or result schema changes so stored
+# results for unchanged wills are no longer replayed.
+_VERIFICATION_CACHE_VERSION = "3"
+
+
+def canonical_will_json(will_data: dict) -> str:
+    """Serialise collected will data as stable JSON (sorted keys, no spaces)."""
+    return json.dumps(
+        will_data,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def will_data_hash(will_data: dict) -> str:
+    """Return the SHA-256 of the canonical will data (plus cache version)."""
+    digest = hashlib.sha256(_VERIFICATION_CACHE_VERSION.encode("utf-8"))
+    digest.update(b"\x1f")
+    digest.update(canonical_will_json(will_data).encode("utf-8"))
+    return digest.hexdigest()
+
 
 class VerificationService:
     """Orchestrates AI verification of will data with dual-LLM fallback.
 
     Responsibilities:
     - Collect all will JSONB section data into a single verification payload
+    - Evaluate deterministic rules locally, skipping the LLM call when a
+      blocking error is already certain
     - Call Gemini for structured verification (primary)
-    - Fall back to OpenAI if Gemini is unavailable or errors
+    - Hedge with OpenAI if Gemini is slow, unavailable or errors; the
+      first valid result wins
+    - Bound each provider call with a deadline, jittered retries and a
+      circuit breaker, so an outage fails over without waiting
     - Stream SSE progress events throughout the verification flow
-    - Persist verification results to the Will model
+    - Persist verification results (and the will data hash) to the Will model
+    - Replay the stored result when the will data is unchanged
     - Gate will status transitions (draft -> verified)
     """
 
@@ -51,11 +94,10 @@ class VerificationService:
         self._gemini = GeminiService(
             api_key=settings.GEMINI_API_KEY,
             model=settings.GEMINI_MODEL,
+            client=ai_clients.gemini(),
         )
         self._openai_client = (
-            AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-            if settings.OPENAI_API_KEY
-            else None
+            ai_clients.openai() if settings.OPENAI_API_KEY else None
         )
 
     async def _get_will_for_user(
@@ -70,12 +112,21 @@ class VerificationService:
         result = await self._session.exec(stmt)
         return result.first()
 
-    async def _extract_missing_sections(self, will: Will) -> None:
+    async def _extract_missing_sections(
+        self, will: Will
+    ) -> AsyncGenerator[dict, None]:
         """Extract data for AI sections that have conversations but empty JSONB columns.
 
         Runs before verification to ensure any data discussed in AI conversations
         is persisted to the will model, even if auto-extraction or Next Section
         extraction was missed.
+
+        With ``VERIFICATION_BATCH_EXTRACTION`` all sections are extracted by
+        one OpenAI call. Otherwise (or if the batched call fails) they run
+        as concurrent per-section calls, bounded by
+        ``VERIFICATION_EXTRACTION_CONCURRENCY``. A ``collecting_data``
+        progress event is yielded per section, and all results are written
+        in a single will update at the end.
         """
         # Map AI sections to their will JSONB column names
         section_column_map = {
@@ -87,11 +138,21 @@ class VerificationService:
             "residue": "residue",
         }
 
+        # Skip sections whose data already exists
+        missing = [
+            section
+            for section, column in section_column_map.items()
+            if not getattr(will, column, None)
+        ]
+        if not missing:
+            return
+
         conv_service = ConversationService(
             session=self._session,
             openai_service=OpenAIService(
                 api_key=settings.OPENAI_API_KEY,
                 model=settings.OPENAI_MODEL,
+                client=ai_clients.openai(),
             ),
             upl_filter=UPLFilterService(
                 clause_service=ClauseLibraryService(session=self._session),
@@ -99,26 +160,45 @@ class VerificationService:
             ),
         )
 
-        for section, column in section_column_map.items():
-            current_data = getattr(will, column, None)
-            # Skip if data already exists
-            if current_data and current_data != {} and current_data != []:
-                continue
-
+        extracted_by_section: dict | None = None
+        if settings.VERIFICATION_BATCH_EXTRACTION:
             try:
-                extracted = await conv_service.extract_data_from_conversation(
-                    will.id, section
+                extracted_by_section = await conv_service.extract_sections_batched(
+                    will.id, missing
                 )
-                if extracted is not None:
-                    await conv_service.save_extracted_to_will(
-                        will.id, section, extracted
-                    )
             except Exception as exc:
                 logger.warning(
-                    "Pre-verification extraction failed for section %s: %s",
-                    section, exc,
+                    "Batched pre-verification extraction failed, "
+                    "extracting per section: %s", exc,
                 )
 
+        if extracted_by_section is not None:
+            for completed, section in enumerate(missing, start=1):
+                status = "extracted" if section in extracted_by_section else "no_conversation"
+                yield _progress_event(section, status, completed, len(missing))
+        else:
+            extracted_by_section = {}
+            completed = 0
+            async for section, extracted, error in conv_service.extract_sections(
+                will.id, missing, settings.VERIFICATION_EXTRACTION_CONCURRENCY
+            ):
+                completed += 1
+                if error is not None:
+                    logger.warning(
+                        "Pre-verification extraction failed for section %s: %s",
+                        section, error,
+                    )
+                    status = "failed"
+                elif extracted is None:
+                    status = "no_conversation"
+                else:
+                    extracted_by_section[section] = extracted
+                    status = "extracted"
+                yield _progress_event(section, status, completed, len(missing))
+
+        if extracted_by_section:
+            await conv_service.save_extracted_sections(will, extracted_by_section)
+
         # Refresh will to pick up any changes from extraction
         await self._session.refresh(will)
 
@@ -142,6 +222,21 @@ class VerificationService:
             "sections_complete": will.sections_complete,
         }
 
+    async def _verify_with_gemini(self, prompt: str) -> VerificationResult:
+        """Primary verification via Gemini structured output.
+
+        The compiled prompt already embeds the will data, so it is not sent
+        a second time.
+        """
+        result = await gemini_provider.call(
+            lambda: self._gemini.verify(
+                will_data=None,
+                prompt=prompt,
+                response_schema=VerificationResult,
+            )
+        )
+        return _require_result(result)
+
     async def _verify_with_openai(self, prompt: str) -> VerificationResult:
         """Fallback verification via OpenAI structured output.
 
@@ -151,15 +246,20 @@ class VerificationService:
         if not self._openai_client:
             raise RuntimeError("OpenAI fallback unavailable: no API key configured")
 
-        completion = await self._openai_client.beta.chat.completions.parse(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": prompt},
-            ],
-            response_format=VerificationResult,
-            temperature=0.1,
+        # Retries are handled by openai_provider, not the SDK
+        client = self._openai_client.with_options(max_retries=0)
+        completion = await openai_provider.call(
+            lambda: client.beta.chat.completions.parse(
+                model=settings.OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": prompt},
+                ],
+                response_format=VerificationResult,
+                temperature=0.1,
+            )
         )
-        return completion.choices[0].message.parsed
+        prompt_cache_stats.record(completion.usage)
+        return _require_result(completion.choices[0].message.parsed)
 
     def _has_blocking_errors(self, result: VerificationResult) -> bool:
         """Check if verification result contains any error-severity issues."""
@@ -173,11 +273,25 @@ class VerificationService:
         self,
         will_id: uuid.UUID,
         user_id: uuid.UUID,
+        force: bool = False,
     ) -> AsyncGenerator[dict, None]:
         """Run full verification flow, yielding SSE progress events.
 
+        If the will data hashes to the same value as when the stored result
+        was produced, that result is replayed without extraction or an LLM
+        call (``check`` step ``cached``). ``force`` always re-verifies.
+
+        Deterministic rules (``verification_rules``) run before the LLM. If
+        they find a blocking error, the result is built locally without an
+        LLM call (``check`` step ``local_rules``); otherwise their findings
+        are merged into the LLM result.
+
         Event types:
-        - check: progress updates (collecting_data, verifying, fallback, analyzing_results)
+        - check: progress updates (collecting_data, local_rules, verifying,
+          fallback, analyzing_results, cached); ``collecting_data`` repeats with
+          ``section``/``completed``/``total`` as each section's extraction
+          finishes; ``fallback`` is sent when the OpenAI backup produced
+          the result
         - section_result: per-section verification status
         - done: final event with complete VerificationResult
         - error: if both Gemini and OpenAI fail
@@ -198,55 +312,108 @@ class VerificationService:
             "event": "check",
             "data": json.dumps({"step": "collecting_data", "message": "Collecting will data..."}),
         }
-        await self._extract_missing_sections(will)
+
+        async for event in self._extract_missing_sections(will):
+            yield event
         will_data = self._collect_will_data(will)
 
-        # Step 2: Build verification prompt
-        prompt = build_verification_prompt(will_data)
+        # Unchanged since the stored result was produced: replay it. Checked
+        # after extraction so new conversation data for an empty section
+        # counts as a change.
+        if (
+            not force
+            and will.verification_result
+            and will.verification_hash == will_data_hash(will_data)
+        ):
+            logger.info("Replaying cached verification result for will %s", will_id)
+            yield {
+                "event": "check",
+                "data": json.dumps({"step": "cached", "message": "Will unchanged since last verification."}),
+            }
+            result = VerificationResult.model_validate(will.verification_result)
+            async for event in self._publish_result(will, result, verified_at=will.verified_at):
+                yield event
+            return
+
+        # Deterministic checks: a certain blocking error needs no LLM call
+        local_issues = verification_rules.evaluate(will_data)
+        if any(issue.severity == "error" for issue in local_issues):
+            verification_rules.record_skip()
+            logger.info(
+                "Local rules found blocking errors for will %s, skipping LLM verification",
+                will_id,
+            )
+            yield {
+                "event": "check",
+                "data": json.dumps({"step": "local_rules", "message": "Checking will details..."}),
+            }
+            will.verification_hash = will_data_hash(will_data)
+            async for event in self._publish_result(
+                will, local_result(local_issues), verified_at=datetime.now(timezone.utc)
+            ):
+                yield event
+            return
+
+        # Step 2: Compile the verification prompt (applicable rules only;
+        # locally decided rules are left out)
+        prompt = compile_verification_prompt(will_data, exclude_codes=LOCAL_RULE_CODES)
+        await verification_prompt_stats.record(will_data, prompt)
 
-        # Step 3: Verify with AI (Gemini first, OpenAI fallback)
+        # Step 3: Verify with AI (Gemini first, hedged with OpenAI)
         yield {
             "event": "check",
             "data": json.dumps({"step": "verifying", "message": "Verifying with AI..."}),
         }
 
-        result: VerificationResult | None = None
-
-        # Try Gemini first
         try:
-            result = await self._gemini.verify(
-                will_data=will_data,
-                prompt=prompt,
-                response_schema=VerificationResult,
+            result, outcome = await verification_hedge.run(
+                primary=("gemini", lambda: self._verify_with_gemini(prompt)),
+                backup=(
+                    ("openai", lambda: self._verify_with_openai(prompt))
+                    if self._openai_client
+                    else None
+                ),
             )
-            logger.info("Verification completed via Gemini for will %s", will_id)
         except Exception as exc:
-            logger.warning("Gemini verification failed, falling back to OpenAI: %s", exc)
+            logger.error("Both Gemini and OpenAI verification failed: %s", exc)
+            yield {
+                "event": "error",
+                "data": json.dumps({
+                    "message": "Verification temporarily unavailable. Please try again later.",
+                }),
+            }
+            return
+
+        logger.info(
+            "Verification completed via %s for will %s (backup started: %s)",
+            outcome.provider, will_id, outcome.backup_started,
+        )
+        if outcome.provider != "gemini":
             yield {
                 "event": "check",
                 "data": json.dumps({"step": "fallback", "message": "Switching to backup verification..."}),
             }
 
-            # Try OpenAI fallback
-            try:
-                result = await self._verify_with_openai(prompt)
-                logger.info("Verification completed via OpenAI fallback for will %s", will_id)
-            except Exception as fallback_exc:
-                logger.error("Both Gemini and OpenAI verification failed: %s", fallback_exc)
-                yield {
-                    "event": "error",
-                    "data": json.dumps({
-                        "message": "Verification temporarily unavailable. Please try again later.",
-                    }),
-                }
-                return
-
         # Step 4: Analyze results
         yield {
             "event": "check",
             "data": json.dumps({"step": "analyzing_results", "message": "Analyzing results..."}),
         }
 
+        result = merge_findings(result, local_issues)
+        will.verification_hash = will_data_hash(will_data)
+        async for event in self._publish_result(
+            will, result, verified_at=datetime.now(timezone.utc)
+        ):
+            yield event
+
+    async def _publish_result(
+        self,
+        will: Will,
+        result: VerificationResult,
+        verified_at: datetime | None,
+    ) -> AsyncGenerator[dict, None]:
+        """Yield per-section and done events and persist *result* on the will."""
         # Yield per-section results
         for section in result.sections:
             yield {
@@ -261,7 +428,7 @@ class VerificationService:
         # Step 5: Persist results to Will model
         result_dict = result.model_dump()
         will.verification_result = result_dict
-        will.verified_at = datetime.now(timezone.utc)
+        will.verified_at = verified_at
         will.updated_at = datetime.now(timezone.utc)
 
         # Transition status if no blocking errors
@@ -325,6 +492,94 @@ class VerificationService:
         }
 
 
+def _progress_event(section: str, status: str, completed: int, total: int) -> dict:
+    """Build a per-section ``collecting_data`` progress event."""
+    return {
+        "event": "check",
+        "data": json.dumps({
+            "step": "collecting_data",
+            "message": f"Collected {section} ({completed}/{total})",
+            "section": section,
+            "status": status,
+            "completed": completed,
+            "total": total,
+        }),
+    }
+
+
+def _require_result(result) -> VerificationResult:
+    """Return *result* as a VerificationResult, raising if it is missing."""
+    if result is None:
+        raise ValueError("Provider returned no parsable verification result")
+    if isinstance(result, VerificationResult):
+        return result
+    return VerificationResult.model_validate(result)
+
+
+class VerificationPromptStats:
+    """Token counts of full versus compiled verification prompts.
+
+    Tokens are counted with the OpenAI model's encoding, which approximates
+    Gemini's tokenizer closely enough to track the reduction. Building the
+    full prompt and counting both runs in a worker thread, off the event
+    loop.
+    """
+
+    def __init__(self) -> None:
+        self.prompts = 0
+        self.full_tokens = 0
+        self.compiled_tokens = 0
+        self.last_full_tokens = 0
+        self.last_compiled_tokens = 0
+
+    async def record(self, will_data: dict, compiled_prompt: str) -> None:
+        self.last_full_tokens, self.last_compiled_tokens = await asyncio.to_thread(
+            self._count, will_data, compiled_prompt
+        )
+        self.prompts += 1
+        self.full_tokens += self.last_full_tokens
+        self.compiled_tokens += self.last_compiled_tokens
+        logger.info(
+            "Verification prompt: %d tokens (full prompt: %d)",
+            self.last_compiled_tokens, self.last_full_tokens,
+        )
+
+    @staticmethod
+    def _count(will_data: dict, compiled_prompt: str) -> tuple[int, int]:
+        """Return token counts of the full and the compiled prompt."""
+        full_prompt = build_verification_prompt(will_data)
+        return (
+            count_tokens(full_prompt, settings.OPENAI_MODEL),
+            count_tokens(compiled_prompt, settings.OPENAI_MODEL),
+        )
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        saved = self.full_tokens - self.compiled_tokens
+        return {
+            "prompts": self.prompts,
+            "full_tokens": self.full_tokens,
+            "compiled_tokens": self.compiled_tokens,
+            "last_full_tokens": self.last_full_tokens,
+            "last_compiled_tokens": self.last_compiled_tokens,
+            "reduction_ratio": round(saved / self.full_tokens, 4) if self.full_tokens else 0.0,
+        }
+
+
+# Process-wide verification prompt size counters.
+verification_prompt_stats = VerificationPromptStats()
+
+
+# Process-wide hedging state (per-provider latency histograms).
+verification_hedge = HedgedVerifier(
+    enabled=settings.VERIFICATION_HEDGE_ENABLED,
+    default_delay=settings.VERIFICATION_HEDGE_DEFAULT_DELAY,
+    quantile=settings.VERIFICATION_HEDGE_QUANTILE,
+    min_delay=settings.VERIFICATION_HEDGE_MIN_DELAY,
+    max_delay=settings.VERIFICATION_HEDGE_MAX_DELAY,
+)
+
+
 async def get_verification_service(
     session: AsyncSession = Depends(get_session),
 ) -> VerificationService:
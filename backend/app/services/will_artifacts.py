@@ -0,0 +1,287 @@
+"""Immutable final-PDF artifacts for paid wills.
+
+Rendering the final PDF is the slowest operation in the app, so it is
+taken off the download path: when PayFast confirms a payment (ITN
+``COMPLETE``) a background job renders the unwatermarked PDF once and
+stores it as a write-once artifact keyed by ``(will_id, version)``. The
+download endpoint then streams that file directly.
+
+A post-purchase regeneration bumps ``Will.version``, so edited wills get a
+fresh artifact and earlier versions are never overwritten. If a download
+arrives before the job finishes (or the job failed, or the artifact was
+evicted) the artifact is rendered on demand, sharing any render already
+in flight for that key.
+
+Artifacts live in the private directory ``WILL_ARTIFACT_DIR``, bounded by
+``WILL_ARTIFACT_MAX_BYTES``, and are deleted with their will.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+import anyio
+from fastapi import HTTPException
+
+from app.config import settings
+from app.database import async_session
+from app.models.will import Will
+from app.services.document_service import DocumentGenerationService
+from app.services.pdf_cache import DiskLRUStore, ensure_private_dir
+from app.services.pdf_stream import PDFDocument, etag_matches, make_etag
+from app.services.will_service import WillService
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+class WillArtifactStore:
+    """Write-once store holding one PDF file per will version on disk.
+
+    Files live in the private directory ``WILL_ARTIFACT_DIR`` under one
+    subdirectory per will, in a size-bounded LRU: an evicted artifact is
+    simply rendered again on its next download.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self._files = DiskLRUStore(directory, max_bytes)
+
+    @staticmethod
+    def _key(will_id: uuid.UUID, version: int) -> str:
+        return f"{will_id}.v{version}"
+
+    def path(self, will_id: uuid.UUID, version: int) -> Path:
+        return self._files.directory / str(will_id) / f"{self._key(will_id, version)}.pdf"
+
+    def exists(self, will_id: uuid.UUID, version: int) -> bool:
+        return self._key(will_id, version) in self._files
+
+    def open(self, will_id: uuid.UUID, version: int) -> Optional[BinaryIO]:
+        """Return the artifact opened for reading, or ``None`` if absent."""
+        return self._files.open(self._key(will_id, version))
+
+    def write(self, will_id: uuid.UUID, version: int, src: BinaryIO) -> Path:
+        """Copy *src* into the store unless the artifact already exists.
+
+        The file is written to a temp name and moved into place, so
+        readers only ever see a complete PDF.
+        """
+        key = self._key(will_id, version)
+        target = self.path(will_id, version)
+        if key in self._files:
+            return target
+        ensure_private_dir(target.parent)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(src, out)
+                out.flush()
+                os.fsync(out.fileno())
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+        self._files.put_file(key, Path(tmp_name), str(will_id))
+        return target
+
+    def purge(self, will_id: uuid.UUID) -> int:
+        """Delete every stored version for *will_id*, returning how many."""
+        return self._files.purge(str(will_id))
+
+    def clear(self) -> None:
+        self._files.clear()
+
+    def size_bytes(self) -> int:
+        return self._files.size_bytes()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
+# ---------------------------------------------------------------------------
+# Pre-render orchestration
+# ---------------------------------------------------------------------------
+
+
+class FinalPDFArtifacts:
+    """Renders, deduplicates and serves final will PDF artifacts.
+
+    At most one render per ``(will_id, version)`` runs at a time; the
+    background job and any concurrent downloads all await the same task.
+    Without a *store* (no ``WILL_ARTIFACT_DIR`` configured) nothing is
+    pre-rendered and every download renders the PDF on demand.
+    """
+
+    def __init__(self, store: Optional[WillArtifactStore]) -> None:
+        self._store = store
+        self._inflight: dict[tuple[uuid.UUID, int], asyncio.Task] = {}
+        self.prerendered = 0
+        self.rendered_on_demand = 0
+        self.served = 0
+        self.failures = 0
+
+    @property
+    def store(self) -> Optional[WillArtifactStore]:
+        return self._store
+
+    def schedule(self, will_id: uuid.UUID, user_id: uuid.UUID, version: int) -> None:
+        """Start a fire-and-forget pre-render for a will version.
+
+        Call only after the payment is committed: the job reads the will in
+        its own session. An existing artifact is detected by the job.
+        """
+        if self._store is None:
+            return
+        self._start(will_id, user_id, version, background=True)
+
+    async def open(
+        self, will: Will, if_none_match: Optional[str] = None
+    ) -> PDFDocument:
+        """Open the final PDF artifact for *will*, rendering it if missing.
+
+        Raises:
+            HTTPException(503): If the artifact is still unavailable after
+                rendering (e.g. the will was regenerated concurrently).
+        """
+        if self._store is None:
+            self.rendered_on_demand += 1
+            async with async_session() as session:
+                return await DocumentGenerationService(session=session).open_final(
+                    will.id, will.user_id, if_none_match=if_none_match
+                )
+
+        etag = make_etag(f"{will.id}.v{will.version}")
+        if etag_matches(if_none_match, etag):
+            return PDFDocument(etag=etag, file=None)
+
+        fh = await anyio.to_thread.run_sync(self._store.open, will.id, will.version)
+        if fh is None:
+            task = self._inflight.get((will.id, will.version))
+            if task is None:
+                task = self._start(will.id, will.user_id, will.version, background=False)
+            # Shielded so a disconnecting client doesn't cancel a render
+            # other requests (or the ITN job) are waiting on.
+            await asyncio.shield(task)
+            fh = await anyio.to_thread.run_sync(self._store.open, will.id, will.version)
+            if fh is None:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Your document is being prepared. Please try again shortly.",
+                    headers={"Retry-After": str(settings.PDF_RENDER_RETRY_AFTER)},
+                )
+
+        self.served += 1
+        return PDFDocument(etag=etag, file=fh)
+
+    def purge(self, will_id: uuid.UUID) -> None:
+        """Delete every stored artifact for *will_id* (e.g. a deleted will)."""
+        if self._store is None:
+            return
+        try:
+            removed = self._store.purge(will_id)
+        except OSError:
+            logger.warning("Artifact purge failed for will %s", will_id, exc_info=True)
+            return
+        if removed:
+            logger.info("Purged %d final PDF artifact(s) for will %s", removed, will_id)
+
+    def clear(self) -> None:
+        """Delete every stored artifact (database reset)."""
+        if self._store is not None:
+            self._store.clear()
+
+    def _start(
+        self, will_id: uuid.UUID, user_id: uuid.UUID, version: int, background: bool
+    ) -> asyncio.Task:
+        key = (will_id, version)
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+        task = asyncio.create_task(self._render(will_id, user_id, version, background))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return task
+
+    def _finish(self, key: tuple[uuid.UUID, int], task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            self.failures += 1
+            logger.error(
+                "Final PDF render failed for will %s v%d: %s",
+                key[0], key[1], exc, exc_info=exc,
+            )
+
+    async def _render(
+        self, will_id: uuid.UUID, user_id: uuid.UUID, version: int, background: bool
+    ) -> None:
+        """Render the final PDF in its own session and persist the artifact."""
+        if background and await anyio.to_thread.run_sync(
+            self._store.exists, will_id, version
+        ):
+            return
+        async with async_session() as session:
+            will = await WillService(session=session).get_will(will_id, user_id)
+            if will.version != version:
+                logger.info(
+                    "Skipping final PDF for will %s v%d (now v%d)",
+                    will_id, version, will.version,
+                )
+                return
+            document = await DocumentGenerationService(session=session).open_final(
+                will_id, user_id
+            )
+        with document.file as fh:
+            path = await anyio.to_thread.run_sync(
+                self._store.write, will_id, version, fh
+            )
+
+        if background:
+            self.prerendered += 1
+        else:
+            self.rendered_on_demand += 1
+        logger.info("Stored final PDF artifact %s", path)
+
+    def stats(self) -> dict:
+        """Return counters for the metrics endpoint."""
+        return {
+            "prerendered": self.prerendered,
+            "rendered_on_demand": self.rendered_on_demand,
+            "served": self.served,
+            "failures": self.failures,
+            "in_flight": len(self._inflight),
+            "entries": len(self._store) if self._store is not None else 0,
+            "size_bytes": self._store.size_bytes() if self._store is not None else 0,
+        }
+
+
+def _build_artifact_store() -> Optional[WillArtifactStore]:
+    # Final wills are personal data, so they are only stored in a directory
+    # configured for them, never in the shared system temp dir.
+    if not settings.WILL_ARTIFACT_DIR:
+        logger.warning(
+            "WILL_ARTIFACT_DIR is not set; final PDFs are rendered on every download"
+        )
+        return None
+    return WillArtifactStore(
+        Path(settings.WILL_ARTIFACT_DIR), settings.WILL_ARTIFACT_MAX_BYTES
+    )
+
+
+# Process-wide artifact manager shared by the payment and download APIs.
+final_pdf_artifacts = FinalPDFArtifacts(_build_artifact_store())
@@ -0,0 +1,275 @@
+"""Regenerate final PDFs for paid wills affected by re-approved clauses.
+
+After ``ClauseLibraryService.create_new_version`` re-approves a clause,
+every paid will whose document includes it needs a fresh PDF. This script
+finds those wills with a single query, renders them concurrently on the
+shared process-pool render engine, stores each result as the artifact for
+the will's next version, and bumps ``Will.version`` so the download link
+serves the new document.
+
+Progress is appended to a checkpoint file after every will, so an
+interrupted run can be restarted with the same arguments and will skip
+wills that were already regenerated. The default checkpoint name includes
+the current version of each clause, so a run after a later re-approval
+starts afresh; the file is removed once a run completes without failures.
+
+Usage:
+    cd backend
+    python -m scripts.regenerate_documents EXEC-01 BENEF-02
+    python -m scripts.regenerate_documents EXEC-01 --concurrency 4 --dry-run
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import anyio
+from sqlmodel import select
+
+from app.database import async_session
+from app.models.clause import Clause
+from app.models.will import Will
+from app.services.document_service import (
+    CLAUSE_ORDER,
+    DocumentGenerationService,
+    wills_using_clauses,
+)
+from app.services.pdf_renderer import render_engine
+from app.services.will_artifacts import final_pdf_artifacts
+from app.services.will_service import WillService
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Checkpointing and reporting
+# ---------------------------------------------------------------------------
+
+
+class Checkpoint:
+    """Append-only record of will IDs that have been regenerated."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self.done: set[str] = set()
+
+    def load(self) -> None:
+        if self._path.is_file():
+            self.done = {
+                line.strip()
+                for line in self._path.read_text().splitlines()
+                if line.strip()
+            }
+
+    def mark_done(self, will_id: uuid.UUID) -> None:
+        with self._path.open("a") as fh:
+            fh.write(f"{will_id}\n")
+        self.done.add(str(will_id))
+
+    def remove(self) -> None:
+        """Delete the checkpoint file once the run has fully completed."""
+        self._path.unlink(missing_ok=True)
+        self.done.clear()
+
+
+def default_checkpoint_path(versions: dict[str, int]) -> Path:
+    """Return the checkpoint path for clause *versions* (code -> version)."""
+    key = "-".join(f"{code}.v{versions[code]}" for code in sorted(versions))
+    return Path(f"regenerate-{key}.checkpoint")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Return the nearest-rank *pct* percentile of *values* (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class RunStats:
+    """Throughput and latency accounting for a regeneration run."""
+
+    def __init__(self) -> None:
+        self.durations: list[float] = []
+        self.failed = 0
+        self.skipped = 0
+        self._started = time.perf_counter()
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        rendered = len(self.durations)
+        return {
+            "rendered": rendered,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "elapsed_s": round(elapsed, 2),
+            "docs_per_sec": round(rendered / elapsed, 2) if elapsed else 0.0,
+            "p95_render_ms": round(percentile(self.durations, 95) * 1000, 1),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Regeneration
+# ---------------------------------------------------------------------------
+
+
+async def select_affected_wills(codes: set[str]) -> list[tuple[uuid.UUID, uuid.UUID]]:
+    """Return ``(will_id, user_id)`` for every paid will using any of *codes*."""
+    async with async_session() as session:
+        stmt = (
+            select(Will.id, Will.user_id)
+            .where(Will.paid_at.isnot(None))  # type: ignore[union-attr]
+            .where(wills_using_clauses(codes))
+            .order_by(Will.id)
+        )
+        result = await session.exec(stmt)
+        return [(row[0], row[1]) for row in result.all()]
+
+
+async def current_clause_versions(codes: set[str]) -> dict[str, int]:
+    """Return the current version of each clause code in *codes*."""
+    async with async_session() as session:
+        stmt = (
+            select(Clause.code, Clause.version)
+            .where(Clause.code.in_(codes))  # type: ignore[attr-defined]
+            .where(Clause.is_current == True)  # noqa: E712
+        )
+        result = await session.exec(stmt)
+        return {code: version for code, version in result.all()}
+
+
+async def regenerate_will(will_id: uuid.UUID, user_id: uuid.UUID) -> float:
+    """Render a fresh final PDF for one will and bump its version.
+
+    Returns the wall-clock time taken in seconds.
+    """
+    start = time.perf_counter()
+    async with async_session() as session:
+        will = await WillService(session=session).get_will(will_id, user_id)
+        document = await DocumentGenerationService(session=session).open_final(
+            will_id, user_id
+        )
+        next_version = will.version + 1
+        with document.file as fh:
+            await anyio.to_thread.run_sync(
+                final_pdf_artifacts.store.write, will_id, next_version, fh
+            )
+        will.version = next_version
+        will.updated_at = datetime.now(timezone.utc)
+        session.add(will)
+        await session.commit()
+    return time.perf_counter() - start
+
+
+async def run(
+    codes: set[str],
+    checkpoint: Checkpoint,
+    concurrency: int,
+    dry_run: bool = False,
+) -> dict:
+    """Regenerate all affected wills, returning the run summary."""
+    stats = RunStats()
+    wills = await select_affected_wills(codes)
+    pending = [w for w in wills if str(w[0]) not in checkpoint.done]
+    stats.skipped = len(wills) - len(pending)
+    logger.info(
+        "%d paid will(s) use %s; %d already done, %d to regenerate",
+        len(wills), ", ".join(sorted(codes)), stats.skipped, len(pending),
+    )
+    if dry_run:
+        for will_id, _user_id in pending:
+            logger.info("Would regenerate will %s", will_id)
+        return stats.summary()
+
+    queue: asyncio.Queue[tuple[uuid.UUID, uuid.UUID]] = asyncio.Queue()
+    for item in pending:
+        queue.put_nowait(item)
+
+    async def _worker() -> None:
+        while True:
+            try:
+                will_id, user_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                duration = await regenerate_will(will_id, user_id)
+            except Exception:
+                stats.failed += 1
+                logger.exception("Failed to regenerate will %s", will_id)
+                continue
+            stats.durations.append(duration)
+            checkpoint.mark_done(will_id)
+            done = len(stats.durations) + stats.failed
+            if done % 25 == 0:
+                logger.info("Progress: %d/%d %s", done, len(pending), stats.summary())
+
+    await asyncio.gather(*(_worker() for _ in range(max(concurrency, 1))))
+    return stats.summary()
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    known_codes = {entry["code"] for entry in CLAUSE_ORDER}
+    parser = argparse.ArgumentParser(
+        description="Regenerate final PDFs for paid wills using the given clauses."
+    )
+    parser.add_argument("codes", nargs="+", help="Clause codes, e.g. EXEC-01")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=render_engine.workers,
+        help="Wills rendered at once (default: one per render worker)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file (default: regenerate-<code>.v<version>....checkpoint)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="List affected wills only"
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.codes) - known_codes
+    if unknown:
+        parser.error(f"Unknown clause code(s): {', '.join(sorted(unknown))}")
+    return args
+
+
+async def _main(argv: list[str] | None = None) -> int:
+    """Entry point for running the regeneration script directly."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    args = _parse_args(argv)
+
+    if final_pdf_artifacts.store is None:
+        logger.error("WILL_ARTIFACT_DIR is not set; there is nowhere to store regenerated PDFs")
+        return 2
+
+    codes = set(args.codes)
+    checkpoint_path = args.checkpoint or default_checkpoint_path(
+        await current_clause_versions(codes)
+    )
+    checkpoint = Checkpoint(checkpoint_path)
+    checkpoint.load()
+    try:
+        summary = await run(codes, checkpoint, args.concurrency, dry_run=args.dry_run)
+    finally:
+        render_engine.shutdown()
+    if not args.dry_run and not summary["failed"]:
+        checkpoint.remove()
+
+    logger.info(
+        "Rendered %d will(s) in %.2fs: %.2f docs/sec, p95 %.1f ms, %d failed, %d skipped",
+        summary["rendered"], summary["elapsed_s"], summary["docs_per_sec"],
+        summary["p95_render_ms"], summary["failed"], summary["skipped"],
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(_main()))
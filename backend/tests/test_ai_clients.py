@@ -0,0 +1,74 @@
+"""Tests for the shared AI client registry.
+
+Checks that clients are shared per API key, that the pooled HTTP client
+keeps connections alive across requests, and that reuse is counted.
+"""
+
+from __future__ import annotations
+
+import http.server
+import threading
+
+import pytest
+
+from app.services.ai_clients import AIClientRegistry
+from app.services.openai_service import OpenAIService
+
+
+class _OkHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+class TestAIClientRegistry:
+    @pytest.mark.asyncio
+    async def test_openai_client_is_shared_per_key(self):
+        registry = AIClientRegistry()
+        assert registry.openai("key-a") is registry.openai("key-a")
+        assert registry.openai("key-a") is not registry.openai("key-b")
+        assert registry.stats()["openai_clients"] == 2
+        await registry.aclose()
+        assert registry.stats()["openai_clients"] == 0
+
+    def test_gemini_requires_key(self):
+        assert AIClientRegistry().gemini("") is None
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, local_server):
+        registry = AIClientRegistry()
+        http_client = registry._http_client()
+        try:
+            for _ in range(3):
+                response = await http_client.get(local_server)
+                assert response.status_code == 200
+        finally:
+            await http_client.aclose()
+        stats = registry.stats()
+        assert stats["requests"] == 3
+        assert stats["new_connections"] == 1
+        assert stats["reused_connections"] == 2
+
+    @pytest.mark.asyncio
+    async def test_service_uses_injected_client(self):
+        registry = AIClientRegistry()
+        client = registry.openai("key-a")
+        assert OpenAIService(api_key="key-a", client=client)._client is client
+        await registry.aclose()
@@ -0,0 +1,193 @@
+"""Unit tests for ClauseLibraryService rendering and the compiled template cache.
+
+Covers:
+- render_clause: variable substitution and error mapping to ValueError
+- ClauseTemplateCache: compile-once reuse, text-hash keying, invalidation
+- ClauseSnapshot: indexes, single load for many lookups, refresh on change
+- create_new_version: snapshot invalidated only once the session commits
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.clause import ClauseCategory, WillType
+from app.services.clause_library import (
+    ClauseLibraryService,
+    ClauseSnapshot,
+    ClauseTemplateCache,
+    clause_snapshot,
+    clause_template_cache,
+)
+from tests.conftest import _make_clause
+
+
+@pytest.fixture()
+def clause_service() -> ClauseLibraryService:
+    clause_template_cache.clear()
+    return ClauseLibraryService(session=AsyncMock())
+
+
+def _bequest_clause(text: str = "I bequeath {{ item }} to {{ name }}."):
+    return _make_clause("BENEF-01", "Specific Bequest", ClauseCategory.BENEFICIARY, text)
+
+
+class TestRenderClause:
+    def test_renders_variables(self, clause_service: ClauseLibraryService):
+        rendered = clause_service.render_clause(
+            _bequest_clause(), {"item": "my watch", "name": "Sarah"}
+        )
+        assert rendered == "I bequeath my watch to Sarah."
+
+    def test_missing_variable_raises_value_error(self, clause_service: ClauseLibraryService):
+        with pytest.raises(ValueError, match="Missing required variable"):
+            clause_service.render_clause(_bequest_clause(), {"item": "my watch"})
+
+    def test_syntax_error_raises_value_error(self, clause_service: ClauseLibraryService):
+        with pytest.raises(ValueError, match="Invalid template syntax"):
+            clause_service.render_clause(_bequest_clause("{% if %}"), {})
+
+
+class TestClauseTemplateCache:
+    def test_compiles_once_for_repeated_renders(self, clause_service: ClauseLibraryService):
+        clause = _bequest_clause()
+        for i in range(20):
+            clause_service.render_clause(clause, {"item": f"item {i}", "name": "Sarah"})
+        stats = clause_template_cache.stats()
+        assert stats["compilations"] == 1
+        assert stats["hits"] == 19
+
+    def test_changed_text_recompiles(self):
+        cache = ClauseTemplateCache()
+        cache.get_or_compile(_bequest_clause("A {{ x }}"))
+        template = cache.get_or_compile(_bequest_clause("B {{ x }}"))
+        assert template.render(x=1) == "B 1"
+        assert cache.stats()["compilations"] == 2
+
+    def test_invalidate_drops_all_versions_of_code(self):
+        cache = ClauseTemplateCache()
+        v1 = _bequest_clause()
+        v2 = _bequest_clause()
+        v2.version = 2
+        cache.get_or_compile(v1)
+        cache.get_or_compile(v2)
+        cache.get_or_compile(
+            _make_clause("EXEC-01", "Executor", ClauseCategory.EXECUTOR, "{{ n }}")
+        )
+        cache.invalidate("BENEF-01")
+        assert cache.stats()["size"] == 1
+        assert cache.stats()["invalidations"] == 2
+
+    def test_lru_bound(self):
+        cache = ClauseTemplateCache(max_size=2)
+        for i in range(3):
+            cache.get_or_compile(_bequest_clause(f"T{i} {{{{ x }}}}"))
+        assert cache.stats()["size"] == 2
+
+
+def _snapshot_session(clauses: list, fingerprint: tuple = (1, 1, None)) -> MagicMock:
+    """Fake AsyncSession answering the fingerprint and load queries."""
+    session = MagicMock()
+    state = {"fingerprint": fingerprint, "clauses": clauses}
+
+    async def _exec(_stmt):
+        result = MagicMock()
+        result.one.return_value = state["fingerprint"]
+        result.all.return_value = state["clauses"]
+        return result
+
+    session.exec = AsyncMock(side_effect=_exec)
+    session.state = state
+    return session
+
+
+class TestClauseSnapshot:
+    def _clauses(self):
+        executor = _make_clause(
+            "EXEC-01", "Executor", ClauseCategory.EXECUTOR, "x", will_types=["basic"]
+        )
+        executor.is_required = True
+        trust = _make_clause(
+            "TRUST-01", "Trust", ClauseCategory.TRUST, "y", will_types=["trust"]
+        )
+        return [executor, trust]
+
+    def test_indexes_by_code_category_and_will_type(self):
+        snapshot = ClauseSnapshot(ttl=60)
+        snapshot.replace(self._clauses())
+        assert snapshot.get("EXEC-01").code == "EXEC-01"
+        assert snapshot.get("NOPE") is None
+        assert [c.code for c in snapshot.by_category(ClauseCategory.TRUST, WillType.TRUST)] == ["TRUST-01"]
+        assert snapshot.by_category(ClauseCategory.TRUST, WillType.BASIC) == []
+        assert [c.code for c in snapshot.required(WillType.BASIC)] == ["EXEC-01"]
+        assert [c.code for c in snapshot.all_current(WillType.BASIC)] == ["EXEC-01"]
+
+    @pytest.mark.asyncio
+    async def test_loads_once_for_many_lookups(self):
+        snapshot = ClauseSnapshot(ttl=60)
+        session = _snapshot_session(self._clauses())
+        for _ in range(10):
+            await snapshot.ensure_fresh(session)
+        assert snapshot.loads == 1
+        assert session.exec.await_count == 2  # fingerprint + load
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self):
+        snapshot = ClauseSnapshot(ttl=60)
+        session = _snapshot_session(self._clauses())
+        await snapshot.ensure_fresh(session)
+        snapshot.invalidate()
+        await snapshot.ensure_fresh(session)
+        assert snapshot.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_ttl_reloads_only_when_fingerprint_changes(self):
+        snapshot = ClauseSnapshot(ttl=0)
+        session = _snapshot_session(self._clauses())
+        await snapshot.ensure_fresh(session)
+        await snapshot.ensure_fresh(session)
+        assert snapshot.loads == 1
+        session.state["fingerprint"] = (2, 3, None)
+        await snapshot.ensure_fresh(session)
+        assert snapshot.loads == 2
+
+    @pytest.mark.asyncio
+    async def test_snapshot_holds_detached_copies(self):
+        snapshot = ClauseSnapshot(ttl=60)
+        originals = self._clauses()
+        await snapshot.ensure_fresh(_snapshot_session(originals))
+        originals[0].is_current = False
+        assert snapshot.get("EXEC-01").is_current is True
+
+
+class TestCreateNewVersion:
+    def _service(self, current):
+        session = MagicMock()
+        session.exec = AsyncMock(return_value=MagicMock(first=MagicMock(return_value=current)))
+        session.flush = AsyncMock()
+        session.refresh = AsyncMock()
+        session.sync_session = Session()
+        return ClauseLibraryService(session=session), session
+
+    @pytest.mark.asyncio
+    async def test_snapshot_invalidated_after_commit(self):
+        current = _bequest_clause()
+        service, session = self._service(current)
+        before = clause_snapshot.version
+        new_clause = await service.create_new_version(current.id, "New text.", "Attorney")
+        assert new_clause.previous_version_id == current.id
+        assert clause_snapshot.version == before
+        session.sync_session.commit()
+        assert clause_snapshot.version == before + 1
+
+    @pytest.mark.asyncio
+    async def test_rollback_leaves_snapshot_alone(self):
+        current = _bequest_clause()
+        service, session = self._service(current)
+        before = clause_snapshot.version
+        await service.create_new_version(current.id, "New text.", "Attorney")
+        session.sync_session.rollback()
+        assert clause_snapshot.version == before
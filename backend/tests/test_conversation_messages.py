@@ -0,0 +1,141 @@
+"""Tests for append-only conversation message storage.
+
+Checks the message table layout, the windowed read query, token counting,
+and that budgeted windows are returned in chronological order.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.conversation import Conversation, ConversationMessage
+from app.services.conversation_service import (
+    ConversationService,
+    message_window_query,
+)
+from app.services.token_budget import (
+    MESSAGE_OVERHEAD_TOKENS,
+    count_tokens,
+    fit_to_budget,
+    message_tokens,
+    message_tokens_async,
+)
+
+
+def _message(seq: int, role: str, content: str, tokens: int | None = None):
+    return ConversationMessage(
+        conversation_id=uuid.uuid4(),
+        seq=seq,
+        role=role,
+        content=content,
+        token_count=tokens,
+    )
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return list(self._rows)
+
+
+class _Session:
+    """Returns canned rows for any query and records the statements."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def exec(self, statement):
+        self.statements.append(statement)
+        return _Result(self.rows)
+
+
+class TestMessageTable:
+    def test_primary_key_is_conversation_and_seq(self):
+        pk = [c.name for c in ConversationMessage.__table__.primary_key.columns]
+        assert pk == ["conversation_id", "seq"]
+
+    def test_conversation_has_no_jsonb_history(self):
+        assert "messages" not in Conversation.__table__.columns
+        assert "message_count" in Conversation.__table__.columns
+
+
+class TestMessageWindow:
+    def test_query_reads_latest_rows_only(self):
+        sql = str(
+            message_window_query(uuid.uuid4(), 20).compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+        )
+        assert "ORDER BY conversation_messages.seq DESC" in sql
+        assert "LIMIT 20" in sql
+
+    @pytest.mark.asyncio
+    async def test_window_is_chronological(self):
+        conversation = Conversation(will_id=uuid.uuid4(), section="assets")
+        newest_first = [
+            _message(seq, role, f"m{seq}", tokens=10)
+            for seq, role in ((3, "user"), (2, "assistant"), (1, "user"))
+        ]
+        session = _Session(newest_first)
+        service = ConversationService(session, openai_service=None, upl_filter=None)
+        window = await service.get_message_window(conversation, token_budget=1000)
+        assert window == [
+            {"role": "user", "content": "m1"},
+            {"role": "assistant", "content": "m2"},
+            {"role": "user", "content": "m3"},
+        ]
+
+
+class TestTokenBudget:
+    def test_count_is_positive_and_grows(self):
+        short = count_tokens("hello", "gpt-4o-mini")
+        long = count_tokens("hello " * 100, "gpt-4o-mini")
+        assert 0 < short < long
+
+    def test_message_tokens_include_overhead(self):
+        assert message_tokens("", "gpt-4o-mini") == MESSAGE_OVERHEAD_TOKENS
+
+    def test_budget_stops_at_first_message_that_does_not_fit(self):
+        newest_first = [
+            _message(4, "user", "d", tokens=30),
+            _message(3, "assistant", "c", tokens=30),
+            _message(2, "user", "b", tokens=50),
+            _message(1, "assistant", "a", tokens=1),
+        ]
+        window = fit_to_budget(newest_first, 100, "gpt-4o-mini")
+        assert [m["content"] for m in window] == ["c", "d"]
+
+    def test_newest_message_always_included(self):
+        window = fit_to_budget([_message(1, "user", "x", tokens=500)], 100, "gpt-4o-mini")
+        assert window == [{"role": "user", "content": "x"}]
+
+    def test_missing_counts_are_computed(self):
+        content = "word " * 50
+        expected = message_tokens(content, "gpt-4o-mini")
+        newest_first = [_message(2, "user", content), _message(1, "assistant", content)]
+        assert len(fit_to_budget(newest_first, expected, "gpt-4o-mini")) == 1
+        assert len(fit_to_budget(newest_first, 2 * expected, "gpt-4o-mini")) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_count_offloads_long_text(self, monkeypatch):
+        from app.services import token_budget
+
+        offloaded = []
+
+        async def fake_to_thread(fn, *args):
+            offloaded.append(args[0])
+            return fn(*args)
+
+        monkeypatch.setattr(token_budget.asyncio, "to_thread", fake_to_thread)
+        model = "gpt-4o-mini"
+        long = "word " * 2000
+        assert await message_tokens_async("hi", model) == message_tokens("hi", model)
+        assert await message_tokens_async(long, model) == message_tokens(long, model)
+        assert offloaded == [long]
@@ -0,0 +1,140 @@
+"""Tests for rolling conversation summaries.
+
+Covers summary injection into the system prompt, the summary request
+format, and when ConversationService folds older messages into the
+running summary.
+"""
+
+from __future__ import annotations
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.config import settings
+from app.models.conversation import Conversation, ConversationMessage
+from app.prompts.summary import format_summary_request
+from app.prompts.system import build_system_prompt
+from app.services.conversation_service import ConversationService
+
+
+class _Result:
+    def __init__(self, rows=(), rowcount=1):
+        self._rows = list(rows)
+        self.rowcount = rowcount
+
+    def first(self):
+        return self._rows[0] if self._rows else None
+
+    def all(self):
+        return list(self._rows)
+
+
+class _Session:
+    """Serves the conversation, then its older messages; records updates."""
+
+    def __init__(self, conversation, messages, rowcount=1):
+        self._results = [_Result([conversation]), _Result(messages)]
+        self.updates = []
+        self._rowcount = rowcount
+
+    async def exec(self, statement):
+        return self._results.pop(0)
+
+    async def execute(self, statement):
+        self.updates.append(statement)
+        return _Result(rowcount=self._rowcount)
+
+
+def _conversation(message_count: int, summarized_through: int = 0) -> Conversation:
+    return Conversation(
+        will_id=uuid.uuid4(),
+        section="assets",
+        message_count=message_count,
+        summary="- The user owns a house.",
+        summarized_through=summarized_through,
+    )
+
+
+def _messages(conversation, seqs, tokens):
+    return [
+        ConversationMessage(
+            conversation_id=conversation.id,
+            seq=seq,
+            role="user" if seq % 2 else "assistant",
+            content=f"message {seq}",
+            token_count=tokens,
+        )
+        for seq in seqs
+    ]
+
+
+def _service(session, summary="- The user owns a house and a car."):
+    openai = MagicMock()
+    openai.summarize_conversation = AsyncMock(return_value=summary)
+    return ConversationService(session, openai_service=openai, upl_filter=None)
+
+
+class TestPrompt:
+    def test_summary_injected_when_present(self):
+        prompt = build_system_prompt("assets", {}, "- The user owns a boat.")
+        assert "EARLIER IN THIS CONVERSATION" in prompt
+        assert "- The user owns a boat." in prompt
+
+    def test_no_summary_section_when_empty(self):
+        assert "EARLIER IN THIS CONVERSATION" not in build_system_prompt("assets", {})
+
+    def test_summary_request_lists_messages(self):
+        text = format_summary_request("", [{"role": "user", "content": "hi"}])
+        assert "PREVIOUS SUMMARY:\n(none)" in text
+        assert "USER: hi" in text
+
+
+class TestSummarizeIfNeeded:
+    @pytest.mark.asyncio
+    async def test_folds_older_messages_over_threshold(self):
+        keep = settings.SUMMARY_KEEP_RECENT_MESSAGES
+        conversation = _conversation(message_count=keep + 4)
+        per_message = settings.SUMMARY_TRIGGER_TOKENS // 4 + 1
+        session = _Session(conversation, _messages(conversation, range(1, 5), per_message))
+        service = _service(session)
+
+        assert await service.summarize_if_needed(conversation.will_id, "assets") is True
+        kwargs = service._openai.summarize_conversation.call_args.kwargs
+        assert kwargs["previous_summary"] == "- The user owns a house."
+        assert [m["content"] for m in kwargs["messages"]] == [
+            f"message {i}" for i in range(1, 5)
+        ]
+        params = session.updates[0].compile().params
+        assert params["summarized_through"] == 4
+        assert params["summarized_through_1"] == 0
+
+    @pytest.mark.asyncio
+    async def test_below_threshold_is_skipped(self):
+        keep = settings.SUMMARY_KEEP_RECENT_MESSAGES
+        conversation = _conversation(message_count=keep + 2)
+        session = _Session(conversation, _messages(conversation, (1, 2), 10))
+        service = _service(session)
+
+        assert await service.summarize_if_needed(conversation.will_id, "assets") is False
+        service._openai.summarize_conversation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_only_recent_messages_is_noop(self):
+        conversation = _conversation(message_count=settings.SUMMARY_KEEP_RECENT_MESSAGES)
+        session = _Session(conversation, [])
+        service = _service(session)
+
+        assert await service.summarize_if_needed(conversation.will_id, "assets") is False
+        service._openai.summarize_conversation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_update_is_not_overwritten(self):
+        keep = settings.SUMMARY_KEEP_RECENT_MESSAGES
+        conversation = _conversation(message_count=keep + 2)
+        tokens = settings.SUMMARY_TRIGGER_TOKENS
+        session = _Session(conversation, _messages(conversation, (1, 2), tokens), rowcount=0)
+        service = _service(session)
+
+        assert await service.summarize_if_needed(conversation.will_id, "assets") is False
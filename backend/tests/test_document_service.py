@@ -0,0 +1,121 @@
+"""Unit tests for will clause assembly and incremental fragment re-rendering.
+
+Covers:
+- _assemble_clauses: per-item clause instances and numbering
+- ClauseFragmentCache: only clauses whose variables changed are re-rendered
+- The will template fingerprint is computed once per process
+"""
+
+from __future__ import annotations
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.clause import ClauseCategory
+from app.models.will import Will
+from app.services.clause_library import clause_template_cache
+from app.services import document_service
+from app.services.document_service import (
+    DocumentGenerationService,
+    clause_fragment_cache,
+)
+from tests.conftest import _make_clause
+
+_CLAUSES = {
+    "REVOC-01": _make_clause(
+        "REVOC-01", "Revocation", ClauseCategory.REVOCATION,
+        "I, {{ testator_full_name }} ({{ testator_id_number }}), revoke all wills.",
+    ),
+    "EXEC-01": _make_clause(
+        "EXEC-01", "Executor", ClauseCategory.EXECUTOR,
+        "I appoint {{ executor_name }} ({{ executor_id_number }}, {{ executor_address }}).",
+    ),
+    "BENEF-01": _make_clause(
+        "BENEF-01", "Specific Bequest", ClauseCategory.BENEFICIARY,
+        "I bequeath {{ asset_description }} to {{ beneficiary_name }}.",
+    ),
+    "BENEF-02": _make_clause(
+        "BENEF-02", "Residue", ClauseCategory.RESIDUE,
+        "The residue goes to {{ residue_beneficiary_name }}.",
+    ),
+}
+
+
+def _will(bequests: list[dict]) -> Will:
+    return Will(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        testator={"first_name": "John", "last_name": "Doe", "id_number": "8001015009087"},
+        executor={"name": "Jane Doe"},
+        bequests=bequests,
+        residue={"beneficiaries": [{"name": "Sarah Doe"}]},
+    )
+
+
+@pytest.fixture()
+def doc_service() -> DocumentGenerationService:
+    clause_fragment_cache.clear()
+    clause_template_cache.clear()
+    service = DocumentGenerationService(session=MagicMock())
+    service._clause_svc.get_clause_by_code = AsyncMock(
+        side_effect=lambda code: _CLAUSES.get(code)
+    )
+    return service
+
+
+class TestAssembleClauses:
+    @pytest.mark.asyncio
+    async def test_one_clause_per_bequest(self, doc_service: DocumentGenerationService):
+        will = _will([
+            {"item_description": "Watch", "recipient_name": "Mark"},
+            {"item_description": "Car", "recipient_name": "Lisa"},
+        ])
+        clauses = await doc_service._assemble_clauses(will)
+        assert [c["code"] for c in clauses] == [
+            "REVOC-01", "EXEC-01", "BENEF-01", "BENEF-01", "BENEF-02",
+        ]
+        assert [c["number"] for c in clauses] == [1, 2, 3, 4, 5]
+        assert clauses[3]["rendered_text"] == "I bequeath Car to Lisa."
+
+
+class TestIncrementalRendering:
+    @pytest.mark.asyncio
+    async def test_unchanged_will_served_from_fragments(self, doc_service: DocumentGenerationService):
+        will = _will([{"item_description": "Watch", "recipient_name": "Mark"}])
+        first = await doc_service._assemble_clauses(will)
+        misses = clause_fragment_cache.misses
+        second = await doc_service._assemble_clauses(will)
+        assert second == first
+        assert clause_fragment_cache.misses == misses
+
+    @pytest.mark.asyncio
+    async def test_editing_one_bequest_rerenders_only_that_clause(
+        self, doc_service: DocumentGenerationService
+    ):
+        bequests = [
+            {"item_description": "Watch", "recipient_name": "Mark"},
+            {"item_description": "Car", "recipient_name": "Lisa"},
+        ]
+        await doc_service._assemble_clauses(_will(bequests))
+        misses = clause_fragment_cache.misses
+
+        bequests[1] = {"item_description": "Boat", "recipient_name": "Lisa"}
+        clauses = await doc_service._assemble_clauses(_will(bequests))
+
+        assert clause_fragment_cache.misses == misses + 1
+        assert clauses[3]["rendered_text"] == "I bequeath Boat to Lisa."
+
+
+class TestTemplateFingerprint:
+    @pytest.mark.asyncio
+    async def test_computed_once(self, monkeypatch):
+        monkeypatch.setattr(document_service, "_template_fingerprint", None)
+        monkeypatch.setattr(document_service.settings, "DEBUG", False)
+        with patch.object(
+            document_service, "template_fingerprint", return_value="fp"
+        ) as compute:
+            assert await document_service._will_template_fingerprint() == "fp"
+            assert await document_service._will_template_fingerprint() == "fp"
+        compute.assert_called_once()
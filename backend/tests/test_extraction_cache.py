@@ -0,0 +1,129 @@
+"""Unit tests for change-gated conversation extraction.
+
+Covers conversation fingerprints, the data-signal heuristic, cache hits
+for unchanged input scoped to a will and section, and aliasing of
+heuristic skips to the latest result. Background extraction of an
+unchanged conversation still hands back the result to save.
+"""
+
+from __future__ import annotations
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.prompts.extraction import ExtractedWillData
+from app.services.conversation_service import ConversationService
+from app.services.extraction_cache import (
+    ExtractionCache,
+    conversation_fingerprint,
+    extraction_cache,
+    may_contain_data,
+)
+
+
+def _history(*contents: str) -> list[dict]:
+    roles = ("user", "assistant")
+    return [{"role": roles[i % 2], "content": c} for i, c in enumerate(contents)]
+
+
+class TestFingerprint:
+    def test_stable_for_same_messages(self):
+        assert conversation_fingerprint(_history("a", "b")) == conversation_fingerprint(
+            _history("a", "b")
+        )
+
+    def test_changes_with_content_and_role(self):
+        base = conversation_fingerprint(_history("a", "b"))
+        assert conversation_fingerprint(_history("a", "c")) != base
+        swapped = [{"role": "assistant", "content": "a"}, {"role": "user", "content": "b"}]
+        assert conversation_fingerprint(swapped) != base
+
+    def test_message_boundaries_matter(self):
+        assert conversation_fingerprint(_history("ab", "c")) != conversation_fingerprint(
+            _history("a", "bc")
+        )
+
+
+class TestMayContainData:
+    @pytest.mark.parametrize("message", ["Thanks!", "thank you so much", "Great :)", "👍", ""])
+    def test_pleasantries_have_no_signal(self, message):
+        assert may_contain_data(message) is False
+
+    @pytest.mark.parametrize(
+        "message",
+        ["yes", "ok", "My son John", "Thanks, it's 50%", "R 1 000 000", "Thank you Mary"],
+    )
+    def test_data_or_confirmation_has_signal(self, message):
+        assert may_contain_data(message) is True
+
+
+class TestExtractionCache:
+    def test_hit_counts_as_skip(self):
+        cache = ExtractionCache()
+        will_id = uuid.uuid4()
+        result = ExtractedWillData()
+        assert cache.get(will_id, "assets", "fp") is None
+        cache.put(will_id, "assets", "fp", result)
+        assert cache.get(will_id, "assets", "fp") is result
+        assert cache.stats()["skipped_unchanged"] == 1
+
+    def test_hits_are_scoped_to_will_and_section(self):
+        cache = ExtractionCache()
+        will_id = uuid.uuid4()
+        cache.put(will_id, "assets", "fp", ExtractedWillData())
+        assert cache.get(uuid.uuid4(), "assets", "fp") is None
+        assert cache.get(will_id, "executor", "fp") is None
+
+    def test_no_signal_skip_aliases_latest_result(self):
+        cache = ExtractionCache()
+        will_id = uuid.uuid4()
+        result = ExtractedWillData()
+        cache.put(will_id, "assets", "fp1", result)
+        cache.skip_no_signal(will_id, "assets", "fp2")
+        assert cache.get(will_id, "assets", "fp2") is result
+        assert cache.stats()["skipped_no_signal"] == 1
+
+    def test_no_signal_skip_without_prior_result(self):
+        cache = ExtractionCache()
+        will_id = uuid.uuid4()
+        cache.skip_no_signal(will_id, "assets", "fp")
+        assert cache.get(will_id, "assets", "fp") is None
+
+    def test_lru_bound(self):
+        cache = ExtractionCache(max_size=2)
+        will_id = uuid.uuid4()
+        for fp in ("a", "b", "c"):
+            cache.put(will_id, "assets", fp, ExtractedWillData())
+        assert cache.get(will_id, "assets", "a") is None
+        assert cache.stats()["cached_results"] == 2
+
+    def test_skip_ratio(self):
+        cache = ExtractionCache()
+        will_id = uuid.uuid4()
+        cache.executed = 1
+        cache.put(will_id, "assets", "fp", ExtractedWillData())
+        cache.get(will_id, "assets", "fp")
+        assert cache.stats()["skip_ratio"] == 0.5
+
+
+class TestExtractIfChanged:
+    @pytest.fixture(autouse=True)
+    def _clean_cache(self):
+        extraction_cache.clear()
+        yield
+        extraction_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_conversation_is_returned_for_saving(self):
+        extractor = MagicMock()
+        extractor.extract_will_data = AsyncMock(return_value=ExtractedWillData())
+        service = ConversationService(MagicMock(), openai_service=extractor, upl_filter=None)
+        history = _history("My son John")
+        service._extraction_input = AsyncMock(return_value=(history, "My son John", "fp"))
+        will_id = uuid.uuid4()
+        first = await service.extract_if_changed(will_id, "beneficiaries")
+        # Had saving the first result failed, the next run can still save it
+        assert await service.extract_if_changed(will_id, "beneficiaries") is first
+        extractor.extract_will_data.assert_awaited_once()
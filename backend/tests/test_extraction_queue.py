@@ -0,0 +1,141 @@
+"""Unit tests for the background extraction queue.
+
+Covers deduplication per (will_id, section), collapsing of back-to-back
+turns into a single follow-up run, status reporting, failure handling, and
+that a streamed turn is committed before its extraction is queued.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.conversation import Conversation
+from app.services.conversation_service import ConversationService
+from app.services.extraction_queue import ExtractionQueue
+from app.services.upl_filter import FilterAction
+
+
+class _Runner:
+    """Records calls and optionally blocks until released."""
+
+    def __init__(self, result: bool = True) -> None:
+        self.calls: list[tuple[uuid.UUID, str]] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.result = result
+
+    async def __call__(self, will_id: uuid.UUID, section: str) -> bool:
+        self.calls.append((will_id, section))
+        await self.release.wait()
+        return self.result
+
+
+class TestExtractionQueue:
+    @pytest.mark.asyncio
+    async def test_single_request_runs_once(self):
+        runner = _Runner()
+        queue = ExtractionQueue(runner)
+        will_id = uuid.uuid4()
+        queue.schedule(will_id, "assets")
+        assert queue.status(will_id, "assets").state == "pending"
+        await queue.drain()
+        status = queue.status(will_id, "assets")
+        assert runner.calls == [(will_id, "assets")]
+        assert status.state == "idle"
+        assert status.runs == 1
+        assert status.has_data is True
+
+    @pytest.mark.asyncio
+    async def test_debounce_collapses_rapid_turns(self):
+        runner = _Runner()
+        queue = ExtractionQueue(runner, debounce=0.02)
+        will_id = uuid.uuid4()
+        for _ in range(5):
+            queue.schedule(will_id, "assets")
+        await queue.drain()
+        # All five arrived before the first run started: one run total.
+        assert len(runner.calls) == 1
+        assert queue.stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_turns_during_a_run_trigger_one_rerun(self):
+        runner = _Runner()
+        runner.release.clear()
+        queue = ExtractionQueue(runner)
+        will_id = uuid.uuid4()
+        queue.schedule(will_id, "assets")
+        await asyncio.sleep(0)
+        assert queue.status(will_id, "assets").state == "running"
+        queue.schedule(will_id, "assets")
+        queue.schedule(will_id, "assets")
+        runner.release.set()
+        await queue.drain()
+        assert len(runner.calls) == 2
+        assert queue.status(will_id, "assets").runs == 2
+
+    @pytest.mark.asyncio
+    async def test_sections_are_independent(self):
+        runner = _Runner()
+        queue = ExtractionQueue(runner)
+        will_id = uuid.uuid4()
+        queue.schedule(will_id, "assets")
+        queue.schedule(will_id, "guardians")
+        await queue.drain()
+        assert sorted(section for _, section in runner.calls) == ["assets", "guardians"]
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded(self):
+        async def _boom(will_id, section):
+            raise RuntimeError("openai down")
+
+        queue = ExtractionQueue(_boom)
+        will_id = uuid.uuid4()
+        queue.schedule(will_id, "assets")
+        await queue.drain()
+        status = queue.status(will_id, "assets")
+        assert status.state == "idle"
+        assert status.last_error == "openai down"
+        assert queue.stats()["failures"] == 1
+
+    def test_unknown_key_is_idle(self):
+        queue = ExtractionQueue(_Runner())
+        status = queue.status(uuid.uuid4(), "assets")
+        assert status.state == "idle"
+        assert status.runs == 0
+
+
+class TestStreamedTurn:
+    @pytest.mark.asyncio
+    async def test_turn_is_committed_before_extraction_is_queued(self):
+        calls: list[str] = []
+        session = MagicMock()
+        session.commit = AsyncMock(side_effect=lambda: calls.append("commit"))
+
+        async def _stream(**kwargs):
+            yield "Noted, your house goes to Sarah."
+
+        openai = MagicMock()
+        openai.stream_response = _stream
+        upl = MagicMock()
+        upl.filter_output = AsyncMock(return_value=MagicMock(action=FilterAction.ALLOW))
+        service = ConversationService(session, openai, upl)
+        conversation = Conversation(will_id=uuid.uuid4(), section="assets")
+        service.get_or_create_conversation = AsyncMock(return_value=conversation)
+        service.add_message = AsyncMock(return_value=MagicMock(seq=2))
+        service.get_message_window = AsyncMock(return_value=[])
+        queue = MagicMock()
+        queue.schedule.side_effect = lambda *args: calls.append("schedule")
+
+        with patch("app.services.conversation_service.extraction_queue", queue):
+            events = [
+                e async for e in service.stream_ai_response(
+                    conversation.will_id, "assets", "My house goes to Sarah", {}
+                )
+            ]
+
+        assert events[-1]["event"] == "done"
+        assert calls == ["commit", "schedule"]
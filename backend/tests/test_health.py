@@ -0,0 +1,27 @@
+"""Tests for the internal metrics guard on /api/health/metrics."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.health import require_metrics_token
+from app.config import settings
+
+
+class TestMetricsToken:
+    def test_disabled_without_configured_token(self, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+        with pytest.raises(HTTPException) as exc_info:
+            require_metrics_token("")
+        assert exc_info.value.status_code == 404
+
+    def test_wrong_or_missing_token_is_rejected(self, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+        for token in (None, "", "wrong"):
+            with pytest.raises(HTTPException):
+                require_metrics_token(token)
+
+    def test_matching_token_is_accepted(self, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+        assert require_metrics_token("s3cret") is None
@@ -1,10 +1,12 @@
 """Unit tests for OpenAI service, system prompts, and extraction schemas.
 
 Covers:
-- build_system_prompt: section-specific prompts with base personality
+- build_system_prompt: section-specific prompts with base personality,
+  laid out as a stable static prefix followed by dynamic will state
 - format_will_summary: will state formatting for system prompt context
 - Extraction Pydantic models: validation of structured output schemas
 - OpenAIService: constructor, stream_response, extract_will_data (mocked)
+- PromptCacheStats: cached-token accounting from usage reports
 """
 
 from __future__ import annotations
@@ -25,11 +27,12 @@ from app.prompts.extraction import (
 from app.prompts.system import (
     BASE_PERSONALITY,
     SECTION_PROMPTS,
+    STATIC_PREFIX,
     UPL_BOUNDARY,
     build_system_prompt,
     format_will_summary,
 )
-from app.services.openai_service import OpenAIService
+from app.services.openai_service import OpenAIService, PromptCacheStats
 
 
 # ---------------------------------------------------------------------------
@@ -110,6 +113,21 @@ class TestBuildSystemPrompt:
         guidance = SECTION_PROMPTS["guardians"]
         assert "empathetic" in guidance.lower() or "sensitive" in guidance.lower()
 
+    def test_static_prefix_comes_first(self):
+        prompt = build_system_prompt("assets", {"testator": {"firstName": "John"}})
+        assert prompt.startswith(STATIC_PREFIX)
+
+    def test_section_prefix_is_stable_across_will_state(self):
+        first = build_system_prompt("assets", {})
+        second = build_system_prompt(
+            "assets",
+            {"testator": {"firstName": "Jane", "lastName": "Roe"}},
+            "- The user owns a boat.",
+        )
+        stable = first[: first.index("WILL DATA COLLECTED SO FAR")]
+        assert second.startswith(stable)
+        assert SECTION_PROMPTS["assets"] in stable
+
 
 # ---------------------------------------------------------------------------
 # format_will_summary tests
@@ -491,3 +509,50 @@ class TestOpenAIServiceExtract:
 
         call_kwargs = mock_parse.call_args.kwargs
         assert call_kwargs["temperature"] == 0.2
+
+
+class TestPromptCacheStats:
+    """Cached-token usage is accumulated from OpenAI usage reports."""
+
+    def test_records_cached_tokens(self):
+        stats = PromptCacheStats()
+        usage = MagicMock(prompt_tokens=2000)
+        usage.prompt_tokens_details.cached_tokens = 1536
+        stats.record(usage)
+        assert stats.stats() == {
+            "requests": 1,
+            "prompt_tokens": 2000,
+            "cached_tokens": 1536,
+            "cached_ratio": 0.768,
+        }
+
+    def test_ignores_missing_usage(self):
+        stats = PromptCacheStats()
+        stats.record(None)
+        assert stats.stats()["requests"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_requests_and_records_usage(self):
+        service = OpenAIService(api_key="test-key")
+
+        final_chunk = MagicMock()
+        final_chunk.choices = []
+        final_chunk.usage.prompt_tokens = 1200
+        final_chunk.usage.prompt_tokens_details.cached_tokens = 1024
+
+        async def mock_stream():
+            yield final_chunk
+
+        mock_create = AsyncMock(return_value=mock_stream())
+        service._client = MagicMock()
+        service._client.chat.completions.create = mock_create
+
+        stats = PromptCacheStats()
+        with patch("app.services.openai_service.prompt_cache_stats", stats):
+            async for _ in service.stream_response(
+                messages=[], section="assets", will_context={}
+            ):
+                pass
+
+        assert mock_create.call_args.kwargs["stream_options"] == {"include_usage": True}
+        assert stats.cached_tokens == 1024
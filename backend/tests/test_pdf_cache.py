@@ -0,0 +1,186 @@
+"""Unit tests for the content-addressed PDF cache.
+
+Covers:
+- compute_cache_key: sensitivity to HTML, clause versions, template mtimes
+- DiskLRUStore: round-trip, LRU eviction, persistence across instances,
+  file handles and move-in writes
+- DiskLRUStore: private directory permissions and per-will purging
+- PDFCache: hit/miss accounting, disabled mode and missing directory
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+
+import pytest
+
+from app.services.pdf_cache import (
+    DiskLRUStore,
+    PDFCache,
+    PDFCacheStore,
+    compute_cache_key,
+    template_fingerprint,
+)
+
+
+class TestComputeCacheKey:
+    """Keys change whenever any input that affects the PDF changes."""
+
+    def test_same_inputs_same_key(self):
+        a = compute_cache_key("<html/>", [("EXEC-01", 1)], "t:1")
+        b = compute_cache_key("<html/>", [("EXEC-01", 1)], "t:1")
+        assert a == b
+
+    def test_html_change_changes_key(self):
+        a = compute_cache_key("<html>a</html>", [], "")
+        b = compute_cache_key("<html>b</html>", [], "")
+        assert a != b
+
+    def test_clause_version_change_changes_key(self):
+        a = compute_cache_key("<html/>", [("EXEC-01", 1)], "")
+        b = compute_cache_key("<html/>", [("EXEC-01", 2)], "")
+        assert a != b
+
+    def test_clause_order_and_duplicates_ignored(self):
+        a = compute_cache_key("<html/>", [("A", 1), ("B", 1), ("B", 1)], "")
+        b = compute_cache_key("<html/>", [("B", 1), ("A", 1)], "")
+        assert a == b
+
+    def test_template_mtime_change_changes_key(self):
+        a = compute_cache_key("<html/>", [], "base.html:1")
+        b = compute_cache_key("<html/>", [], "base.html:2")
+        assert a != b
+
+
+class TestTemplateFingerprint:
+    def test_fingerprint_tracks_mtime(self, tmp_path):
+        tpl = tmp_path / "base.html"
+        tpl.write_text("<html/>")
+        os.utime(tpl, ns=(1_000_000_000, 1_000_000_000))
+        before = template_fingerprint(tmp_path)
+        os.utime(tpl, ns=(2_000_000_000, 2_000_000_000))
+        assert template_fingerprint(tmp_path) != before
+
+
+class TestDiskLRUStore:
+    def test_round_trip(self, tmp_path):
+        store = DiskLRUStore(tmp_path, max_bytes=1024)
+        store.put("k1", b"%PDF-1", "will-1")
+        assert store.get("k1") == b"%PDF-1"
+        assert store.get("missing") is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        store = DiskLRUStore(tmp_path, max_bytes=10)
+        store.put("a", b"aaaa", "will-1")
+        store.put("b", b"bbbb", "will-1")
+        store.get("a")  # a is now most recent
+        store.put("c", b"cccc", "will-1")  # exceeds 10 bytes -> evict b
+        assert store.get("b") is None
+        assert store.get("a") == b"aaaa"
+        assert store.get("c") == b"cccc"
+        assert store.size_bytes() <= 10
+
+    def test_oversized_entry_not_stored(self, tmp_path):
+        store = DiskLRUStore(tmp_path, max_bytes=4)
+        store.put("big", b"0123456789", "will-1")
+        assert store.get("big") is None
+        assert len(store) == 0
+
+    def test_reloads_existing_files(self, tmp_path):
+        DiskLRUStore(tmp_path, max_bytes=1024).put("k", b"data", "will-1")
+        fresh = DiskLRUStore(tmp_path, max_bytes=1024)
+        assert fresh.get("k") == b"data"
+
+    def test_sees_files_written_by_another_process(self, tmp_path):
+        server = DiskLRUStore(tmp_path, max_bytes=10)
+        assert server.get("warm") is None  # index built before the write
+        other = DiskLRUStore(tmp_path, max_bytes=10)
+        other.put("k", b"data", "will-1")
+        assert "k" in server
+        with server.open("k") as fh:
+            assert fh.read() == b"data"
+        assert server.size_bytes() == 4
+        server.put("big", b"bbbbbbbb", "will-2")  # adopted file counts
+        assert "k" not in server
+
+    def test_directories_are_private(self, tmp_path):
+        root = tmp_path / "cache"
+        DiskLRUStore(root, max_bytes=1024).put("k", b"data", "will-1")
+        assert stat.S_IMODE(root.stat().st_mode) == 0o700
+        assert stat.S_IMODE((root / "will-1").stat().st_mode) == 0o700
+
+    def test_purge_removes_only_that_owners_entries(self, tmp_path):
+        store = DiskLRUStore(tmp_path, max_bytes=1024)
+        store.put("a1", b"aaaa", "will-a")
+        store.put("a2", b"aaaa", "will-a")
+        store.put("b1", b"bbbb", "will-b")
+        assert store.purge("will-a") == 2
+        assert not (tmp_path / "will-a").exists()
+        assert store.get("a1") is None
+        assert store.get("b1") == b"bbbb"
+        assert store.size_bytes() == 4
+
+    def test_owners_survive_reload(self, tmp_path):
+        DiskLRUStore(tmp_path, max_bytes=1024).put("k", b"data", "will-1")
+        fresh = DiskLRUStore(tmp_path, max_bytes=1024)
+        assert fresh.purge("will-1") == 1
+
+    def test_store_interface_is_abstract(self):
+        with pytest.raises(TypeError):
+            PDFCacheStore()
+
+
+class TestPDFCache:
+    def test_counts_hits_and_misses(self, tmp_path):
+        cache = PDFCache(DiskLRUStore(tmp_path, max_bytes=1024))
+        assert cache.get("k") is None
+        cache.put("k", b"pdf", "will-1")
+        assert cache.get("k") == b"pdf"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+
+    def test_disabled_cache_never_stores(self, tmp_path):
+        cache = PDFCache(DiskLRUStore(tmp_path, max_bytes=1024), enabled=False)
+        cache.put("k", b"pdf", "will-1")
+        assert cache.get("k") is None
+        assert cache.stats()["misses"] == 0
+
+    def test_open_and_put_file(self, tmp_path):
+        cache = PDFCache(DiskLRUStore(tmp_path / "cache", max_bytes=1024))
+        src = tmp_path / "render.pdf"
+        src.write_bytes(b"%PDF-file")
+        assert cache.open("k") is None
+        cache.put_file("k", src, "will-1")
+        assert not src.exists()  # moved into the store
+        with cache.open("k") as fh:
+            assert fh.read() == b"%PDF-file"
+        assert cache.stats()["hits"] == 1
+
+    def test_open_handle_survives_eviction(self, tmp_path):
+        store = DiskLRUStore(tmp_path, max_bytes=8)
+        store.put("a", b"aaaa", "will-1")
+        fh = store.open("a")
+        store.put("b", b"bbbbbbbb", "will-1")  # evicts a
+        assert store.get("a") is None
+        with fh:
+            assert fh.read() == b"aaaa"
+
+    def test_disabled_cache_consumes_source(self, tmp_path):
+        cache = PDFCache(DiskLRUStore(tmp_path / "cache", max_bytes=1024), enabled=False)
+        src = tmp_path / "render.pdf"
+        src.write_bytes(b"%PDF")
+        cache.put_file("k", src, "will-1")
+        assert not src.exists()
+
+    def test_no_store_disables_cache(self, tmp_path):
+        cache = PDFCache(store=None)
+        src = tmp_path / "render.pdf"
+        src.write_bytes(b"%PDF")
+        cache.put_file("k", src, "will-1")
+        cache.purge("will-1")
+        assert not src.exists()
+        assert cache.open("k") is None
+        assert cache.stats()["enabled"] is False
@@ -0,0 +1,103 @@
+"""Unit tests for the shared PDF render engine's backpressure and timeouts.
+
+Rendering itself is patched out -- these tests exercise queue bounds,
+timeout handling, and counters without WeasyPrint. Only the pool recycling
+test starts real worker processes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.pdf_renderer import PDFRenderEngine
+
+
+def _slow_render(html_string: str, base_url: str) -> bytes:
+    time.sleep(0.2)
+    return b"%PDF-" + html_string.encode()
+
+
+def _hang() -> None:
+    time.sleep(30)
+
+
+def _ok() -> str:
+    return "ok"
+
+
+def _engine(**kwargs) -> PDFRenderEngine:
+    params = {"workers": 1, "queue_size": 0, "timeout": 5.0, "retry_after": 7}
+    params.update(kwargs)
+    engine = PDFRenderEngine(**params)
+    # Threads stand in for worker processes so the patched renderer applies.
+    engine._executor = ThreadPoolExecutor(max_workers=engine.workers)
+    return engine
+
+
+class TestPDFRenderEngine:
+    @pytest.mark.asyncio
+    async def test_render_returns_bytes(self):
+        engine = _engine()
+        with patch("app.services.pdf_renderer._render_pdf_sync", _slow_render):
+            pdf = await engine.render("x", base_url="/tmp")
+        assert pdf == b"%PDF-x"
+        assert engine.stats()["completed"] == 1
+        engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_returns_503_with_retry_after(self):
+        engine = _engine(workers=1, queue_size=0)
+        with patch("app.services.pdf_renderer._render_pdf_sync", _slow_render):
+            first = asyncio.create_task(engine.render("a", base_url="/tmp"))
+            await asyncio.sleep(0)
+            with pytest.raises(HTTPException) as exc_info:
+                await engine.render("b", base_url="/tmp")
+            await first
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "7"}
+        assert engine.stats()["rejected"] == 1
+        engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_504_and_frees_slot(self):
+        engine = _engine(timeout=0.05)
+        with patch("app.services.pdf_renderer._render_pdf_sync", _slow_render):
+            with pytest.raises(HTTPException) as exc_info:
+                await engine.render("a", base_url="/tmp")
+        assert exc_info.value.status_code == 504
+        assert engine.stats()["in_flight"] == 0
+        assert engine.stats()["timeouts"] == 1
+        engine.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_terminates_stuck_worker(self):
+        engine = PDFRenderEngine(workers=1, queue_size=0, timeout=0.5, retry_after=1)
+        pool = engine._get_executor()
+        pool.submit(_ok).result()  # start the worker
+        [worker] = pool._processes.values()
+        with pytest.raises(HTTPException) as exc_info:
+            await engine._submit(_hang)
+        assert exc_info.value.status_code == 504
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+        # The next job gets a fresh pool instead of queueing behind the hang
+        # (allowing for its new worker interpreter to start up)
+        engine._timeout = 30
+        assert await engine._submit(_ok) == "ok"
+        engine.shutdown()
+
+    def test_pool_does_not_fork_the_app_process(self):
+        engine = PDFRenderEngine(workers=1, queue_size=0, timeout=1, retry_after=1)
+        assert engine._get_executor()._mp_context.get_start_method() != "fork"
+        engine.shutdown()
+
+    def test_zero_workers_uses_available_cores(self):
+        engine = PDFRenderEngine(workers=0, queue_size=2, timeout=1, retry_after=1)
+        assert engine.workers >= 1
+        assert engine.stats()["max_in_flight"] == engine.workers + 2
@@ -0,0 +1,115 @@
+"""Unit tests for streaming PDF responses.
+
+Covers:
+- parse_range: open, closed, suffix, multi-range and unsatisfiable ranges
+- etag_matches: strong, weak, list and wildcard If-None-Match values
+- pdf_stream_response: 200 / 206 / 304 / 416 over a real file on disk
+"""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.services.pdf_stream import (
+    PDFDocument,
+    etag_matches,
+    make_etag,
+    parse_range,
+    pdf_stream_response,
+)
+
+_ETAG = make_etag("abc123")
+_PAYLOAD = b"%PDF-" + bytes(range(256)) * 600  # spans several chunks
+
+
+class TestParseRange:
+    def test_no_header_means_full_file(self):
+        assert parse_range(None, 100) is None
+
+    def test_closed_range(self):
+        assert parse_range("bytes=10-19", 100) == (10, 19)
+
+    def test_open_ended_range(self):
+        assert parse_range("bytes=90-", 100) == (90, 99)
+
+    def test_suffix_range(self):
+        assert parse_range("bytes=-10", 100) == (90, 99)
+
+    def test_end_clamped_to_size(self):
+        assert parse_range("bytes=50-500", 100) == (50, 99)
+
+    def test_multi_range_served_in_full(self):
+        assert parse_range("bytes=0-1,5-6", 100) is None
+
+    @pytest.mark.parametrize("header", ["bytes=100-", "bytes=20-10", "bytes=abc", "bytes=-0"])
+    def test_unsatisfiable(self, header):
+        with pytest.raises(ValueError):
+            parse_range(header, 100)
+
+
+class TestEtagMatches:
+    def test_exact_match(self):
+        assert etag_matches(_ETAG, _ETAG)
+
+    def test_weak_and_list(self):
+        assert etag_matches(f'"other", W/{_ETAG}', _ETAG)
+
+    def test_wildcard(self):
+        assert etag_matches("*", _ETAG)
+
+    def test_mismatch_and_missing(self):
+        assert not etag_matches('"other"', _ETAG)
+        assert not etag_matches(None, _ETAG)
+
+
+@pytest.fixture
+def client(tmp_path):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(_PAYLOAD)
+    app = FastAPI()
+
+    @app.get("/pdf")
+    async def serve(request: Request):
+        if etag_matches(request.headers.get("if-none-match"), _ETAG):
+            document = PDFDocument(etag=_ETAG, file=None)
+        else:
+            document = PDFDocument(etag=_ETAG, file=pdf_path.open("rb"))
+        return pdf_stream_response(request, document, "inline; filename=doc.pdf")
+
+    return TestClient(app)
+
+
+class TestPDFStreamResponse:
+    def test_full_download(self, client):
+        resp = client.get("/pdf")
+        assert resp.status_code == 200
+        assert resp.content == _PAYLOAD
+        assert resp.headers["content-length"] == str(len(_PAYLOAD))
+        assert resp.headers["etag"] == _ETAG
+        assert resp.headers["accept-ranges"] == "bytes"
+        assert "no-store" in resp.headers["cache-control"]
+
+    def test_partial_download(self, client):
+        resp = client.get("/pdf", headers={"Range": "bytes=100-199"})
+        assert resp.status_code == 206
+        assert resp.content == _PAYLOAD[100:200]
+        assert resp.headers["content-range"] == f"bytes 100-199/{len(_PAYLOAD)}"
+        assert resp.headers["content-length"] == "100"
+
+    def test_stale_if_range_sends_full_file(self, client):
+        resp = client.get("/pdf", headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+        assert resp.status_code == 200
+        assert resp.content == _PAYLOAD
+
+    def test_unsatisfiable_range(self, client):
+        resp = client.get("/pdf", headers={"Range": f"bytes={len(_PAYLOAD)}-"})
+        assert resp.status_code == 416
+        assert resp.headers["content-range"] == f"bytes */{len(_PAYLOAD)}"
+
+    def test_not_modified(self, client):
+        resp = client.get("/pdf", headers={"If-None-Match": _ETAG})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == _ETAG
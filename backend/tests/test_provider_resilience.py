@@ -0,0 +1,144 @@
+"""Unit tests for provider deadlines, retries and circuit breaking.
+
+Covers retryable error classification, retry-then-succeed, non-retryable
+errors, per-attempt deadlines, and the breaker's open / half-open / closed
+transitions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.provider_resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientProvider,
+    is_retryable,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Flaky:
+    """Fails with the given errors in order, then returns "ok"."""
+
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def _provider(**kwargs) -> ResilientProvider:
+    kwargs.setdefault("base_delay", 0.0)
+    return ResilientProvider("test", **kwargs)
+
+
+class TestIsRetryable:
+    def test_transient_errors(self):
+        assert is_retryable(asyncio.TimeoutError())
+        assert is_retryable(httpx.ConnectError("refused"))
+
+    def test_other_errors(self):
+        assert not is_retryable(ValueError("bad schema"))
+
+
+class TestResilientProvider:
+    @pytest.mark.asyncio
+    async def test_retries_transient_failure(self):
+        provider = _provider(max_attempts=3)
+        call = _Flaky(httpx.ConnectError("refused"))
+        assert await provider.call(call) == "ok"
+        assert call.calls == 2
+        assert provider.stats()["retries"] == 1
+        assert provider.breaker.state == CLOSED
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_is_raised_at_once(self):
+        provider = _provider(max_attempts=3)
+        call = _Flaky(ValueError("bad request"))
+        with pytest.raises(ValueError):
+            await provider.call(call)
+        assert call.calls == 1
+        assert provider.breaker.consecutive_failures == 0
+
+    @pytest.mark.asyncio
+    async def test_non_retryable_error_leaves_breaker_alone(self):
+        provider = _provider(max_attempts=1, breaker=CircuitBreaker(failure_threshold=2))
+        with pytest.raises(httpx.ConnectError):
+            await provider.call(_Flaky(httpx.ConnectError("down")))
+        with pytest.raises(ValueError):
+            await provider.call(_Flaky(ValueError("bad request")))
+        assert provider.breaker.consecutive_failures == 1
+        with pytest.raises(httpx.ConnectError):
+            await provider.call(_Flaky(httpx.ConnectError("down")))
+        assert provider.breaker.state == OPEN
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancels_slow_attempt(self):
+        provider = _provider(timeout=0.01, max_attempts=1)
+
+        async def _slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await provider.call(_slow)
+        assert provider.stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self):
+        provider = _provider(max_attempts=1, breaker=CircuitBreaker(failure_threshold=2))
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectError):
+                await provider.call(_Flaky(httpx.ConnectError("down")))
+        call = _Flaky()
+        with pytest.raises(CircuitOpenError):
+            await provider.call(call)
+        assert call.calls == 0
+        assert provider.stats()["state"] == OPEN
+        assert provider.stats()["rejected"] == 1
+
+
+class TestCircuitBreaker:
+    def test_half_open_probe_closes_or_reopens(self):
+        clock = _Clock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+        assert breaker.state == OPEN and not breaker.allow()
+
+        clock.now = 10
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()  # only one probe at a time
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.times_opened == 2
+
+        clock.now = 20
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == CLOSED and breaker.allow()
+
+    def test_cancelled_probe_is_released(self):
+        clock = _Clock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0, clock=clock)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.release()
+        assert breaker.allow()
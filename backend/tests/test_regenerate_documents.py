@@ -0,0 +1,112 @@
+"""Unit tests for the bulk document regeneration script.
+
+Covers:
+- wills_using_clauses: SQL predicates mirror CLAUSE_ORDER conditions
+- Checkpoint: resume skips wills already regenerated; names follow
+  clause versions
+- percentile / argument parsing helpers
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.document_service import wills_using_clauses
+from scripts.regenerate_documents import (
+    Checkpoint,
+    _parse_args,
+    default_checkpoint_path,
+    percentile,
+)
+
+
+def _compile(codes: set[str]):
+    return wills_using_clauses(codes).compile(dialect=postgresql.dialect())
+
+
+def _sql(codes: set[str]) -> str:
+    return str(_compile(codes))
+
+
+class TestWillsUsingClauses:
+    def test_always_included_clause_matches_every_will(self):
+        assert _sql({"REVOC-01"}) == "true"
+
+    def test_scenario_clause_uses_containment(self):
+        compiled = _compile({"TRUST-01"})
+        assert "wills.scenarios @>" in str(compiled)
+        assert ["testamentary_trust"] in compiled.params.values()
+
+    def test_each_clause_checks_array_length(self):
+        assert "jsonb_array_length(wills.bequests) >" in _sql({"BENEF-01"})
+
+    def test_business_type_filter(self):
+        compiled = _compile({"BUS-02"})
+        assert "wills.business_assets @>" in str(compiled)
+        assert [{"business_type": "company_shares"}] in compiled.params.values()
+
+    def test_nested_has_condition(self):
+        assert "wills.executor #>" in _sql({"EXEC-02"})
+
+    def test_has_condition_treats_empty_json_as_absent(self):
+        # Python's bool() check is false for {} and [], so SQL must be too
+        compiled = _compile({"EXEC-02"})
+        falsy = next(v for v in compiled.params.values() if isinstance(v, list))
+        assert {"{}", "[]", '""', "false", "0", "null"} <= set(falsy)
+
+    def test_multiple_codes_are_ored(self):
+        sql = _sql({"GUARD-01", "USUF-01"})
+        assert " OR " in sql
+
+    def test_unknown_code_matches_nothing(self):
+        assert _sql({"NOPE-99"}) == "false"
+
+
+class TestCheckpoint:
+    def test_resume_reads_completed_ids(self, tmp_path):
+        path = tmp_path / "run.checkpoint"
+        first, second = uuid.uuid4(), uuid.uuid4()
+        checkpoint = Checkpoint(path)
+        checkpoint.mark_done(first)
+        checkpoint.mark_done(second)
+
+        resumed = Checkpoint(path)
+        resumed.load()
+        assert resumed.done == {str(first), str(second)}
+
+    def test_remove_deletes_file(self, tmp_path):
+        path = tmp_path / "run.checkpoint"
+        checkpoint = Checkpoint(path)
+        checkpoint.mark_done(uuid.uuid4())
+        checkpoint.remove()
+        assert not path.exists()
+        assert checkpoint.done == set()
+
+    def test_default_path_follows_clause_versions(self):
+        first = default_checkpoint_path({"EXEC-01": 2, "BENEF-02": 1})
+        assert first.name == "regenerate-BENEF-02.v1-EXEC-01.v2.checkpoint"
+        assert default_checkpoint_path({"EXEC-01": 3, "BENEF-02": 1}) != first
+
+    def test_missing_file_starts_empty(self, tmp_path):
+        checkpoint = Checkpoint(tmp_path / "absent.checkpoint")
+        checkpoint.load()
+        assert checkpoint.done == set()
+
+
+class TestHelpers:
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 95) == 95.0
+        assert percentile([0.3], 95) == 0.3
+        assert percentile([], 95) == 0.0
+
+    def test_checkpoint_defaults_to_version_keyed_path(self):
+        args = _parse_args(["EXEC-01", "BENEF-02"])
+        assert args.checkpoint is None
+
+    def test_rejects_unknown_codes(self):
+        with pytest.raises(SystemExit):
+            _parse_args(["NOPE-99"])
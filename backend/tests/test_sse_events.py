@@ -0,0 +1,92 @@
+"""Unit tests for SSE delta coalescing and pre-serialised events.
+
+Covers:
+- delta_event / DONE_EVENT: payloads match the json.dumps format the
+  frontend parses
+- DeltaCoalescer: size budget, time window, pass-through mode, errors
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.sse_events import DONE_EVENT, DeltaCoalescer, delta_event
+
+
+async def _chunks(items, delay: float = 0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+async def _collect(coalescer: DeltaCoalescer, source) -> list[str]:
+    return [text async for text in coalescer.coalesce(source)]
+
+
+class TestEventPayloads:
+    @pytest.mark.parametrize("text", ["hello", 'quote " and \\ slash', "naïve ✓", "\n"])
+    def test_delta_matches_json_dumps(self, text):
+        event = delta_event(text)
+        assert event["event"] == "delta"
+        assert event["data"] == json.dumps({"content": text})
+
+    def test_done_event(self):
+        assert json.loads(DONE_EVENT["data"]) == {"complete": True}
+
+
+class TestDeltaCoalescer:
+    @pytest.mark.asyncio
+    async def test_fast_chunks_are_batched(self):
+        coalescer = DeltaCoalescer(window=0.05, max_chars=10_000)
+        out = await _collect(coalescer, _chunks(["a"] * 100))
+        assert "".join(out) == "a" * 100
+        assert len(out) < 5
+        assert coalescer.stats()["chunks_in"] == 100
+
+    @pytest.mark.asyncio
+    async def test_size_budget_flushes(self):
+        coalescer = DeltaCoalescer(window=10.0, max_chars=4)
+        out = await _collect(coalescer, _chunks(["ab", "cd", "ef", "g"]))
+        assert out == ["abcd", "efg"]
+
+    @pytest.mark.asyncio
+    async def test_window_flushes_while_source_stalls(self):
+        coalescer = DeltaCoalescer(window=0.01, max_chars=10_000)
+
+        async def _stalling():
+            yield "first"
+            await asyncio.sleep(0.1)
+            yield "second"
+
+        received: list[tuple[str, float]] = []
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async for text in coalescer.coalesce(_stalling()):
+            received.append((text, loop.time() - start))
+        assert [t for t, _ in received] == ["first", "second"]
+        # "first" was released by the window, not held until "second" arrived.
+        assert received[0][1] < 0.08
+
+    @pytest.mark.asyncio
+    async def test_zero_window_passes_through(self):
+        coalescer = DeltaCoalescer(window=0, max_chars=512)
+        out = await _collect(coalescer, _chunks(["a", "b", "c"]))
+        assert out == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_source_error_propagates_after_buffered_text(self):
+        coalescer = DeltaCoalescer(window=10.0, max_chars=2)
+
+        async def _failing():
+            yield "ok"
+            raise RuntimeError("upstream failed")
+
+        out: list[str] = []
+        with pytest.raises(RuntimeError):
+            async for text in coalescer.coalesce(_failing()):
+                out.append(text)
+        assert out == ["ok"]
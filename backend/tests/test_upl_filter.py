@@ -1,13 +1,19 @@
 """Unit tests for UPLFilterService.
 
-Covers ALLOW, REPLACE, BLOCK, and REFER actions as well as edge cases.
+Covers ALLOW, REPLACE, BLOCK, and REFER actions as well as edge cases,
+plus the incremental StreamingUPLScanner used while responses stream.
 """
 
 from __future__ import annotations
 
 import pytest
 
-from app.services.upl_filter import FALLBACK_MESSAGE, FilterAction, UPLFilterService
+from app.services.upl_filter import (
+    FALLBACK_MESSAGE,
+    FilterAction,
+    StreamingUPLScanner,
+    UPLFilterService,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -265,3 +271,84 @@ class TestAuditLogging:
             context={"category": "beneficiary"},
         )
         mock_audit_service.log_event.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# Streaming scanner
+# ---------------------------------------------------------------------------
+
+
+def _split(text: str, size: int = 3) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class _Source:
+    """Async chunk source that records how far it was consumed."""
+
+    def __init__(self, chunks: list[str]) -> None:
+        self._chunks = chunks
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        if self.consumed >= len(self._chunks):
+            raise StopAsyncIteration
+        self.consumed += 1
+        return self._chunks[self.consumed - 1]
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+async def _released(scanner: StreamingUPLScanner, source: _Source) -> str:
+    return "".join([text async for text in scanner.filter_stream(source)])
+
+
+class TestStreamingScanner:
+    @pytest.mark.asyncio
+    async def test_safe_text_is_released_in_full(self):
+        text = "The executor manages the estate and pays debts. " * 5
+        scanner = StreamingUPLScanner(holdback=16)
+        assert await _released(scanner, _Source(_split(text))) == text
+        assert scanner.text == text
+        assert not scanner.flagged
+
+    @pytest.mark.asyncio
+    async def test_advice_is_never_released(self):
+        text = "Some context first. " * 4 + "I recommend that you leave the house to Sarah."
+        scanner = StreamingUPLScanner(holdback=32)
+        released = await _released(scanner, _Source(_split(text)))
+        assert "recommend" not in released
+        assert scanner.advice_matches == ["personal_recommendation"]
+        assert scanner.text == text  # full text kept for the final filter
+
+    @pytest.mark.asyncio
+    async def test_attorney_pattern_aborts_stream(self):
+        chunks = _split("Let us discuss estate duty now. " + "padding " * 50)
+        source = _Source(chunks)
+        scanner = StreamingUPLScanner(holdback=32)
+        released = await _released(scanner, source)
+        assert "estate duty" not in released
+        assert scanner.aborted
+        assert scanner.attorney_matches == ["estate_duty"]
+        assert source.consumed < len(chunks)
+        assert source.closed
+
+    @pytest.mark.asyncio
+    async def test_attorney_pattern_after_advice_still_aborts(self):
+        text = "You should include a trust. Also consider estate duty. " + "x" * 200
+        source = _Source(_split(text))
+        scanner = StreamingUPLScanner(holdback=32)
+        await _released(scanner, source)
+        assert scanner.advice_matches
+        assert scanner.aborted
+
+    @pytest.mark.asyncio
+    async def test_pattern_split_across_chunks_is_caught(self):
+        scanner = StreamingUPLScanner(holdback=32)
+        released = await _released(scanner, _Source(["As your law", "yer, I can help."]))
+        assert released == ""
+        assert scanner.advice_matches == ["role_claim"]
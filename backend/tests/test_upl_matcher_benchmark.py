@@ -0,0 +1,120 @@
+"""Equivalence checks and micro-benchmark for the UPL multi-pattern matcher.
+
+The benchmark compares MultiPatternMatcher against the naive approach of
+searching every compiled pattern in turn, and reports how scan time grows
+with text length and with the number of patterns. Timings are noisy on
+shared machines, so the benchmark only prints them and is skipped unless
+RUN_BENCHMARKS is set:
+
+    RUN_BENCHMARKS=1 python -m pytest tests/test_upl_matcher_benchmark.py -s
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+import time
+
+import pytest
+
+from app.services.pattern_matcher import MultiPatternMatcher, literal_anchors
+from app.services.upl_filter import _ADVICE_PATTERNS, _ATTORNEY_REQUIRED_PATTERNS
+
+_ALL_PATTERNS = _ATTORNEY_REQUIRED_PATTERNS + _ADVICE_PATTERNS
+
+_CLEAN = (
+    "Your executor will gather the assets of your estate, settle any debts "
+    "and distribute what remains to your beneficiaries as set out in the will. "
+)
+_SAMPLES = [
+    "I recommend that you leave the house to your daughter.",
+    "You should definitely include a residue clause.",
+    "Consider the tax implications and estate duty.",
+    "A business valuation is needed. Legally, you must sign.",
+    "In my legal opinion, as your attorney, the best approach is a trust.",
+    "An inter vivos trust or fideicommissum may lead to litigation.",
+    "Nothing to see here.",
+    "THE BEST WAY IS to consult an OFFSHORE TRUST expert.",
+]
+
+
+def _naive(text: str, patterns: list[tuple[str, re.Pattern]]) -> list[str]:
+    return [name for name, regex in patterns if regex.search(text)]
+
+
+def _time_per_call(fn, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def _synthetic_patterns(count: int) -> list[tuple[str, re.Pattern]]:
+    """UPL patterns padded with realistic extra keyword patterns."""
+    extra = [
+        (f"extra_{i}", re.compile(rf"keyword{i}\s+(?:clause|term)", re.IGNORECASE))
+        for i in range(max(count - len(_ALL_PATTERNS), 0))
+    ]
+    return (_ALL_PATTERNS + extra)[:count]
+
+
+class TestEquivalence:
+    @pytest.mark.parametrize("text", _SAMPLES + [_CLEAN * 3])
+    def test_same_results_as_naive_scan(self, text):
+        matcher = MultiPatternMatcher(_ALL_PATTERNS)
+        assert matcher.match(text) == _naive(text, _ALL_PATTERNS)
+
+    def test_overlapping_patterns_all_reported(self):
+        matcher = MultiPatternMatcher(_ALL_PATTERNS)
+        matched = matcher.match("We need a business valuation.")
+        assert "business_succession" in matched
+        assert "business_valuation" in matched
+
+    def test_anchor_extraction(self):
+        assert literal_anchors(re.compile(r"estate\s+duty", re.I)) == {"estate"}
+        assert literal_anchors(re.compile(r"a|court\s+order")) is None
+        assert literal_anchors(re.compile(r"(?:x|y)\s+z")) is None
+
+    def test_ignorecase_folding_beyond_lower(self):
+        # re.IGNORECASE folds U+017F (long s) to "s"; str.lower() does not
+        text = "Consider e\u017ftate duty."
+        matcher = MultiPatternMatcher(_ALL_PATTERNS)
+        assert "estate_duty" in matcher.match(text)
+        assert matcher.match(text) == _naive(text, _ALL_PATTERNS)
+        assert literal_anchors(re.compile("e\u017ftate", re.I)) is None
+
+    @pytest.mark.parametrize("count", [50, 200])
+    def test_same_results_with_many_patterns(self, count):
+        patterns = _synthetic_patterns(count)
+        text = _CLEAN * 5 + "keyword7 clause"
+        assert MultiPatternMatcher(patterns).match(text) == _naive(text, patterns)
+
+    def test_pattern_without_anchor_always_confirmed(self):
+        matcher = MultiPatternMatcher([("digits", re.compile(r"\d+"))])
+        assert matcher.match("call 123") == ["digits"]
+        assert matcher.match("no numbers") == []
+
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1")
+class TestBenchmark:
+    def test_scaling_with_text_length(self):
+        matcher = MultiPatternMatcher(_ALL_PATTERNS)
+        print("\nchars      naive_ms   matcher_ms")
+        for repeats in (1, 10, 100):
+            text = _CLEAN * repeats
+            naive = _time_per_call(lambda t: _naive(t, _ALL_PATTERNS), text, 20)
+            fast = _time_per_call(matcher.match, text, 20)
+            print(f"{len(text):<10} {naive * 1e3:<10.3f} {fast * 1e3:.3f}")
+            assert matcher.match(text) == _naive(text, _ALL_PATTERNS)
+
+    def test_scaling_with_pattern_count(self):
+        text = _CLEAN * 20
+        print("\npatterns   naive_ms   matcher_ms")
+        for count in (len(_ALL_PATTERNS), 50, 200):
+            patterns = _synthetic_patterns(count)
+            matcher = MultiPatternMatcher(patterns)
+            naive = _time_per_call(functools.partial(_naive, patterns=patterns), text, 10)
+            fast = _time_per_call(matcher.match, text, 10)
+            print(f"{count:<10} {naive * 1e3:<10.3f} {fast * 1e3:.3f}")
+            assert matcher.match(text) == _naive(text, patterns)
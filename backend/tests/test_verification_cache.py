@@ -0,0 +1,146 @@
+"""Tests for replaying verification results of unchanged wills.
+
+Covers canonical will-data hashing and the SSE replay path of
+VerificationService.run_verification, including the ``force`` bypass.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models.will import Will
+from app.schemas.verification import VerificationResult
+from app.services.verification_hedge import HedgeOutcome
+from app.services.verification_service import (
+    VerificationService,
+    canonical_will_json,
+    will_data_hash,
+)
+
+_RESULT = {
+    "overall_status": "pass",
+    "sections": [{"section": "testator", "status": "pass", "issues": []}],
+    "attorney_referral": {"recommended": False, "reasons": []},
+    "summary": "All good.",
+}
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+class _Session:
+    def __init__(self, will):
+        self._will = will
+
+    async def exec(self, statement):
+        return _Result(self._will)
+
+    def add(self, obj):
+        pass
+
+    async def flush(self):
+        pass
+
+
+def _will() -> Will:
+    return Will(
+        user_id=uuid.uuid4(),
+        testator={"firstName": "John", "lastName": "Doe"},
+        beneficiaries=[{"fullName": "Sarah Doe", "sharePercent": 100}],
+        executor={"name": "Sarah Doe"},
+    )
+
+
+async def _no_extraction(will):
+    return
+    yield  # Unreachable; makes this an async generator
+
+
+async def _events(service, will, **kwargs):
+    return [e async for e in service.run_verification(will.id, will.user_id, **kwargs)]
+
+
+def _steps(events):
+    return [json.loads(e["data"]).get("step") for e in events if e["event"] == "check"]
+
+
+class TestWillDataHash:
+    def test_key_order_does_not_matter(self):
+        assert canonical_will_json({"b": 1, "a": {"y": 2, "x": 1}}) == canonical_will_json(
+            {"a": {"x": 1, "y": 2}, "b": 1}
+        )
+        assert will_data_hash({"b": 1, "a": 2}) == will_data_hash({"a": 2, "b": 1})
+
+    def test_value_change_changes_hash(self):
+        assert will_data_hash({"a": [1, 2]}) != will_data_hash({"a": [2, 1]})
+
+
+class TestVerificationReplay:
+    @pytest.mark.asyncio
+    async def test_unchanged_will_replays_stored_result(self):
+        will = _will()
+        service = VerificationService(_Session(will))
+        will.verification_result = _RESULT
+        will.verification_hash = will_data_hash(service._collect_will_data(will))
+        service._extract_missing_sections = _no_extraction
+        run = AsyncMock()
+
+        with patch("app.services.verification_service.verification_hedge.run", run):
+            events = await _events(service, will)
+
+        assert _steps(events) == ["collecting_data", "cached"]
+        assert [e["event"] for e in events][-2:] == ["section_result", "done"]
+        assert json.loads(events[-1]["data"]) == VerificationResult.model_validate(_RESULT).model_dump()
+        run.assert_not_called()
+        assert will.status == "verified"
+
+    @pytest.mark.asyncio
+    async def test_newly_extracted_section_is_reverified(self):
+        will = _will()
+        service = VerificationService(_Session(will))
+        will.verification_result = _RESULT
+        will.verification_hash = will_data_hash(service._collect_will_data(will))
+
+        async def _extract_guardians(will):
+            will.guardians = [{"name": "Mary Doe"}]
+            return
+            yield
+
+        service._extract_missing_sections = _extract_guardians
+        fresh = VerificationResult.model_validate(_RESULT)
+        run = AsyncMock(return_value=(fresh, HedgeOutcome("gemini", False)))
+
+        with patch("app.services.verification_service.verification_hedge.run", run):
+            events = await _events(service, will)
+
+        assert "cached" not in _steps(events)
+        run.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_changed_or_forced_will_is_reverified(self):
+        will = _will()
+        service = VerificationService(_Session(will))
+        will.verification_result = _RESULT
+        will.verification_hash = "stale"
+        service._extract_missing_sections = _no_extraction
+        fresh = VerificationResult.model_validate(_RESULT)
+        run = AsyncMock(return_value=(fresh, HedgeOutcome("gemini", False)))
+
+        with patch("app.services.verification_service.verification_hedge.run", run):
+            events = await _events(service, will)
+            assert "cached" not in _steps(events)
+            assert will.verification_hash == will_data_hash(service._collect_will_data(will))
+
+            events = await _events(service, will, force=True)
+            assert "cached" not in _steps(events)
+
+        assert run.await_count == 2
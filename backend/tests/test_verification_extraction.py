@@ -0,0 +1,200 @@
+"""Tests for concurrent and batched pre-verification extraction.
+
+Covers ConversationService.extract_sections (bounded concurrency,
+completion-order results, error isolation), extract_sections_batched (one
+call for all sections), and the single will update of
+save_extracted_sections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.will import Will
+from app.prompts.extraction import (
+    ExtractedBeneficiary,
+    ExtractedExecutor,
+    ExtractedWillData,
+    format_section_transcripts,
+)
+from app.services.conversation_service import ConversationService
+from app.services.extraction_cache import extraction_cache
+
+
+class _Session:
+    def __init__(self):
+        self.flushes = 0
+
+    def add(self, obj):
+        pass
+
+    async def flush(self):
+        self.flushes += 1
+
+
+class _Extractor:
+    """Fake OpenAI extraction with per-section delays and a concurrency probe."""
+
+    def __init__(self, delays: dict[str, float], failing: set[str] = frozenset()):
+        self.delays = delays
+        self.failing = failing
+        self.active = 0
+        self.peak = 0
+
+    async def extract_will_data(self, conversation_history, latest_message):
+        section = latest_message
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays[section])
+        finally:
+            self.active -= 1
+        if section in self.failing:
+            raise RuntimeError(f"{section} failed")
+        return ExtractedWillData()
+
+
+def _service(extractor, sections_with_messages):
+    service = ConversationService(_Session(), openai_service=extractor, upl_filter=None)
+
+    async def extraction_input(will_id, section):
+        if section not in sections_with_messages:
+            return None
+        # Unique fingerprint per call so the per-section cache never hits
+        history = [{"role": "user", "content": section}]
+        return history, section, uuid.uuid4().hex
+
+    service._extraction_input = extraction_input
+    return service
+
+
+async def _collect(service, sections, concurrency):
+    return [
+        item
+        async for item in service.extract_sections(uuid.uuid4(), sections, concurrency)
+    ]
+
+
+class TestExtractSections:
+    @pytest.fixture(autouse=True)
+    def _clean_cache(self):
+        extraction_cache.clear()
+        yield
+        extraction_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_results_arrive_in_completion_order(self):
+        extractor = _Extractor({"assets": 0.05, "executor": 0.0, "residue": 0.02})
+        service = _service(extractor, {"assets", "executor", "residue"})
+        results = await _collect(service, ["assets", "executor", "residue"], 3)
+        assert [section for section, _, _ in results] == ["executor", "residue", "assets"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        sections = ["a", "b", "c", "d", "e"]
+        extractor = _Extractor({s: 0.01 for s in sections})
+        service = _service(extractor, set(sections))
+        await _collect(service, sections, 2)
+        assert extractor.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_and_empty_sections_are_reported(self):
+        extractor = _Extractor({"assets": 0.0, "executor": 0.0}, failing={"assets"})
+        service = _service(extractor, {"assets", "executor"})
+        results = {s: (data, err) for s, data, err in await _collect(
+            service, ["assets", "executor", "guardians"], 3
+        )}
+        assert isinstance(results["assets"][1], RuntimeError)
+        assert results["executor"][0] is not None
+        assert results["guardians"] == (None, None)
+
+
+class TestExtractSectionsBatched:
+    @pytest.fixture(autouse=True)
+    def _clean_cache(self):
+        extraction_cache.clear()
+        yield
+        extraction_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_one_call_fans_out_to_sections_with_messages(self):
+        combined = ExtractedWillData(executor=ExtractedExecutor(name="ABC Trust"))
+        extractor = MagicMock()
+        extractor.extract_will_data_multi = AsyncMock(return_value=combined)
+        service = _service(extractor, {"beneficiaries", "executor"})
+
+        results = await service.extract_sections_batched(
+            uuid.uuid4(), ["beneficiaries", "executor", "guardians"]
+        )
+
+        assert results == {"beneficiaries": combined, "executor": combined}
+        extractor.extract_will_data_multi.assert_awaited_once()
+        histories = extractor.extract_will_data_multi.call_args.args[0]
+        assert list(histories) == ["beneficiaries", "executor"]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_conversations_hit_the_cache(self):
+        extractor = MagicMock()
+        extractor.extract_will_data_multi = AsyncMock(return_value=ExtractedWillData())
+        service = _service(extractor, {"assets"})
+        will_id = uuid.uuid4()
+        await service.extract_sections_batched(will_id, ["assets"])
+        await service.extract_sections_batched(will_id, ["assets"])
+        extractor.extract_will_data_multi.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unparsed_result_raises_and_is_not_cached(self):
+        extractor = MagicMock()
+        extractor.extract_will_data_multi = AsyncMock(side_effect=[None, ExtractedWillData()])
+        service = _service(extractor, {"assets"})
+        will_id = uuid.uuid4()
+        with pytest.raises(RuntimeError):
+            await service.extract_sections_batched(will_id, ["assets"])
+        results = await service.extract_sections_batched(will_id, ["assets"])
+        assert results == {"assets": ExtractedWillData()}
+        assert extractor.extract_will_data_multi.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_no_conversations_makes_no_call(self):
+        extractor = MagicMock()
+        extractor.extract_will_data_multi = AsyncMock()
+        service = _service(extractor, set())
+        assert await service.extract_sections_batched(uuid.uuid4(), ["assets"]) == {}
+        extractor.extract_will_data_multi.assert_not_called()
+
+    def test_transcript_labels_each_section(self):
+        text = format_section_transcripts({
+            "assets": [{"role": "user", "content": "A house"}],
+            "executor": [{"role": "assistant", "content": "Who?"}],
+        })
+        assert text == (
+            "=== SECTION: assets ===\nUSER: A house\n\n"
+            "=== SECTION: executor ===\nASSISTANT: Who?"
+        )
+
+
+class TestSaveExtractedSections:
+    @pytest.mark.asyncio
+    async def test_single_update_for_all_sections(self):
+        session = _Session()
+        service = ConversationService(session, openai_service=MagicMock(), upl_filter=None)
+        will = Will(user_id=uuid.uuid4())
+        changed = await service.save_extracted_sections(
+            will,
+            {
+                "beneficiaries": ExtractedWillData(
+                    beneficiaries=[ExtractedBeneficiary(full_name="Sarah", relationship="daughter")]
+                ),
+                "executor": ExtractedWillData(
+                    executor=ExtractedExecutor(name="ABC Trust")
+                ),
+                "assets": ExtractedWillData(),
+            },
+        )
+        assert changed == ["beneficiaries", "executor"]
+        assert will.beneficiaries[0]["full_name"] == "Sarah"
+        assert session.flushes == 1
@@ -0,0 +1,131 @@
+"""Unit tests for hedged dual-provider verification.
+
+Covers first-wins selection, cancellation of the losing call, immediate
+fallback on primary failure, the histogram-driven hedge delay, and the
+plain-fallback mode when hedging is disabled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.verification_hedge import HedgedVerifier, LatencyHistogram
+
+
+def _provider(result: str, delay: float = 0.0, error: Exception | None = None):
+    state = {"started": False, "cancelled": False}
+
+    async def call():
+        state["started"] = True
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        if error is not None:
+            raise error
+        return result
+
+    return call, state
+
+
+class TestLatencyHistogram:
+    def test_quantile_uses_bucket_bounds(self):
+        histogram = LatencyHistogram(buckets=(1.0, 2.0, 5.0))
+        for seconds in (0.5, 0.7, 1.5, 4.0):
+            histogram.record(seconds)
+        assert histogram.quantile(0.5) == 1.0
+        assert histogram.quantile(0.9) == 5.0
+
+    def test_overflow_reports_last_bound(self):
+        histogram = LatencyHistogram(buckets=(1.0,))
+        histogram.record(30.0)
+        assert histogram.quantile(0.9) == 1.0
+        assert histogram.stats()["buckets"]["gt_max"] == 1
+
+    def test_empty(self):
+        assert LatencyHistogram().quantile(0.5) is None
+
+
+class TestHedgedVerifier:
+    @pytest.mark.asyncio
+    async def test_fast_primary_never_starts_backup(self):
+        verifier = HedgedVerifier(default_delay=0.5)
+        primary, _ = _provider("gemini-result")
+        backup, backup_state = _provider("openai-result")
+        result, outcome = await verifier.run(("gemini", primary), ("openai", backup))
+        assert result == "gemini-result"
+        assert outcome.provider == "gemini"
+        assert not outcome.backup_started
+        assert not backup_state["started"]
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        verifier = HedgedVerifier(default_delay=0.01)
+        primary, primary_state = _provider("gemini-result", delay=5.0)
+        backup, _ = _provider("openai-result")
+        result, outcome = await verifier.run(("gemini", primary), ("openai", backup))
+        await asyncio.sleep(0)
+        assert result == "openai-result"
+        assert outcome.backup_started
+        assert primary_state["cancelled"]
+        assert verifier.stats()["hedges_started"] == 1
+
+    @pytest.mark.asyncio
+    async def test_primary_can_still_win_after_hedge(self):
+        verifier = HedgedVerifier(default_delay=0.01)
+        primary, _ = _provider("gemini-result", delay=0.05)
+        backup, backup_state = _provider("openai-result", delay=5.0)
+        result, outcome = await verifier.run(("gemini", primary), ("openai", backup))
+        await asyncio.sleep(0)
+        assert result == "gemini-result"
+        assert outcome.backup_started
+        assert backup_state["cancelled"]
+
+    @pytest.mark.asyncio
+    async def test_primary_failure_falls_back_immediately(self):
+        verifier = HedgedVerifier(default_delay=10.0)
+        primary, _ = _provider("", error=RuntimeError("quota"))
+        backup, _ = _provider("openai-result")
+        result, outcome = await asyncio.wait_for(
+            verifier.run(("gemini", primary), ("openai", backup)), timeout=1.0
+        )
+        assert result == "openai-result"
+        assert outcome.primary_error == "quota"
+        assert verifier.stats()["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_failures_raise_last_error(self):
+        verifier = HedgedVerifier(default_delay=0.01)
+        primary, _ = _provider("", error=RuntimeError("gemini down"))
+        backup, _ = _provider("", error=RuntimeError("openai down"))
+        with pytest.raises(RuntimeError, match="openai down"):
+            await verifier.run(("gemini", primary), ("openai", backup))
+
+    @pytest.mark.asyncio
+    async def test_disabled_waits_for_primary(self):
+        verifier = HedgedVerifier(enabled=False)
+        primary, _ = _provider("gemini-result", delay=0.05)
+        backup, backup_state = _provider("openai-result")
+        result, _ = await verifier.run(("gemini", primary), ("openai", backup))
+        assert result == "gemini-result"
+        assert not backup_state["started"]
+
+    @pytest.mark.asyncio
+    async def test_no_backup_raises_primary_error(self):
+        verifier = HedgedVerifier()
+        primary, _ = _provider("", error=RuntimeError("no key"))
+        with pytest.raises(RuntimeError, match="no key"):
+            await verifier.run(("gemini", primary), None)
+
+    def test_delay_follows_primary_histogram(self):
+        verifier = HedgedVerifier(default_delay=8.0, quantile=0.9, min_delay=2.0, max_delay=20.0)
+        assert verifier.hedge_delay("gemini") == 8.0
+        for _ in range(30):
+            verifier._histogram("gemini").record(2.5)
+        assert verifier.hedge_delay("gemini") == 3.0
+        for _ in range(300):
+            verifier._histogram("gemini").record(100.0)
+        assert verifier.hedge_delay("gemini") == 20.0
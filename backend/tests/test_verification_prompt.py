@@ -0,0 +1,135 @@
+"""Tests for the verification prompt compiler.
+
+Covers pruning of empty will data, scenario-dependent rule and referral
+trigger selection, exclusion of locally decided rules, that the
+compiled prompt is smaller than the full one, and that prompt size stats
+are counted off the event loop.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from app.prompts.verification import (
+    applicable_referral_triggers,
+    applicable_rule_codes,
+    build_verification_prompt,
+    compile_verification_prompt,
+)
+from app.services.token_budget import count_tokens
+from app.services import verification_service
+from app.services.verification_rules import LOCAL_RULE_CODES
+
+
+def _basic_will() -> dict:
+    return {
+        "testator": {"firstName": "John", "lastName": "Doe", "phone": None},
+        "marital": {"status": "single"},
+        "beneficiaries": [{"fullName": "Sarah Doe", "relationship": "daughter"}],
+        "assets": [],
+        "guardians": [],
+        "executor": {"name": "Sarah Doe"},
+        "bequests": [],
+        "residue": {"beneficiaries": [{"name": "Sarah Doe", "sharePercent": 100}]},
+        "trust_provisions": {},
+        "usufruct": {},
+        "business_assets": [],
+        "joint_will": {},
+        "scenarios": [],
+        "will_type": "basic",
+        "sections_complete": {},
+    }
+
+
+class TestRuleSelection:
+    def test_basic_will_omits_scenario_rules(self):
+        will = _basic_will()
+        will["beneficiaries"][0]["relationship"] = "sister"
+        codes = applicable_rule_codes(will)
+        assert "MISSING_TESTATOR" in codes
+        for code in (
+            "COMMUNITY_PROPERTY_HALF",
+            "JOINT_WILL_IRREVOCABLE",
+            "BUSINESS_NO_BUY_SELL",
+            "TRUST_VESTING_AGE",
+        ):
+            assert code not in codes
+
+    def test_scenarios_enable_rules_and_triggers(self):
+        will = _basic_will()
+        will["scenarios"] = ["testamentary_trust", "business_assets"]
+        will["marital"] = {"status": "married_in_community"}
+        codes = applicable_rule_codes(will)
+        assert {"TRUST_VESTING_AGE", "BUSINESS_NO_BUY_SELL", "COMMUNITY_PROPERTY_HALF",
+                "NO_SIMULTANEOUS_DEATH"} <= codes
+        triggers = applicable_referral_triggers(will)
+        assert {"testamentary_trust", "business_succession"} <= triggers
+        assert "usufruct" not in triggers
+
+    def test_minor_rules_always_apply(self):
+        will = _basic_will()
+        will["beneficiaries"][0]["relationship"] = "friend"
+        assert {"MINOR_NO_PROVISION", "NO_GUARDIANS_WITH_MINORS"} <= applicable_rule_codes(will)
+
+    def test_child_left_everything_gets_minor_rules(self):
+        # Frontend form shape: no age field, only relationship and ID number
+        frontend = _basic_will()
+        frontend["beneficiaries"] = [{
+            "id": "b1", "fullName": "Lwazi Doe", "relationship": "Son",
+            "idNumber": "2003155800085", "sharePercent": 100, "isCharity": False,
+        }]
+        # AI extraction shape (ExtractedBeneficiary.model_dump())
+        extracted = _basic_will()
+        extracted["beneficiaries"] = [{
+            "full_name": "Lwazi Doe", "relationship": "son", "id_number": None,
+            "share_percent": 100.0, "is_charity": False,
+        }]
+        for will in (frontend, extracted):
+            prompt = compile_verification_prompt(will, LOCAL_RULE_CODES)
+            for code in ("MINOR_NO_PROVISION", "NO_GUARDIANS_WITH_MINORS", "TRUST_VESTING_AGE"):
+                assert f"**{code}**" in prompt
+
+    def test_excluded_codes_are_left_out(self):
+        codes = applicable_rule_codes(_basic_will(), LOCAL_RULE_CODES)
+        assert not codes & LOCAL_RULE_CODES
+
+
+class TestCompiledPrompt:
+    def test_empty_sections_and_fields_are_dropped(self):
+        prompt = compile_verification_prompt(_basic_will())
+        assert '"testator":{"firstName":"John","lastName":"Doe"}' in prompt
+        for key in ("trust_provisions", "usufruct", "joint_will", "phone", "bequests"):
+            assert f'"{key}"' not in prompt
+
+    def test_rules_text_matches_selection(self):
+        prompt = compile_verification_prompt(_basic_will(), LOCAL_RULE_CODES)
+        assert "**MISSING_TESTATOR**" in prompt
+        assert "**NO_EXECUTOR**" not in prompt
+        # Checked locally for the testator only, so still asked of the LLM
+        assert "**INVALID_ID_NUMBER**" in prompt
+        assert "**usufruct**" not in prompt
+        assert "**no_executor**" in prompt
+
+    def test_compiled_prompt_is_smaller(self):
+        will = _basic_will()
+        full = count_tokens(build_verification_prompt(will), "gpt-4o")
+        compiled = count_tokens(compile_verification_prompt(will, LOCAL_RULE_CODES), "gpt-4o")
+        assert compiled < full * 0.8
+
+
+class TestPromptStats:
+    @pytest.mark.asyncio
+    async def test_counted_in_worker_thread(self, monkeypatch):
+        offloaded = []
+
+        async def fake_to_thread(fn, *args):
+            offloaded.append(fn)
+            return fn(*args)
+
+        monkeypatch.setattr(verification_service.asyncio, "to_thread", fake_to_thread)
+        stats = verification_service.VerificationPromptStats()
+        will = _basic_will()
+        await stats.record(will, compile_verification_prompt(will, LOCAL_RULE_CODES))
+        assert offloaded == [stats._count]
+        assert stats.stats()["prompts"] == 1
+        assert 0 < stats.last_compiled_tokens < stats.last_full_tokens
@@ -0,0 +1,201 @@
+"""Tests for the deterministic local verification rules.
+
+Covers SA ID validation (date, citizenship digit, Luhn), testator age,
+executor/beneficiary presence, share arithmetic, merging into an LLM
+result, and the LLM skip in VerificationService.run_verification.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import date
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.models.will import Will
+from app.schemas.verification import VerificationResult
+from app.services.verification_rules import (
+    evaluate_rules,
+    local_result,
+    merge_findings,
+    sa_id_birth_date,
+    sa_id_valid,
+)
+from app.services.verification_service import VerificationService
+
+_TODAY = date(2026, 10, 16)
+_VALID_ID = "8001015009087"
+_MINOR_ID = "1501015800085"  # born 2015-01-01
+
+
+def _will_data(**overrides) -> dict:
+    data = {
+        "testator": {"firstName": "John", "idNumber": _VALID_ID},
+        "beneficiaries": [{"fullName": "Sarah Doe", "sharePercent": 100}],
+        "executor": {"name": "Sarah Doe"},
+        "residue": {"beneficiaries": [{"name": "Sarah Doe", "share_percent": 100}]},
+    }
+    data.update(overrides)
+    return data
+
+
+def _codes(will_data: dict) -> list[str]:
+    return [issue.code for issue in evaluate_rules(will_data, _TODAY)]
+
+
+class TestSaId:
+    def test_valid_id(self):
+        assert sa_id_valid(_VALID_ID, _TODAY)
+
+    @pytest.mark.parametrize("id_number", [
+        "8001015009088",   # bad check digit
+        "8013015009087",   # month 13
+        "8001015009287",   # citizenship digit 2
+        "800101500908",    # 12 digits
+        "80010150090a7",
+    ])
+    def test_invalid_ids(self, id_number):
+        assert not sa_id_valid(id_number, _TODAY)
+
+    def test_century_is_inferred(self):
+        assert sa_id_birth_date(_VALID_ID, _TODAY) == date(1980, 1, 1)
+        assert sa_id_birth_date(_MINOR_ID, _TODAY) == date(2015, 1, 1)
+
+
+class TestEvaluateRules:
+    def test_complete_will_has_no_issues(self):
+        assert _codes(_will_data()) == []
+
+    def test_invalid_id_number(self):
+        assert _codes(_will_data(testator={"id_number": "8001015009088"})) == ["INVALID_ID_NUMBER"]
+
+    def test_testator_under_16_from_id_or_date_of_birth(self):
+        assert _codes(_will_data(testator={"idNumber": _MINOR_ID})) == ["TESTATOR_UNDER_16"]
+        assert _codes(_will_data(testator={"date_of_birth": "2012-05-01"})) == ["TESTATOR_UNDER_16"]
+
+    def test_missing_executor_and_beneficiaries(self):
+        codes = _codes(_will_data(executor={}, beneficiaries=[], residue={}))
+        assert codes == ["NO_BENEFICIARIES", "NO_EXECUTOR"]
+
+    def test_residue_heir_counts_as_beneficiary(self):
+        assert _codes(_will_data(beneficiaries=[])) == []
+
+    def test_percentages_exceed_100(self):
+        beneficiaries = [
+            {"full_name": "A", "share_percent": 60},
+            {"full_name": "B", "share_percent": "50%"},
+        ]
+        assert _codes(_will_data(beneficiaries=beneficiaries)) == ["PERCENTAGES_EXCEED_100"]
+
+    def test_residue_must_total_100(self):
+        residue = {"beneficiaries": [
+            {"name": "A", "sharePercent": 50},
+            {"name": "B", "sharePercent": 40},
+        ]}
+        assert _codes(_will_data(residue=residue)) == ["RESIDUE_PERCENTAGES_INVALID"]
+
+    def test_residue_thirds_are_accepted(self):
+        residue = {"beneficiaries": [{"name": n, "sharePercent": 33.33} for n in "ABC"]}
+        assert _codes(_will_data(residue=residue)) == []
+
+    def test_residue_without_percentages_is_not_checked(self):
+        residue = {"beneficiaries": [{"name": "A"}, {"name": "B", "sharePercent": 10}]}
+        assert _codes(_will_data(residue=residue)) == []
+
+
+class TestMergeFindings:
+    def test_local_findings_replace_llm_issues_for_local_codes(self):
+        llm = VerificationResult.model_validate({
+            "overall_status": "error",
+            "sections": [{"section": "testator", "status": "error", "issues": [
+                {"code": "INVALID_ID_NUMBER", "severity": "error", "section": "testator",
+                 "title": "t", "explanation": "e", "suggestion": "s"},
+                {"code": "KEEP_WILL_UPDATED", "severity": "info", "section": "testator",
+                 "title": "t", "explanation": "e", "suggestion": "s"},
+            ]}],
+            "attorney_referral": {"recommended": False, "reasons": []},
+            "summary": "LLM summary",
+        })
+        merged = merge_findings(llm, [])
+        assert [i.code for i in merged.sections[0].issues] == ["KEEP_WILL_UPDATED"]
+        assert merged.sections[0].status == "warning"
+        assert merged.overall_status == "warning"
+        assert merged.summary == "LLM summary"
+
+    def test_llm_issues_outside_local_scope_are_kept(self):
+        llm = VerificationResult.model_validate({
+            "overall_status": "error",
+            "sections": [
+                {"section": "guardians", "status": "error", "issues": [
+                    {"code": "INVALID_ID_NUMBER", "severity": "error", "section": "guardians",
+                     "title": "t", "explanation": "e", "suggestion": "s"},
+                ]},
+                {"section": "business", "status": "error", "issues": [
+                    {"code": "PERCENTAGES_EXCEED_100", "severity": "error", "section": "business",
+                     "title": "t", "explanation": "e", "suggestion": "s"},
+                ]},
+            ],
+            "attorney_referral": {"recommended": False, "reasons": []},
+            "summary": "LLM summary",
+        })
+        merged = merge_findings(llm, [])
+        assert [(s.section, [i.code for i in s.issues]) for s in merged.sections] == [
+            ("guardians", ["INVALID_ID_NUMBER"]),
+            ("business", ["PERCENTAGES_EXCEED_100"]),
+        ]
+        assert merged.overall_status == "error"
+
+    def test_local_result_is_blocking(self):
+        issues = evaluate_rules(_will_data(executor=None), _TODAY)
+        result = local_result(issues)
+        assert result.overall_status == "error"
+        assert [(s.section, s.status) for s in result.sections] == [("executor", "error")]
+
+
+class _Result:
+    def __init__(self, row):
+        self._row = row
+
+    def first(self):
+        return self._row
+
+
+class _Session:
+    def __init__(self, will):
+        self._will = will
+
+    async def exec(self, statement):
+        return _Result(self._will)
+
+    def add(self, obj):
+        pass
+
+    async def flush(self):
+        pass
+
+
+async def _no_extraction(will):
+    return
+    yield  # Unreachable; makes this an async generator
+
+
+class TestRunVerification:
+    @pytest.mark.asyncio
+    async def test_blocking_local_error_skips_llm(self):
+        will = Will(user_id=uuid.uuid4(), testator={"idNumber": _VALID_ID})
+        service = VerificationService(_Session(will))
+        service._extract_missing_sections = _no_extraction
+        run = AsyncMock()
+
+        with patch("app.services.verification_service.verification_hedge.run", run):
+            events = [e async for e in service.run_verification(will.id, will.user_id)]
+
+        run.assert_not_called()
+        steps = [json.loads(e["data"]).get("step") for e in events if e["event"] == "check"]
+        assert "local_rules" in steps and "verifying" not in steps
+        done = json.loads(events[-1]["data"])
+        assert done["overall_status"] == "error"
+        assert will.status != "verified"
+        assert will.verification_hash is not None
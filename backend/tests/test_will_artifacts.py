@@ -0,0 +1,164 @@
+"""Unit tests for final-PDF artifacts.
+
+Rendering is patched out -- these tests cover write-once storage, the
+size cap and purging, ETag short-circuiting, deduplication of concurrent
+renders, and on-demand rendering without a store.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services.pdf_stream import make_etag
+from app.services.will_artifacts import FinalPDFArtifacts, WillArtifactStore
+
+
+_MAX_BYTES = 1024
+
+
+def _will(version: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(id=uuid.uuid4(), user_id=uuid.uuid4(), version=version)
+
+
+class TestWillArtifactStore:
+    def test_write_and_open(self, tmp_path):
+        store = WillArtifactStore(tmp_path, _MAX_BYTES)
+        will_id = uuid.uuid4()
+        assert store.open(will_id, 1) is None
+        store.write(will_id, 1, io.BytesIO(b"%PDF-v1"))
+        with store.open(will_id, 1) as fh:
+            assert fh.read() == b"%PDF-v1"
+
+    def test_artifacts_are_write_once(self, tmp_path):
+        store = WillArtifactStore(tmp_path, _MAX_BYTES)
+        will_id = uuid.uuid4()
+        store.write(will_id, 1, io.BytesIO(b"first"))
+        store.write(will_id, 1, io.BytesIO(b"second"))
+        assert store.path(will_id, 1).read_bytes() == b"first"
+
+    def test_versions_are_separate(self, tmp_path):
+        store = WillArtifactStore(tmp_path, _MAX_BYTES)
+        will_id = uuid.uuid4()
+        store.write(will_id, 1, io.BytesIO(b"v1"))
+        store.write(will_id, 2, io.BytesIO(b"v2"))
+        assert store.path(will_id, 1).read_bytes() == b"v1"
+        assert store.path(will_id, 2).read_bytes() == b"v2"
+
+    def test_oldest_artifacts_are_evicted_over_the_cap(self, tmp_path):
+        store = WillArtifactStore(tmp_path, max_bytes=8)
+        first, second = uuid.uuid4(), uuid.uuid4()
+        store.write(first, 1, io.BytesIO(b"aaaa"))
+        store.write(second, 1, io.BytesIO(b"bbbbbbbb"))
+        assert not store.exists(first, 1)
+        assert store.exists(second, 1)
+        assert store.size_bytes() == 8
+
+    def test_purge_removes_every_version(self, tmp_path):
+        store = WillArtifactStore(tmp_path, _MAX_BYTES)
+        will_id, other = uuid.uuid4(), uuid.uuid4()
+        store.write(will_id, 1, io.BytesIO(b"v1"))
+        store.write(will_id, 2, io.BytesIO(b"v2"))
+        store.write(other, 1, io.BytesIO(b"x"))
+        assert store.purge(will_id) == 2
+        assert not (tmp_path / str(will_id)).exists()
+        assert store.exists(other, 1)
+
+
+class TestFinalPDFArtifacts:
+    @pytest.mark.asyncio
+    async def test_serves_existing_artifact_without_rendering(self, tmp_path):
+        store = WillArtifactStore(tmp_path, _MAX_BYTES)
+        artifacts = FinalPDFArtifacts(store)
+        will = _will()
+        store.write(will.id, will.version, io.BytesIO(b"%PDF"))
+
+        async def _fail(*args):
+            raise AssertionError("should not render")
+
+        artifacts._render = _fail
+        document = await artifacts.open(will)
+        with document.file as fh:
+            assert fh.read() == b"%PDF"
+        assert artifacts.stats()["served"] == 1
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_not_modified(self, tmp_path):
+        artifacts = FinalPDFArtifacts(WillArtifactStore(tmp_path, _MAX_BYTES))
+        will = _will(version=3)
+        document = await artifacts.open(
+            will, if_none_match=make_etag(f"{will.id}.v3")
+        )
+        assert document.not_modified
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_render(self, tmp_path):
+        store = WillArtifactStore(tmp_path, _MAX_BYTES)
+        artifacts = FinalPDFArtifacts(store)
+        will = _will()
+        calls = 0
+
+        async def _render(will_id, user_id, version, background):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            store.write(will_id, version, io.BytesIO(b"%PDF"))
+
+        artifacts._render = _render
+        artifacts.schedule(will.id, will.user_id, will.version)
+        docs = await asyncio.gather(artifacts.open(will), artifacts.open(will))
+        for doc in docs:
+            doc.file.close()
+        assert calls == 1
+        assert artifacts.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_render_is_counted(self, tmp_path):
+        artifacts = FinalPDFArtifacts(WillArtifactStore(tmp_path, _MAX_BYTES))
+        will = _will()
+
+        async def _boom(*args):
+            raise RuntimeError("render failed")
+
+        artifacts._render = _boom
+        with pytest.raises(RuntimeError):
+            await artifacts.open(will)
+        await asyncio.sleep(0)
+        assert artifacts.stats()["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_render_logs_traceback(self, tmp_path, caplog):
+        artifacts = FinalPDFArtifacts(WillArtifactStore(tmp_path, _MAX_BYTES))
+        will = _will()
+
+        async def _boom(*args):
+            raise RuntimeError("render failed")
+
+        artifacts._render = _boom
+        artifacts.schedule(will.id, will.user_id, will.version)
+        await asyncio.sleep(0.01)
+        [record] = [r for r in caplog.records if "render failed" in r.getMessage()]
+        assert record.exc_info is not None
+
+    @pytest.mark.asyncio
+    async def test_scheduled_job_skips_existing_artifact(self, tmp_path):
+        store = WillArtifactStore(tmp_path, _MAX_BYTES)
+        artifacts = FinalPDFArtifacts(store)
+        will = _will()
+        store.write(will.id, will.version, io.BytesIO(b"%PDF"))
+        with patch("app.services.will_artifacts.async_session") as session:
+            artifacts.schedule(will.id, will.user_id, will.version)
+            await asyncio.gather(*artifacts._inflight.values())
+        session.assert_not_called()
+        assert artifacts.stats()["prerendered"] == 0
+
+    def test_without_store_nothing_is_scheduled(self):
+        artifacts = FinalPDFArtifacts(None)
+        artifacts.schedule(uuid.uuid4(), uuid.uuid4(), 1)
+        artifacts.purge(uuid.uuid4())
+        assert artifacts.stats()["in_flight"] == 0